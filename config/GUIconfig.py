@@ -29,6 +29,7 @@ if platform.system() == 'Windows':
         COMMUNITY_LOCAL_FOLDER = str(Path.home() / "Documents" / "ESPHomeGUIeasy" / "community_projects")
         DEFAULT_PROJECT_DIR = Path.home() / "Documents" / "ESPHomeGUIeasy" / "user_projects"
         DEFAULT_BUILD_DIR = Path.home() / "Documents" / "ESPHomeGUIeasy" / "build"
+        SNAPSHOT_FOLDER = Path.home() / "Documents" / "ESPHomeGUIeasy" / "snapshots"
         LOCALAPPDATA_FOLDER = os.path.join(os.environ["LOCALAPPDATA"], "ESPHomeGUIeasy")
         os.makedirs(LOCALAPPDATA_FOLDER, exist_ok=True)
         USER_DB_PATH = os.path.join(LOCALAPPDATA_FOLDER, "user_config.db")
@@ -41,6 +42,7 @@ elif platform.system() == 'Darwin' :
         COMMUNITY_LOCAL_FOLDER = str(Path.home() / "Documents" / "ESPHomeGUIeasy" / "community_projects")
         DEFAULT_PROJECT_DIR = Path.home() / "Documents" / "ESPHomeGUIeasy" / "user_projects"
         DEFAULT_BUILD_DIR = Path.home() / "Documents" / "ESPHomeGUIeasy" / "build"
+        SNAPSHOT_FOLDER = Path.home() / "Documents" / "ESPHomeGUIeasy" / "snapshots"
         LOCALAPPDATA_FOLDER = str(Path.home() / "Library/Application Support" / "ESPHomeGUIeasy")
         os.makedirs(LOCALAPPDATA_FOLDER, exist_ok=True)
         os.makedirs(DEFAULT_BUILD_DIR, exist_ok=True)
@@ -54,6 +56,7 @@ elif platform.system() == 'Linux':
         COMMUNITY_LOCAL_FOLDER = str(Path.home() / "Documents" / "ESPHomeGUIeasy" / "community_projects")
         DEFAULT_PROJECT_DIR = Path.home() / "Documents" / "ESPHomeGUIeasy" / "user_projects"
         DEFAULT_BUILD_DIR = Path.home() / "Documents" / "ESPHomeGUIeasy" / "build"
+        SNAPSHOT_FOLDER = Path.home() / "Documents" / "ESPHomeGUIeasy" / "snapshots"
         LOCALAPPDATA_FOLDER = str(Path.home() / ".config" / "ESPHomeGUIeasy")
         os.makedirs(LOCALAPPDATA_FOLDER, exist_ok=True)
         os.makedirs(DEFAULT_BUILD_DIR, exist_ok=True)
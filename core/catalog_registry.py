@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+@file catalog_registry.py
+@brief Central cache of the JSON catalogs and of the modules schema.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the CatalogRegistry class. Every JSON file (modules_schema.json,
+sensors.json, actions.json, triggers.json, conditions.json, timers.json,
+scripts.json) is read once and kept in memory; it is reloaded only when its
+modification time or size changes.
+
+Pre-built indexes are available for the most frequent lookups:
+- yaml_key → (module name, schema) for the modules schema
+- any field (e.g. platform, label, type) → definition for the catalogs
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import os, json, threading
+from config.GUIconfig import GlobalPaths, conf
+
+
+class CatalogRegistry:
+    """
+    @brief Static registry of the JSON configuration files, revalidated by mtime.
+
+    The returned objects are shared: callers must not modify them.
+    """
+    # Nome del catalogo → attributo di GlobalPaths con il percorso del file
+    CATALOG_PATHS = {
+        "sensors": "SENSORS_JSON_PATH",
+        "actions": "ACTIONS_JSON_PATH",
+        "triggers": "TRIGGERS_JSON_PATH",
+        "conditions": "CONDITIONS_JSON_PATH",
+        "timers": "TIMERS_JSON_PATH",
+        "scripts": "SCRIPTS_JSON_PATH",
+    }
+
+    _entries = {}  # percorso assoluto → {"stamp", "data", "indexes"}
+    _lock = threading.RLock()
+
+    @staticmethod
+    def _stamp(path: str):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    @classmethod
+    def _entry(cls, path: str) -> dict:
+        """
+        @brief Returns the cache entry of a file, (re)loading it if it changed on disk.
+
+        @throws OSError / ValueError if the file cannot be read or parsed.
+        """
+        path = os.path.abspath(path)
+        stamp = cls._stamp(path)
+        with cls._lock:
+            entry = cls._entries.get(path)
+            if entry is None or entry["stamp"] != stamp:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                entry = {"stamp": stamp, "data": data, "indexes": {}}
+                cls._entries[path] = entry
+            return entry
+
+    @classmethod
+    def load_json(cls, path: str):
+        """
+        @brief Returns the parsed content of a JSON file (cached).
+
+        @param path Path of the JSON file.
+        @return Parsed JSON data.
+        """
+        return cls._entry(path)["data"]
+
+    @classmethod
+    def _index(cls, path: str, name: str, builder):
+        entry = cls._entry(path)
+        with cls._lock:
+            index = entry["indexes"].get(name)
+            if index is None:
+                index = builder(entry["data"])
+                entry["indexes"][name] = index
+            return index
+
+    # -----------------------------------------------
+    # |              Schema dei moduli              |
+    # -----------------------------------------------
+    @classmethod
+    def modules_schema(cls, path: str = None) -> dict:
+        """
+        @brief Returns modules_schema.json as { module name: schema }.
+
+        @param path Optional path, defaults to conf.MODULE_SCHEMA_PATH.
+        """
+        return cls.load_json(path or conf.MODULE_SCHEMA_PATH)
+
+    @staticmethod
+    def module_yaml_key(module_name: str) -> str:
+        """
+        @brief Converts a module name of the schema to its YAML key (e.g. "Web Server" → "web_server").
+        """
+        return module_name.lower().replace(" ", "_")
+
+    @classmethod
+    def modules_by_yaml_key(cls, path: str = None) -> dict:
+        """
+        @brief Index { yaml_key: (module name, schema) } of the modules schema.
+        """
+        return cls._index(path or conf.MODULE_SCHEMA_PATH, "yaml_key", lambda schema: {
+            cls.module_yaml_key(name): (name, info) for name, info in schema.items()
+        })
+
+    # -----------------------------------------------
+    # |        Cataloghi dei blocchi (JSON)         |
+    # -----------------------------------------------
+    @classmethod
+    def catalog_path(cls, kind: str) -> str:
+        return getattr(GlobalPaths, cls.CATALOG_PATHS[kind])
+
+    @classmethod
+    def catalog(cls, kind: str, path: str = None) -> list:
+        """
+        @brief Returns the list of definitions of a catalog (e.g. "sensors").
+
+        @param kind Catalog name, key of CATALOG_PATHS (also the top-level key of the file).
+        @param path Optional path overriding the default one.
+        @return List of definition dicts.
+        """
+        return cls.load_json(path or cls.catalog_path(kind)).get(kind, [])
+
+    @classmethod
+    def catalog_index(cls, kind: str, field: str, path: str = None) -> dict:
+        """
+        @brief Index { value of `field`: definition } of a catalog.
+
+        When several definitions share the same value, the first one wins
+        (same result as a linear scan).
+
+        @param kind Catalog name (e.g. "sensors").
+        @param field Definition field to index (e.g. "platform", "label", "type").
+        """
+        def build(data):
+            index = {}
+            for definition in data.get(kind, []):
+                value = definition.get(field)
+                if isinstance(value, str):
+                    index.setdefault(value.lower() if field == "platform" else value, definition)
+            return index
+        return cls._index(path or cls.catalog_path(kind), f"{kind}:{field}", build)
+
+    @classmethod
+    def clear(cls):
+        """
+        @brief Drops every cached file (they are reloaded on the next access).
+        """
+        with cls._lock:
+            cls._entries.clear()
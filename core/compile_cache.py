@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+@file compile_cache.py
+@brief Content-addressed cache of compiled ESPHome firmware.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the CompileCache class, used by CompileManager to skip `esphome compile`
+when nothing changed since the last successful build.
+
+The cache key is a SHA-256 of:
+- the normalized YAML text
+- the content of the included files (`!include`, `esphome: includes`) and of `secrets.yaml`
+- the installed ESPHome version
+- the board declared in the YAML
+
+Firmware binaries are copied under `DEFAULT_BUILD_DIR/compile_cache/<key>/`.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import os, re, json, time, shutil, hashlib
+from pathlib import Path
+from config.GUIconfig import conf
+from core.log_handler import GeneralLogHandler
+from core.esphome_env import EsphomeEnvironment
+
+# Riferimenti a file esterni all'interno dello YAML
+_INCLUDE_RE = re.compile(r"!include(?:_dir_\w+)?\s+(?:\{\s*file:\s*)?[\"']?([^\s\"',}]+)")
+_INCLUDES_LIST_RE = re.compile(r"^\s*includes:\s*\n((?:\s*-\s*.+\n?)+)", re.MULTILINE)
+_BOARD_RE = re.compile(r"^\s+board:\s*[\"']?([^\s\"'#]+)", re.MULTILINE)
+# Blocchi di primo livello `esphome:` e `substitutions:` (fino alla prossima chiave non indentata)
+_TOP_BLOCK_RE = r"^{key}:[ \t]*(?:#.*)?\n((?:(?:[ \t]+.*|[ \t]*)(?:\n|$))*)"
+_NAME_RE = re.compile(r"^[ \t]+name:[ \t]*[\"']?([^\"'#\n]+?)[\"']?[ \t]*(?:#.*)?$", re.MULTILINE)
+_SUBST_RE = re.compile(r"^[ \t]+([\w-]+):[ \t]*[\"']?([^\"'#\n]*?)[\"']?[ \t]*(?:#.*)?$", re.MULTILINE)
+_VAR_RE = re.compile(r"\$\{?(\w+)\}?")
+
+
+class CompileCache:
+    """
+    @brief Stores the firmware produced by successful builds, indexed by a content hash.
+
+    All the lookups are cheap (hash of a few small files), so a repeated compile
+    of an unchanged project returns immediately without starting the toolchain.
+    """
+    MANIFEST_NAME = "manifest.json"
+    MAX_ENTRIES = 50
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir or Path(conf.DEFAULT_BUILD_DIR) / "compile_cache")
+        self.logger = GeneralLogHandler()
+
+    # -----------------------------------------------
+    # |            Calcolo della chiave             |
+    # -----------------------------------------------
+    @staticmethod
+    def normalize_yaml(text: str) -> str:
+        """
+        @brief Normalizes YAML text so that irrelevant edits do not change the key.
+
+        Unifies line endings, strips trailing spaces and removes empty lines.
+        Comments are kept: inside lambdas a `#` line may be meaningful code.
+
+        @param text Raw YAML content.
+        @return Normalized YAML content.
+        """
+        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        return "\n".join(line.rstrip() for line in lines if line.strip())
+
+    @staticmethod
+    def extract_board(text: str) -> str:
+        """
+        @brief Returns the first `board:` value found in the YAML, or an empty string.
+        """
+        match = _BOARD_RE.search(text)
+        return match.group(1) if match else ""
+
+    @staticmethod
+    def extract_device_name(text: str) -> str:
+        """
+        @brief Returns the `esphome: name:` of the YAML, with simple `substitutions` resolved.
+
+        @return The device name, or an empty string if it is missing or cannot be resolved.
+        """
+        block = re.search(_TOP_BLOCK_RE.format(key="esphome"), text, re.MULTILINE)
+        match = _NAME_RE.search(block.group(1)) if block else None
+        if not match:
+            return ""
+        name = match.group(1).strip()
+
+        subst_block = re.search(_TOP_BLOCK_RE.format(key="substitutions"), text, re.MULTILINE)
+        substitutions = dict(_SUBST_RE.findall(subst_block.group(1))) if subst_block else {}
+        name = _VAR_RE.sub(lambda m: substitutions.get(m.group(1), m.group(0)), name)
+        # Sostituzioni non risolte (es. da package o da riga di comando): nome non affidabile
+        return "" if "$" in name else name
+
+    @staticmethod
+    def find_dependencies(yaml_path: str, text: str) -> list:
+        """
+        @brief Lists the files the build depends on besides the main YAML.
+
+        Follows `!include` references recursively and adds `esphome: includes`
+        entries and the `secrets.yaml` file of the configuration folder.
+
+        @param yaml_path Path of the main YAML file.
+        @param text Content of the main YAML file.
+        @return Sorted list of absolute paths (existing or not).
+        """
+        base_dir = os.path.dirname(os.path.abspath(yaml_path))
+        found = {os.path.join(base_dir, "secrets.yaml")}
+        to_scan = [(base_dir, text)]
+
+        while to_scan:
+            current_dir, content = to_scan.pop()
+            refs = _INCLUDE_RE.findall(content)
+            for block in _INCLUDES_LIST_RE.findall(content):
+                refs.extend(item.strip().lstrip("-").strip().strip("\"'") for item in block.splitlines() if item.strip())
+
+            for ref in refs:
+                path = os.path.abspath(os.path.join(current_dir, ref))
+                if path in found:
+                    continue
+                found.add(path)
+                # Gli YAML inclusi possono a loro volta includere altri file
+                if path.endswith((".yaml", ".yml")) and os.path.isfile(path):
+                    try:
+                        with open(path, "r", encoding="utf-8") as f:
+                            to_scan.append((os.path.dirname(path), f.read()))
+                    except OSError:
+                        pass
+        return sorted(found)
+
+    @staticmethod
+    def esphome_version() -> str:
+        """
+        @brief Returns the installed ESPHome version, from the probe stored by EsphomeEnvironment.
+
+        Never starts ESPHome (it is read on the GUI thread when a job starts).
+
+        @return The version, or "" while it is unknown: the cache must not be used then.
+        """
+        return EsphomeEnvironment.version()
+
+    def compute_key(self, yaml_path: str) -> str:
+        """
+        @brief Computes the cache key of a YAML file and of everything it depends on.
+
+        @param yaml_path Path of the YAML file to compile.
+        @return Hex SHA-256 digest.
+        """
+        with open(yaml_path, "r", encoding="utf-8") as f:
+            text = f.read()
+
+        digest = hashlib.sha256()
+        digest.update(self.normalize_yaml(text).encode("utf-8"))
+        digest.update(b"\0board:" + self.extract_board(text).encode("utf-8"))
+        digest.update(b"\0esphome:" + self.esphome_version().encode("utf-8"))
+
+        for dep in self.find_dependencies(yaml_path, text):
+            digest.update(b"\0file:" + dep.encode("utf-8") + b"\0")
+            try:
+                with open(dep, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+            except OSError:
+                digest.update(b"<missing>")
+        return digest.hexdigest()
+
+    # -----------------------------------------------
+    # |          Lettura/scrittura cache            |
+    # -----------------------------------------------
+    def lookup(self, key: str):
+        """
+        @brief Returns the cached firmware for a key, if present.
+
+        @param key Cache key from compute_key().
+        @return Path of the cached `firmware.bin`, or None on a miss.
+        """
+        entry_dir = self.cache_dir / key
+        manifest_path = entry_dir / self.MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            firmware = entry_dir / manifest["firmware"]
+            if not firmware.exists():
+                return None
+            # Aggiorna l'ultimo utilizzo per la pulizia LRU
+            os.utime(manifest_path, None)
+            return str(firmware)
+        except Exception:
+            self.logger.log_exception(f"Manifest cache di compilazione non valido: {manifest_path}")
+            return None
+
+    @classmethod
+    def find_build_artifacts(cls, yaml_path: str, since: float = 0.0) -> list:
+        """
+        @brief Locates the firmware binaries produced by `esphome compile`.
+
+        Looks only in `<yaml_dir>/.esphome/build/<name>/.pioenvs/<name>/`, where
+        `<name>` is the `esphome: name:` of the YAML: other devices of the same
+        folder may be compiling at the same time and must never be picked up.
+
+        @param yaml_path Path of the compiled YAML file.
+        @param since Timestamp of the compile start.
+        @return List of Path objects (empty if the name is unknown or nothing was found).
+        """
+        try:
+            with open(yaml_path, "r", encoding="utf-8") as f:
+                name = cls.extract_device_name(f.read())
+        except OSError:
+            return []
+        if not name:
+            return []
+        env_dir = Path(yaml_path).resolve().parent / ".esphome" / "build" / name / ".pioenvs" / name
+        firmware = env_dir / "firmware.bin"
+        try:
+            if firmware.stat().st_mtime < since:
+                return []  # build precedente: questa compilazione non ha prodotto il firmware
+        except OSError:
+            return []
+        return sorted(env_dir.glob("firmware*.bin"))
+
+    def store(self, key: str, yaml_path: str, since: float = 0.0):
+        """
+        @brief Copies the firmware of a successful build into the cache.
+
+        @param key Cache key computed when the build started.
+        @param yaml_path Path of the compiled YAML file.
+        @param since Timestamp of the compile start.
+        @return Path of the cached `firmware.bin`, or None if no artifact was found.
+        """
+        artifacts = self.find_build_artifacts(yaml_path, since)
+        if not artifacts:
+            self.logger.warning(f"Nessun firmware trovato da salvare in cache per {yaml_path}")
+            return None
+
+        entry_dir = self.cache_dir / key
+        tmp_dir = self.cache_dir / f".{key}.tmp"
+        try:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            for artifact in artifacts:
+                shutil.copy2(artifact, tmp_dir / artifact.name)
+
+            manifest = {
+                "yaml_path": os.path.abspath(yaml_path),
+                "firmware": "firmware.bin",
+                "files": [a.name for a in artifacts],
+                "esphome_version": self.esphome_version(),
+                "created": time.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            with open(tmp_dir / self.MANIFEST_NAME, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+
+            # Sostituzione atomica della voce
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except Exception:
+            self.logger.log_exception("Errore durante il salvataggio del firmware in cache")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return None
+
+        self.prune()
+        return str(entry_dir / "firmware.bin")
+
+    def prune(self):
+        """
+        @brief Keeps only the MAX_ENTRIES most recently used cache entries.
+        """
+        if not self.cache_dir.exists():
+            return
+        entries = [p for p in self.cache_dir.iterdir() if (p / self.MANIFEST_NAME).exists()]
+        entries.sort(key=lambda p: (p / self.MANIFEST_NAME).stat().st_mtime, reverse=True)
+        for old in entries[self.MAX_ENTRIES:]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def clear(self):
+        """
+        @brief Removes every cached firmware.
+        """
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -20,92 +20,461 @@ Also emits Qt signals to synchronize with the GUI during operations.
 @license GNU Affero General Public License v3.0 (AGPLv3)
 """
 
-from PyQt6.QtCore import QObject, QProcess, pyqtSignal, Qt, QMetaObject, Q_ARG
+from PyQt6.QtCore import QObject, QProcess, QTimer, pyqtSignal, Qt, QMetaObject, Q_ARG
 from PyQt6.QtWidgets import QMessageBox, QApplication
-import tempfile, os, sys, subprocess, re
+import tempfile, os, sys, subprocess, re, time, codecs
 from ruamel.yaml import YAML
 from core.translator import Translator
+from core.settings_db import get_setting
+from core.compile_cache import CompileCache
+from core.esphome_env import EsphomeEnvironment
+
+class StreamLineReader:
+    """
+    @brief Turns the raw byte chunks of a QProcess into complete, classified lines.
+
+    Keeps an incremental UTF-8 decoder and a partial-line buffer, so lines and
+    multi-byte characters split across two chunks are rebuilt before being logged.
+    Every complete line is classified exactly once and returned in a single batch.
+    """
+    _LINE_SPLIT_RE = re.compile(r"\r\n|\r|\n")
+
+    def __init__(self, classify, prefix: str = ""):
+        """
+        @param classify Callable (line) -> (message, level) or None to drop the line.
+        @param prefix Optional text prepended to every message (e.g. the job name).
+        """
+        self.classify = classify
+        self.prefix = prefix
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buffer = ""
+
+    def feed(self, data: bytes) -> list:
+        """
+        @brief Decodes a new chunk and returns the entries of the lines it completes.
+
+        @param data Raw bytes read from the process.
+        @return List of (message, level) tuples.
+        """
+        text = self._buffer + self._decoder.decode(data)
+        lines = self._LINE_SPLIT_RE.split(text)
+        self._buffer = lines.pop()  # ultima riga ancora incompleta
+        return self._classify_lines(lines)
+
+    def flush(self) -> list:
+        """
+        @brief Returns the entries of the remaining partial line (to call when the process ends).
+        """
+        text = self._buffer + self._decoder.decode(b"", final=True)
+        self._buffer = ""
+        return self._classify_lines(self._LINE_SPLIT_RE.split(text))
+
+    def _classify_lines(self, lines) -> list:
+        entries = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            entry = self.classify(line)
+            if entry:
+                entries.append((self.prefix + entry[0], entry[1]))
+        return entries
+
+
+def classify_compile_line(line: str):
+    """
+    @brief Assigns the log level of a line printed by `esphome compile`.
+    """
+    lower = line.lower()
+    if "error" in lower:
+        return line, "error"
+    if "warning" in lower:
+        return line, "warning"
+    return line, "info"
+
+
+def classify_upload_line(line: str):
+    """
+    @brief Assigns the log level of a line printed by `esphome run`.
+    """
+    return line, "error" if "error" in line.lower() else "info"
+
+
+def classify_erase_line(line: str):
+    """
+    @brief Assigns the log level of a line printed by `esptool erase_flash`.
+    """
+    lower = line.lower()
+    if "erasing flash" in lower:
+        return Translator.tr("flash_erasing"), "info"
+    if "chip is" in lower:
+        return line, "info"
+    if "error" in lower:
+        return line, "error"
+    return line, "info"
+
+
+class CompileJob:
+    """
+    @brief Single entry of the compile queue managed by CompileManager.
+
+    Keeps track of the YAML file to build, the QProcess running it,
+    the current status and the final exit code.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCESS = "success"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, job_id: int, yaml_path: str):
+        self.job_id = job_id
+        self.yaml_path = yaml_path
+        self.name = os.path.basename(yaml_path)
+        self.status = CompileJob.PENDING
+        self.exit_code = None
+        self.process = None
+        self.reader = None
+        self.cache_key = None
+        self.started_at = 0.0
+        self.artifact_path = None
+        self.from_cache = False
+        self.cancel_requested = False
+        self.device_name = self.read_device_name(yaml_path)
+
+    @staticmethod
+    def read_device_name(yaml_path: str) -> str:
+        """
+        @brief Returns the `esphome: name:` of the YAML ("" if it cannot be read or resolved).
+        """
+        try:
+            with open(yaml_path, "r", encoding="utf-8") as f:
+                return CompileCache.extract_device_name(f.read())
+        except OSError:
+            return ""
+
+    def is_active(self) -> bool:
+        return self.status in (CompileJob.PENDING, CompileJob.RUNNING)
+
+    def shares_build_folder(self, other: "CompileJob") -> bool:
+        """
+        @brief Tells whether two jobs would build in the same `.esphome/build/<name>` folder.
+
+        A name that cannot be resolved is treated as possibly equal to any other.
+        """
+        if os.path.dirname(self.yaml_path) != os.path.dirname(other.yaml_path):
+            return False
+        return not self.device_name or not other.device_name or self.device_name == other.device_name
+
 
 class CompileManager(QObject):
     """
     @brief Controls ESPHome-related build and upload operations for a given project.
 
     Uses QProcess for asynchronous execution and emits signals to update the UI.
+    Compilations go through a job queue: up to `max_workers` `esphome compile`
+    processes run in parallel, the others wait for a free slot.
     """
-    compile_finished = pyqtSignal(int)  # Segnale con codice di uscita
+    compile_finished = pyqtSignal(int)  # Segnale con codice di uscita (uno per job)
     upload_finished = pyqtSignal()
+    job_status_changed = pyqtSignal(int, str, int)  # job_id, stato, codice di uscita (-1 se non disponibile)
+    queue_finished = pyqtSignal(int, int)  # job riusciti, job falliti
 
     def __init__(self, log_callback, parent=None):
         super().__init__(parent)
         self.log_callback = log_callback or print  # Funzione per loggare (es: self.logger.log)   
+        self.log_batch_callback = None  # Opzionale: riceve una lista di (messaggio, livello) in un colpo solo
         self.project_dir = None  # Da impostare quando apri/carichi progetto
         self.temp_path = None
         self.process = None
+        self._reader = None
         self.window = None
 
+        # Coda di compilazione
+        self.jobs = []
+        self._next_job_id = 1
+        self.max_workers = self.default_worker_count()
+        self.cache = CompileCache()
+
     def set_project_dir(self, path):
         self.project_dir = path        
 
+    def _log_entries(self, entries: list):
+        """
+        @brief Sends a batch of (message, level) entries to the log sink.
+
+        Uses `log_batch_callback` when available, so that a whole chunk of
+        process output costs a single GUI update.
+        """
+        if not entries:
+            return
+        if self.log_batch_callback:
+            self.log_batch_callback(entries)
+        else:
+            for message, level in entries:
+                self.log_callback(message, level)
+
+    def _read_process_output(self, process, reader, final=False):
+        """
+        @brief Reads everything available from a process and logs the complete lines.
+
+        @param process QProcess to read from.
+        @param reader StreamLineReader associated with the process.
+        @param final True when the process has ended: the partial line is flushed too.
+        """
+        if process is None or reader is None:
+            return
+        entries = reader.feed(process.readAllStandardOutput().data())
+        if final:
+            entries += reader.flush()
+        self._log_entries(entries)
+
+    # -----------------------------------------------
+    # |           Coda di compilazione              |
+    # -----------------------------------------------
+    @staticmethod
+    def default_worker_count() -> int:
+        """
+        @brief Returns the number of parallel compile workers to use.
+
+        Reads the `compile_workers` setting; falls back to the CPU count.
+
+        @return Number of workers, always between 1 and the CPU count.
+        """
+        cpu_count = os.cpu_count() or 1
+        try:
+            value = int(get_setting("compile_workers") or cpu_count)
+        except ValueError:
+            value = cpu_count
+        return max(1, min(value, cpu_count))
+
+    def set_max_workers(self, count: int):
+        """
+        @brief Changes the number of compilations allowed to run in parallel.
+
+        @param count Requested number of workers (clamped to 1..CPU count).
+        """
+        self.max_workers = max(1, min(int(count), os.cpu_count() or 1))
+        self._start_pending_jobs()
+
+    def running_jobs(self) -> list:
+        return [job for job in self.jobs if job.status == CompileJob.RUNNING]
+
+    def has_active_jobs(self) -> bool:
+        """
+        @brief Tells whether some compile job is still pending or running.
+        """
+        return any(job.is_active() for job in self.jobs)
+
     def compile_yaml(self, yaml_path: str):
         """
         @brief Starts ESPHome compilation for the specified YAML file.
 
+        The file is added to the compile queue; a compilation already running
+        for another file is not interrupted.
+
         @param yaml_path Absolute path to the YAML file to be compiled.
+        @return The queued CompileJob, or None if the file is already queued.
         """
         try:
             self.temp_path = yaml_path
             self.log_callback(Translator.tr("compiling_starting"), "info")
+            jobs = self.enqueue_compile([yaml_path])
+            return jobs[0] if jobs else None
+        except Exception as e:
+            self.log_callback(Translator.tr("compiling_failed").format(code=e), "error")
+            return None
 
-            if self.process:
-                self.process.kill()
-                self.process.deleteLater()
+    def enqueue_compile(self, yaml_paths: list) -> list:
+        """
+        @brief Adds one or more YAML files to the compile queue and starts free workers.
 
-            self.process = QProcess(self)
-            self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
-            self.process.readyReadStandardOutput.connect(self.handle_compile_output)
-            self.process.finished.connect(self.handle_compile_finished)
-            self.process.start("esphome", ["compile", yaml_path])
+        Files already pending or running are skipped. Files sharing the build
+        folder of a running job (same folder and same `esphome: name`) wait for
+        it to end, so the same build folder is never compiled twice at the same time.
 
-        except Exception as e:
-            self.log_callback(Translator.tr("compiling_failed").format(code=e), "error")
-            
-    def handle_compile_output(self):
+        @param yaml_paths List of absolute paths to YAML files.
+        @return List of the CompileJob objects actually queued.
+        """
+        # Terminata una coda precedente, si riparte da una lista pulita
+        if not self.has_active_jobs():
+            self.jobs = []
+
+        active_paths = {os.path.abspath(job.yaml_path) for job in self.jobs if job.is_active()}
+        queued = []
+        for path in yaml_paths:
+            abs_path = os.path.abspath(path)
+            if abs_path in active_paths:
+                self.log_callback(Translator.tr("compile_job_skipped").format(name=os.path.basename(path)), "warning")
+                continue
+            job = CompileJob(self._next_job_id, abs_path)
+            self._next_job_id += 1
+            self.jobs.append(job)
+            active_paths.add(abs_path)
+            queued.append(job)
+            self.log_callback(Translator.tr("compile_job_queued").format(id=job.job_id, name=job.name), "debug")
+            self.job_status_changed.emit(job.job_id, job.status, -1)
+
+        self._start_pending_jobs()
+        return queued
+
+    def cancel_queue(self):
+        """
+        @brief Cancels every pending job and kills the running compilations.
+        """
+        for job in self.jobs:
+            if job.status == CompileJob.PENDING:
+                job.status = CompileJob.CANCELLED
+                self.job_status_changed.emit(job.job_id, job.status, -1)
+            elif job.status == CompileJob.RUNNING and job.process:
+                job.cancel_requested = True  # chiuso come CANCELLED da handle_compile_finished
+                job.process.kill()
+
+    def _start_pending_jobs(self):
+        """
+        @brief Starts pending jobs until all the worker slots are busy.
+        """
+        while True:
+            running = self.running_jobs()
+            if len(running) >= self.max_workers:
+                break
+            # Un job che compilerebbe nella stessa cartella di build di uno in corso attende il suo turno
+            job = next((j for j in self.jobs if j.status == CompileJob.PENDING
+                        and not any(j.shares_build_folder(r) for r in running)), None)
+            if job is None:
+                break
+            self._start_job(job)
+
+    @staticmethod
+    def cache_enabled() -> bool:
+        return get_setting("compile_cache") != "0"
+
+    def _start_job(self, job: CompileJob):
+        """
+        @brief Launches `esphome compile` for a single queued job.
+
+        If an identical build is found in the compile cache, no process is started
+        and the job completes with the cached firmware on the next event loop pass.
+
+        @param job The CompileJob to start.
+        """
+        job.status = CompileJob.RUNNING
+        job.started_at = time.time()
+
+        # Senza versione di ESPHome nota (probe in corso o fallito) la chiave non sarebbe affidabile
+        if self.cache_enabled() and self.cache.esphome_version():
+            try:
+                job.cache_key = self.cache.compute_key(job.yaml_path)
+                cached = self.cache.lookup(job.cache_key)
+            except OSError as e:
+                cached = None
+                self.log_callback(Translator.tr("compile_cache_error").format(error=e), "warning")
+            if cached:
+                job.from_cache = True
+                job.artifact_path = cached
+                self.log_callback(self._job_prefix(job) + Translator.tr("compile_cache_hit").format(path=cached), "success")
+                # Chiusura al prossimo giro dell'event loop: chiamarla qui rientrerebbe in
+                # _start_pending_jobs e la coda verrebbe segnalata come finita più volte
+                QTimer.singleShot(0, lambda j=job: self.handle_compile_finished(j, 0, QProcess.ExitStatus.NormalExit))
+                return
+
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        process.readyReadStandardOutput.connect(lambda j=job: self.handle_compile_output(j))
+        process.finished.connect(lambda code, status, j=job: self.handle_compile_finished(j, code, status))
+        process.errorOccurred.connect(lambda error, j=job: self._handle_job_error(j, error))
+
+        job.process = process
+        job.reader = StreamLineReader(classify_compile_line, self._job_prefix(job))
+        self.log_callback(Translator.tr("compile_job_started").format(id=job.job_id, name=job.name), "info")
+        self.job_status_changed.emit(job.job_id, job.status, -1)
+        command = EsphomeEnvironment.command("compile", job.yaml_path)
+        process.start(command[0], command[1:])
+
+    def _handle_job_error(self, job: CompileJob, error):
+        """
+        @brief Marks a job as failed when its process cannot be started at all.
+        """
+        if error == QProcess.ProcessError.FailedToStart and job.status == CompileJob.RUNNING:
+            self.handle_compile_finished(job, -1, QProcess.ExitStatus.CrashExit)
+
+    def _job_prefix(self, job: CompileJob) -> str:
+        # Con più compilazioni in parallelo ogni riga indica il file di origine
+        return f"[{job.name}] " if len(self.jobs) > 1 else ""
+
+    def handle_compile_output(self, job: CompileJob):
         """
         @brief Processes live output from the ESPHome compile command.
+
+        @param job The CompileJob whose process produced the output.
         """        
-        if not self.process:
-            return
-        output = self.process.readAllStandardOutput().data().decode()
-        for line in output.splitlines():
-            if "error" in line.lower():
-                self.log_callback(line.strip(), "error")
-            elif "warning" in line.lower():
-                self.log_callback(line.strip(), "warning")
-            else:
-                self.log_callback(line.strip(), "info") 
+        self._read_process_output(job.process, job.reader)
 
-    def handle_compile_finished(self, exitCode, exitStatus):
+    def handle_compile_finished(self, job: CompileJob, exitCode, exitStatus):
         """
-        @brief Processes live output from the ESPHome compile command.
+        @brief Handles the end of a compile job and starts the next one in the queue.
+
+        @param job The CompileJob that has finished.
+        @param exitCode Exit code returned by `esphome compile`.
+        @param exitStatus Qt exit status of the process.
         """        
+        if job.status != CompileJob.RUNNING:
+            return  # già gestito (es. errore di avvio seguito da finished)
+
+        self._read_process_output(job.process, job.reader, final=True)
+        job.reader = None
+        job.exit_code = exitCode
+        if exitCode == 0:
+            job.status = CompileJob.SUCCESS
+        else:
+            job.status = CompileJob.CANCELLED if job.cancel_requested else CompileJob.FAILED
+        prefix = self._job_prefix(job)
         if exitCode == 0:
-            self.log_callback(Translator.tr("compiling_success"), "success")
+            self.log_callback(prefix + Translator.tr("compiling_success"), "success")
+            if job.cache_key and not job.from_cache:
+                job.artifact_path = self.cache.store(job.cache_key, job.yaml_path, job.started_at)
         else:
-            self.log_callback(Translator.tr("compiling_failed").format(code=exitCode), "error")
+            self.log_callback(prefix + Translator.tr("compiling_failed").format(code=exitCode), "error")
 
         # Pulizia file temporaneo
-        if self.temp_path:
-            temp_dir = tempfile.gettempdir()
-            if self.temp_path.startswith(temp_dir):
-                if os.path.exists(self.temp_path):
-                    os.remove(self.temp_path)
-                    self.log_callback(Translator.tr("temp_file_deleted").format(path=self.temp_path), "debug")
-        self.temp_path = None
-        self.process = None
+        temp_dir = tempfile.gettempdir()
+        if job.yaml_path.startswith(temp_dir):
+            if os.path.exists(job.yaml_path):
+                os.remove(job.yaml_path)
+                self.log_callback(Translator.tr("temp_file_deleted").format(path=job.yaml_path), "debug")
+        if self.temp_path and os.path.abspath(self.temp_path) == job.yaml_path:
+            self.temp_path = None
+
+        if job.process:
+            job.process.deleteLater()
+            job.process = None
+
+        self.job_status_changed.emit(job.job_id, job.status, exitCode)
+        self._start_pending_jobs()
 
         # Segnale per la GUI
         self.compile_finished.emit(exitCode)
 
+        if not self.has_active_jobs():
+            self._report_queue_summary()
+
+    def _report_queue_summary(self):
+        """
+        @brief Logs the final status and exit code of every job once the queue is empty.
+        """
+        done = [job for job in self.jobs if job.status == CompileJob.SUCCESS]
+        failed = [job for job in self.jobs if job.status != CompileJob.SUCCESS]
+        if len(self.jobs) > 1:
+            for job in self.jobs:
+                code = "-" if job.exit_code is None else job.exit_code
+                level = "success" if job.status == CompileJob.SUCCESS else "error"
+                self.log_callback(
+                    Translator.tr("compile_job_summary").format(id=job.job_id, name=job.name, status=job.status, code=code),
+                    level
+                )
+            self.log_callback(Translator.tr("compile_queue_finished").format(ok=len(done), failed=len(failed)), "info")
+        self.queue_finished.emit(len(done), len(failed))
+
 
 
     def upload_via_usb(self, yaml_path, com_port):
@@ -121,7 +490,7 @@ class CompileManager(QObject):
         self.com_port = com_port
 
         # Costruisci il comando
-        self.command = ["esphome", "run", yaml_path, "--device", com_port, "--no-logs"]
+        self.command = EsphomeEnvironment.command("run", yaml_path, "--device", com_port, "--no-logs")
 
         # Istanzia QProcess se non esiste
         if self.process:
@@ -131,6 +500,7 @@ class CompileManager(QObject):
 
         self.process = QProcess(self)
         self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        self._reader = StreamLineReader(classify_upload_line)
         self.process.readyReadStandardOutput.connect(self.handle_upload_output)
         self.process.finished.connect(self.handle_upload_finished)
 
@@ -151,6 +521,7 @@ class CompileManager(QObject):
 
         self.process = QProcess(self)
         self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        self._reader = StreamLineReader(classify_erase_line)
         self.process.readyReadStandardOutput.connect(self.handle_erase_output)
         self.process.finished.connect(self.handle_erase_finished)
 
@@ -160,28 +531,14 @@ class CompileManager(QObject):
         """
         @brief Processes live output from the ESPHome compile command.
         """        
-        if not self.process:
-            return
-
-        output = self.process.readAllStandardOutput().data().decode()
-        for line in output.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-
-            if "erasing flash" in line.lower():
-                self.log_callback(Translator.tr("flash_erasing"), "info")
-            elif "chip is" in line.lower():
-                self.log_callback(line, "info")
-            elif "error" in line.lower():
-                self.log_callback(line, "error")
-            else:
-                self.log_callback(line, "info")
+        self._read_process_output(self.process, self._reader)
 
     def handle_erase_finished(self, exitCode, exitStatus):
         """
         @brief Processes live output from the ESPHome compile command.
         """        
+        self._read_process_output(self.process, self._reader, final=True)
+        self._reader = None
         if exitCode == 0:
             self.log_callback(Translator.tr("flash_erased"), "success")
 
@@ -227,24 +584,14 @@ class CompileManager(QObject):
         """
         @brief Processes live output from the ESPHome compile command.
         """
-        if not self.process:
-            return
-
-        output = self.process.readAllStandardOutput().data().decode()
-        lines = [l.strip() for l in output.splitlines() if l.strip()]
-        for line in lines:
-            # Log live ogni riga
-            self.log_callback(line, "info")
-
-            # Rileva completamento
-            if "error" in line.lower():
-                self.log_callback(line, "error")
-            # rimuoviamo il log di successo da qui
+        self._read_process_output(self.process, self._reader)
 
     def handle_upload_finished(self, exitCode, exitStatus):
         """
         @brief Processes live output from the ESPHome compile command.
         """        
+        self._read_process_output(self.process, self._reader, final=True)
+        self._reader = None
         if exitCode != 0:
             self.log_callback(Translator.tr("upload_failed").format(code=exitCode), "error")
 
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+@file esphome_env.py
+@brief Cached probe of the ESPHome installation used to compile and upload.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the EsphomeEnvironment class. The full probe looks for ESPHome
+(custom path from the settings, `esphome` in PATH, known install folders,
+then the `esphome` module of the running interpreter, located without
+importing it) and asks its version. The result is stored in the settings
+database (`esphome_probe` key) with:
+- the resolved executable and how to launch it (CLI or `python -m esphome`)
+- the ESPHome version
+- mtime and size of the executable, path and mtime of the interpreter
+- the custom path setting and the PATH variable in use at probe time
+
+On the next launches the record is revalidated with a few stat() calls; the
+full probe (and the `esphome version` subprocess) runs again only when one
+of these values changed. stored(), executable(), command() and version()
+never start ESPHome, so they are safe on the GUI thread: a stale probe is
+redone in background.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import os, re, sys, json, shutil, hashlib, threading, subprocess
+from pathlib import Path
+from core.settings_db import get_setting, set_setting
+from core.log_handler import GeneralLogHandler
+
+
+class EsphomeEnvironment:
+    """
+    @brief Static access to the (cached) ESPHome probe.
+
+    Thread safe: the splash screen probes from a worker thread.
+    """
+    SETTING_KEY = "esphome_probe"
+    # Ben sotto il budget del task "libraries" dello splash (30 s): una CLI bloccata
+    # lascia solo la versione vuota, senza far scadere il controllo all'avvio
+    VERSION_TIMEOUT_S = 10
+
+    # Cartelle di installazione comuni della CLI
+    KNOWN_PATHS = [
+        Path.home() / ".esphome" / "esphome_venv" / "Scripts" / "esphome.exe",
+        Path("C:/Program Files/ESPHome/esphome.exe"),
+        Path("C:/Tools/esphome/esphome.exe"),
+        Path("/usr/local/bin/esphome"),
+        Path("/usr/bin/esphome")
+    ]
+
+    _lock = threading.RLock()
+    _record = None      # ultimo record valido (o None se non ancora letto)
+    _probe_thread = None  # probe completo in background, avviato da command()
+    _thread_lock = threading.Lock()  # separato da _lock, che resta occupato durante un probe
+
+    # -----------------------------------------------
+    # |               Stato ambiente                |
+    # -----------------------------------------------
+    @staticmethod
+    def _stat(path: str):
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except (OSError, TypeError):
+            return None
+
+    @staticmethod
+    def _path_hash() -> str:
+        return hashlib.sha1(os.environ.get("PATH", "").encode("utf-8", "replace")).hexdigest()
+
+    @classmethod
+    def _fingerprint(cls, executable: str) -> dict:
+        """
+        @brief Values that must not change for a stored probe to stay valid.
+        """
+        return {
+            "stat": list(cls._stat(executable) or ()),
+            "python": sys.executable,
+            "python_stat": list(cls._stat(sys.executable) or ()),
+            "custom_path": get_setting("custom_esphome_path") or "",
+            "path_env": cls._path_hash()
+        }
+
+    @classmethod
+    def _is_valid(cls, record) -> bool:
+        if not isinstance(record, dict) or not record.get("executable"):
+            return False
+        return all(record.get(key) == value for key, value in cls._fingerprint(record["executable"]).items())
+
+    @classmethod
+    def _valid_record(cls):
+        """
+        @brief Returns the stored probe if it is still valid, without running the full probe.
+
+        Does not take the probe lock: safe on the GUI thread while a probe is running.
+        """
+        record = cls._record
+        if record is None:
+            try:
+                record = json.loads(get_setting(cls.SETTING_KEY) or "null")
+            except ValueError:
+                record = None
+        return record if cls._is_valid(record) else None
+
+    # -----------------------------------------------
+    # |                Probe completo               |
+    # -----------------------------------------------
+    @classmethod
+    def _locate(cls):
+        """
+        @brief Finds ESPHome without importing it.
+
+        @return Tuple (kind, executable) with kind "cli" or "module", or None.
+        """
+        custom_path = get_setting("custom_esphome_path")
+        if custom_path and Path(custom_path).is_file():
+            return "cli", str(Path(custom_path))
+
+        cli = shutil.which("esphome")
+        if cli:
+            return "cli", os.path.abspath(cli)
+
+        for path in cls.KNOWN_PATHS:
+            if path.is_file():
+                return "cli", str(path)
+
+        # Modulo installato nell'interprete corrente: find_spec non esegue il pacchetto
+        try:
+            import importlib.util
+            spec = importlib.util.find_spec("esphome")
+        except (ImportError, ValueError):
+            spec = None
+        if spec is not None and spec.origin:
+            return "module", spec.origin
+        return None
+
+    @classmethod
+    def _command_for(cls, kind: str, executable: str) -> list:
+        return [sys.executable, "-m", "esphome"] if kind == "module" else [executable]
+
+    @classmethod
+    def _read_version(cls, kind: str, executable: str) -> str:
+        if kind == "module":
+            try:
+                from importlib.metadata import version as package_version
+                return package_version("esphome")
+            except Exception:
+                pass
+        try:
+            result = subprocess.run(cls._command_for(kind, executable) + ["version"],
+                                    capture_output=True, text=True, timeout=cls.VERSION_TIMEOUT_S)
+        except (OSError, subprocess.SubprocessError) as e:
+            GeneralLogHandler().warning(f"Lettura versione ESPHome fallita: {e}")
+            return ""
+        output = result.stdout.strip()
+        match = re.search(r"\d+\.\d+(?:\.\d+)?\S*", output)  # "Version: 2025.7.3"
+        return match.group(0) if match else output
+
+    @classmethod
+    def _full_probe(cls):
+        logger = GeneralLogHandler()
+        found = cls._locate()
+        if found is None:
+            logger.warning("ESPHome non trovato (percorso personalizzato, PATH, cartelle note, modulo Python).")
+            return None
+        kind, executable = found
+        record = {
+            "kind": kind,
+            "executable": executable,
+            "command": cls._command_for(kind, executable),
+            "version": cls._read_version(kind, executable)
+        }
+        record.update(cls._fingerprint(executable))
+        logger.info(f"ESPHome rilevato ({kind}): {executable}, versione {record['version'] or 'sconosciuta'}")
+        return record
+
+    # -----------------------------------------------
+    # |                  API pubblica               |
+    # -----------------------------------------------
+    @classmethod
+    def probe(cls, force: bool = False):
+        """
+        @brief Returns the ESPHome installation, revalidating the stored probe by stat.
+
+        @param force Ignore the stored probe and run the full detection.
+        @return Dict {"kind", "executable", "command", "version", ...}, or None if ESPHome is not installed.
+        """
+        with cls._lock:
+            record = None if force else cls._valid_record()
+            if record is not None:
+                cls._record = record
+                return record
+
+            record = cls._full_probe()
+            cls._record = record
+            # Un esito negativo (o senza versione, es. CLI andata in timeout) non viene salvato:
+            # al prossimo avvio il probe viene ripetuto
+            set_setting(cls.SETTING_KEY, json.dumps(record) if record and record["version"] else "")
+            return record
+
+    @classmethod
+    def probe_in_background(cls):
+        """
+        @brief Starts the full probe on a daemon thread, unless one is already running.
+        """
+        with cls._thread_lock:
+            if cls._probe_thread is None or not cls._probe_thread.is_alive():
+                cls._probe_thread = threading.Thread(target=cls.probe, name="esphome-probe", daemon=True)
+                cls._probe_thread.start()
+
+    @classmethod
+    def stored(cls):
+        """
+        @brief Returns the stored probe if it is still valid, without running ESPHome.
+
+        When it is stale (or missing) the full probe is started in background.
+
+        @return Same dict as probe(), or None.
+        """
+        record = cls._valid_record()
+        if record is None:
+            cls.probe_in_background()
+        return record
+
+    @classmethod
+    def executable(cls) -> str:
+        """
+        @brief Path of the ESPHome executable (or module) used by command(), without running it.
+
+        @return The path, or "" if ESPHome was not found.
+        """
+        record = cls._valid_record()
+        if record is not None:
+            return record["executable"]
+        found = cls._locate()
+        return found[1] if found else ""
+
+    @classmethod
+    def command(cls, *args) -> list:
+        """
+        @brief Builds the command line to run ESPHome with the given arguments.
+
+        Never starts ESPHome, so it can be called on the GUI thread: if the stored
+        probe is no longer valid, the executable is located again with a few
+        stat() calls and the full probe (with the version) runs in background.
+        Falls back to `esphome` (resolved by the system PATH) if no installation was found.
+        """
+        record = cls._valid_record()
+        if record is not None:
+            return list(record["command"]) + list(args)
+        cls.probe_in_background()
+        found = cls._locate()
+        return (cls._command_for(*found) if found else ["esphome"]) + list(args)
+
+    @classmethod
+    def version(cls) -> str:
+        """
+        @brief Returns the ESPHome version of the stored probe, without running ESPHome.
+
+        @return The version, or "" if unknown, not installed or not probed since the last change.
+        """
+        record = cls._valid_record()
+        return record.get("version", "") if record else ""
+
+    @classmethod
+    def invalidate(cls):
+        """
+        @brief Forgets the stored probe (e.g. after changing the custom executable path).
+        """
+        with cls._lock:
+            cls._record = None
+            set_setting(cls.SETTING_KEY, "")
@@ -8,7 +8,9 @@
 @brief Core logic: YAML handling, logging, settings, flashing, etc.
 
 Provides static methods to:
-- Fetch metadata (`info.json`) from community projects
+- Fetch metadata (`info.json`) from community projects, in parallel over a pooled session
+- Cache responses on disk (ETag / Last-Modified) and serve them in offline mode
+- Stream metadata to the GUI from a worker thread (MetadataFetchWorker)
 - Download complete `.zip` packages from GitHub
 - Save selected project files locally (info.json and project.yaml)
 
@@ -17,50 +19,191 @@ Provides static methods to:
 @license GNU Affero General Public License v3.0 (AGPLv3)
 """
 
-import io, os, json, zipfile, requests
+import io, os, json, zipfile, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PyQt6.QtCore import QObject, pyqtSignal
 from config.GUIconfig import AppInfo, GlobalPaths
 from core.log_handler import GeneralLogHandler
 from core.translator import Translator
+from core.http_cache import HttpCache
+from core.settings_db import get_setting, set_setting
+from core.lazy_import import LazyImport
+
+# requests (e urllib3) costa decine di ms: viene importato alla prima richiesta HTTP
+requests = LazyImport("requests")
+HTTPAdapter = LazyImport("requests.adapters", "HTTPAdapter")
+
+
+class OfflineCacheMiss(Exception):
+    """
+    @brief Raised in offline mode when a resource is not available in the local cache.
+    """
 
 class GitHubHandler:
     """
     @brief Utility class to interact with the GitHub community projects repository.
 
     All methods are static and designed for quick access to remote files and metadata.
+    Requests share one pooled `requests.Session` (keep-alive) and always use a timeout.
+    Metadata and project files go through an on-disk HttpCache: cached entries are
+    revalidated with conditional requests and used as they are in offline mode or
+    when the network is unreachable.
     """
+    MAX_WORKERS = 8
+    TIMEOUT = (5, 15)  # secondi: connessione, lettura
+
+    _session = None
+    _session_lock = threading.Lock()
+    _cache = None
+
+    @classmethod
+    def session(cls) -> "requests.Session":
+        """
+        @brief Returns the shared HTTP session, sized for MAX_WORKERS parallel requests.
+        """
+        with cls._session_lock:
+            if cls._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=cls.MAX_WORKERS)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = f"{AppInfo.REPO_NAME}"
+                cls._session = session
+            return cls._session
+
+    @classmethod
+    def _get(cls, url: str, **kwargs) -> "requests.Response":
+        """
+        @brief GET through the shared session, with the default timeout; raises on HTTP errors.
+        """
+        kwargs.setdefault("timeout", cls.TIMEOUT)
+        resp = cls.session().get(url, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    @classmethod
+    def cache(cls) -> HttpCache:
+        if cls._cache is None:
+            cls._cache = HttpCache()
+        return cls._cache
 
     @staticmethod
-    def fetch_project_metadata_list():
+    def is_offline() -> bool:
         """
-        @brief Downloads only the `info.json` metadata files from each project directory in the GitHub repository.
+        @brief True if the user enabled the community offline mode (`community_offline` setting).
+        """
+        return get_setting("community_offline") == "1"
+
+    @staticmethod
+    def set_offline(enabled: bool):
+        set_setting("community_offline", "1" if enabled else "0")
 
-        @return A list of dictionaries containing project metadata (name, version, author, update, category).
+    @classmethod
+    def _cached_get(cls, url: str, headers: dict = None) -> bytes:
         """
-        url = f"https://api.github.com/repos/{AppInfo.REPO_OWNER}/{AppInfo.REPO_NAME}/contents/{GlobalPaths.COMMUNITY_PROJECTS_PATH}"
+        @brief GET with the on-disk cache.
+
+        - Offline mode: returns the cached body, or raises OfflineCacheMiss.
+        - Otherwise sends a conditional request; 304 → cached body, 200 → stored and returned.
+        - Network errors fall back to the cached body when there is one.
+
+        @return Response body.
+        """
+        cache = cls.cache()
+        cached = cache.load(url)
+        if cls.is_offline():
+            if cached is None:
+                raise OfflineCacheMiss(url)
+            return cached[1]
+
+        request_headers = dict(headers or {})
+        if cached is not None:
+            request_headers.update(cache.conditional_headers(cached[0]))
         try:
-            resp = requests.get(url, headers={"Accept": "application/vnd.github+json"})
-            resp.raise_for_status()
-            entries = resp.json()
+            resp = cls.session().get(url, headers=request_headers, timeout=cls.TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if cached is None:
+                raise
+            GeneralLogHandler().warning(f"Rete non disponibile, uso la copia in cache di {url}: {e}")
+            return cached[1]
 
-            projects = []
-            for entry in entries:
-                if entry["type"] == "dir":
-                    info_url = f"https://raw.githubusercontent.com/{AppInfo.REPO_OWNER}/{AppInfo.REPO_NAME}/main/{GlobalPaths.COMMUNITY_PROJECTS_PATH}/{entry['name']}/info.json"
-                    try:
-                        info_resp = requests.get(info_url)
-                        info_resp.raise_for_status()
-                        info_json = info_resp.json()
-                        projects.append(info_json)
-                    except Exception as parse_err:
-                        GeneralLogHandler().error(
-                            Translator.tr("github_info_json_error").format(project=entry['name'], error=parse_err)
-                        )
-            return projects
+        if resp.status_code == 304 and cached is not None:
+            return cached[1]
+        resp.raise_for_status()
+        try:
+            cache.store(url, resp.content, resp.headers)
+        except OSError as e:
+            GeneralLogHandler().warning(f"Impossibile salvare in cache {url}: {e}")
+        return resp.content
+
+    @staticmethod
+    def contents_url() -> str:
+        return f"https://api.github.com/repos/{AppInfo.REPO_OWNER}/{AppInfo.REPO_NAME}/contents/{GlobalPaths.COMMUNITY_PROJECTS_PATH}"
+
+    @staticmethod
+    def raw_url(project: str, filename: str) -> str:
+        return f"https://raw.githubusercontent.com/{AppInfo.REPO_OWNER}/{AppInfo.REPO_NAME}/main/{GlobalPaths.COMMUNITY_PROJECTS_PATH}/{project}/{filename}"
+
+    @classmethod
+    def fetch_project_metadata_list(cls, on_result=None, cancel_event=None):
+        """
+        @brief Downloads only the `info.json` metadata files from each project directory in the GitHub repository.
+
+        The directory listing is a single request; the `info.json` files are then
+        fetched in parallel (at most MAX_WORKERS at a time). Projects whose
+        metadata cannot be downloaded are logged and skipped (partial result).
 
+        @param on_result Optional callable invoked with each metadata dict as soon as it arrives.
+        @param cancel_event Optional threading.Event; when set, pending downloads are dropped.
+        @return A list of dictionaries containing project metadata (name, version, author, update, category),
+                in the order of the repository listing.
+        """
+        try:
+            entries = json.loads(cls._cached_get(cls.contents_url(), headers={"Accept": "application/vnd.github+json"}))
+            # Un oggetto di errore di GitHub (o un file al posto della cartella) non è una lista
+            if not isinstance(entries, list):
+                raise ValueError(f"risposta inattesa dall'elenco progetti: {str(entries)[:200]}")
+            names = [entry["name"] for entry in entries if isinstance(entry, dict) and entry.get("type") == "dir"]
         except Exception as e:
             GeneralLogHandler().error(Translator.tr("github_metadata_error").format(error=e))
             return []
 
+        if not names:
+            return []
+
+        results = {}
+        pool = ThreadPoolExecutor(max_workers=min(cls.MAX_WORKERS, len(names)))
+        try:
+            futures = {pool.submit(cls.fetch_project_info, name): name for name in names}
+            for future in as_completed(futures):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as parse_err:
+                    GeneralLogHandler().error(
+                        Translator.tr("github_info_json_error").format(project=name, error=parse_err)
+                    )
+                    continue
+                if on_result is not None:
+                    on_result(results[name])
+        finally:
+            # In caso di annullamento non attende le richieste ancora in coda
+            pool.shutdown(wait=False, cancel_futures=True)
+        return [results[name] for name in names if name in results]
+
+    @classmethod
+    def fetch_project_info(cls, name: str) -> dict:
+        """
+        @brief Downloads and parses the `info.json` of one community project.
+
+        @param name Project folder name in the repository.
+        @return Parsed metadata.
+        @throws requests.RequestException / ValueError / OfflineCacheMiss on network, parse or cache errors.
+        """
+        return json.loads(cls._cached_get(cls.raw_url(name, "info.json")))
+
     @staticmethod
     def fetch_projects_from_github():
         """
@@ -70,15 +213,14 @@ class GitHubHandler:
         """
         url = f"https://api.github.com/repos/{AppInfo.REPO_NAME}/{AppInfo.REPO_NAME}/contents/{GlobalPaths.COMMUNITY_PROJECTS_PATH}"
         try:
-            resp = requests.get(url, headers={"Accept": "application/vnd.github+json"})
-            resp.raise_for_status()
+            resp = GitHubHandler._get(url, headers={"Accept": "application/vnd.github+json"})
             entries = resp.json()
 
             projects = []
             for entry in entries:
                 if entry["name"].endswith(".zip"):
                     zip_url = entry["download_url"]
-                    zip_resp = requests.get(zip_url)
+                    zip_resp = GitHubHandler._get(zip_url)
                     zf = zipfile.ZipFile(io.BytesIO(zip_resp.content))
 
                     info_json = json.loads(zf.read("info.json"))
@@ -102,22 +244,19 @@ class GitHubHandler:
         @param name The project folder name in the GitHub repo.
         @param local_path The local destination path where the files will be saved.
         """
-        base = f"https://raw.githubusercontent.com/{AppInfo.REPO_NAME}/{AppInfo.REPO_NAME}/main/{GlobalPaths.COMMUNITY_PROJECTS_PATH}/{name}"
         try:
             os.makedirs(local_path, exist_ok=True)
 
-            info_url = f"{base}/info.json"
-            yaml_url = f"{base}/project.yaml"
+            info_url = GitHubHandler.raw_url(name, "info.json")
+            yaml_url = GitHubHandler.raw_url(name, "project.yaml")
 
-            info_resp = requests.get(info_url)
-            info_resp.raise_for_status()
-            with open(os.path.join(local_path, "info.json"), "w", encoding="utf-8") as f:
-                f.write(info_resp.text)
+            info_body = GitHubHandler._cached_get(info_url)
+            with open(os.path.join(local_path, "info.json"), "wb") as f:
+                f.write(info_body)
 
-            yaml_resp = requests.get(yaml_url)
-            yaml_resp.raise_for_status()
-            with open(os.path.join(local_path, "project.yaml"), "w", encoding="utf-8") as f:
-                f.write(yaml_resp.text)
+            yaml_body = GitHubHandler._cached_get(yaml_url)
+            with open(os.path.join(local_path, "project.yaml"), "wb") as f:
+                f.write(yaml_body)
 
         except Exception as e:
             GeneralLogHandler().error(
@@ -125,3 +264,35 @@ class GitHubHandler:
             )
 
 
+class MetadataFetchWorker(QObject):
+    """
+    @brief Qt worker that downloads the community metadata off the GUI thread.
+
+    @signal project_loaded(info: dict): Emitted for each project as soon as its metadata arrives.
+    @signal finished(count: int): Emitted at the end with the number of loaded projects.
+    """
+    project_loaded = pyqtSignal(dict)
+    finished = pyqtSignal(int)
+
+    def __init__(self):
+        super().__init__()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """
+        @brief Requests cancellation; can be called from any thread.
+        """
+        self._cancel.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _emit_project(self, info: dict):
+        if not self._cancel.is_set():
+            self.project_loaded.emit(info)
+
+    def run(self):
+        projects = GitHubHandler.fetch_project_metadata_list(
+            on_result=self._emit_project, cancel_event=self._cancel
+        )
+        self.finished.emit(len(projects))
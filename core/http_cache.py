@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+@file http_cache.py
+@brief Persistent HTTP cache with ETag / Last-Modified validation.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the HttpCache class used by GitHubHandler. Every cached URL is
+stored as two files under `COMMUNITY_LOCAL_FOLDER/.http_cache/`:
+- `<sha1>.body`: response body
+- `<sha1>.json`: URL, ETag, Last-Modified and download time
+
+The stored validators are sent back as `If-None-Match` / `If-Modified-Since`,
+so unchanged resources are answered with 304 and read from disk.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import os, json, time, shutil, hashlib
+from pathlib import Path
+from config.GUIconfig import conf
+
+
+class HttpCache:
+    """
+    @brief On-disk store of HTTP response bodies and their validators.
+    """
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir or Path(conf.COMMUNITY_LOCAL_FOLDER) / ".http_cache")
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def load(self, url: str):
+        """
+        @brief Returns the cached entry of a URL.
+
+        @return Tuple (meta: dict, body: bytes), or None if not cached.
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return meta, body
+
+    @staticmethod
+    def conditional_headers(meta: dict) -> dict:
+        """
+        @brief Builds the validation headers for a cached entry.
+        """
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def store(self, url: str, body: bytes, headers) -> None:
+        """
+        @brief Saves a response body with its ETag / Last-Modified headers.
+
+        The body is written before the metadata, both through a temporary file,
+        so a crash never leaves an entry pointing to a partial body.
+        """
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_body = body_path.with_suffix(".body.tmp")
+        with open(tmp_body, "wb") as f:
+            f.write(body)
+        os.replace(tmp_body, body_path)
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_meta, meta_path)
+
+    def clear(self):
+        """
+        @brief Removes every cached response.
+        """
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+@file lazy_import.py
+@brief Deferred imports for heavy modules and for windows/dialogs opened on demand.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the LazyImport class. A module level
+
+    ProjectGalleryWindow = LazyImport("gui.project_gallery_window", "ProjectGalleryWindow")
+    requests = LazyImport("requests")
+
+costs nothing at import time: the target module is imported the first time
+the name is called or one of its attributes is read, then every access goes
+straight to the real object. It keeps `requests`, the GitHub handler, the
+gallery windows and the block dialogs out of the startup path.
+
+Only stdlib imports here: main.py imports this module right after the
+startup profiler is enabled, so it must not pull anything heavy into the
+profiled startup.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import sys, threading
+
+
+class LazyImport:
+    """
+    @brief Proxy for a module, or for an attribute of a module, imported on first use.
+
+    @param module Dotted name of the module.
+    @param attr Optional name of the object to take from the module (class, function...).
+    """
+    _lock = threading.RLock()
+
+    def __init__(self, module: str, attr: str = None):
+        self.__dict__["_module"] = module
+        self.__dict__["_attr"] = attr
+        self.__dict__["_target"] = None
+
+    def _load(self):
+        target = self.__dict__["_target"]
+        if target is None:
+            with LazyImport._lock:
+                target = self.__dict__["_target"]
+                if target is None:
+                    # __import__ (e non importlib) così l'import compare nel profilo di avvio
+                    __import__(self._module)
+                    target = sys.modules[self._module]
+                    if self._attr:
+                        target = getattr(target, self._attr)
+                    self.__dict__["_target"] = target
+        return target
+
+    @property
+    def loaded(self) -> bool:
+        """
+        @brief True once the target module has been imported.
+        """
+        return self.__dict__["_target"] is not None
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        name = f"{self._module}.{self._attr}" if self._attr else self._module
+        return f"<LazyImport {name} ({'loaded' if self.loaded else 'not loaded'})>"
@@ -7,12 +7,14 @@
 @ingroup main
 @brief Core logic: YAML handling, logging, settings, flashing, etc.
 
-Implements two classes:
+Implements three classes:
+- ConsoleSink: Buffered writer that flushes queued messages to the console on a timer
 - LOGHandler: For colored HTML output to the console (e.g., QTextEdit)
 - GeneralLogHandler: Singleton for logging to file and optionally to the GUI
 
 Includes support for:
-- Rotating file logging
+- Asynchronous file logging (a background thread does all the disk I/O)
+- Log rotation by size and by day, with a flush on exit
 - Colored log messages by level
 - Exception logging with stack traces
 
@@ -21,62 +23,258 @@ Includes support for:
 @license GNU Affero General Public License v3.0 (AGPLv3)
 """
 
-import logging, os,traceback
+import logging, os,traceback, threading, queue, time, atexit
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QTextCursor
-from logging.handlers import RotatingFileHandler
+from PyQt6.QtCore import QObject, QTimer, QThread, pyqtSignal
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from config.GUIconfig import conf
 
+class ConsoleSink(QObject):
+    """
+    @brief Buffered writer for the GUI console.
+
+    Messages are only queued by push(); a single-shot QTimer flushes the whole
+    queue to the QTextEdit as one edit, at most every FLUSH_INTERVAL_MS.
+    push() is thread-safe: the timer is always started in the GUI thread.
+    The document is capped to `max_lines` lines (oldest lines are dropped).
+    There is one sink per console widget, shared by all the log handlers.
+    """
+    FLUSH_INTERVAL_MS = 50
+    DEFAULT_MAX_LINES = 5000
+
+    COLORS = {
+        "error": "#ff5555",
+        "warning": "#f1c40f",
+        "success": "#33ff99",
+        "debug": "#8888ff",
+        "info": "#d4d4d4"
+    }
+
+    _flush_requested = pyqtSignal()
+
+    def __init__(self, console, max_lines=None):
+        super().__init__()
+        self.console = console
+        self._pending = []
+        self._lock = threading.Lock()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+        self._flush_requested.connect(self._start_timer)
+
+        self.set_max_lines(max_lines if max_lines is not None else self.configured_max_lines())
+        console.destroyed.connect(self._on_console_destroyed)
+
+    @classmethod
+    def for_console(cls, console):
+        """
+        @brief Returns the sink attached to a console widget, creating it on first use.
+        """
+        sink = getattr(console, "_console_sink", None)
+        if sink is None:
+            sink = cls(console)
+            console._console_sink = sink
+        return sink
+
+    @classmethod
+    def configured_max_lines(cls) -> int:
+        """
+        @brief Reads the `console_max_lines` setting (0 = unlimited).
+        """
+        try:
+            from core.settings_db import get_setting  # Import locale per evitare ciclo
+            value = get_setting("console_max_lines")
+            return int(value) if value is not None else cls.DEFAULT_MAX_LINES
+        except Exception:
+            return cls.DEFAULT_MAX_LINES
+
+    def set_max_lines(self, max_lines: int):
+        """
+        @brief Caps the number of lines kept in the console document.
+
+        @param max_lines Maximum number of lines, 0 for no limit.
+        """
+        self.max_lines = max(0, int(max_lines))
+        self.console.document().setMaximumBlockCount(self.max_lines)
+
+    @classmethod
+    def format_html(cls, message, level="info") -> str:
+        """
+        @brief Builds the colored HTML line shown in the console for a message.
+        """
+        color = cls.COLORS.get(str(level).lower(), "#d4d4d4")
+        return f'<span style="color:{color};">[{str(level).upper()}]</span> {message}'
+
+    def push(self, entries):
+        """
+        @brief Queues (message, level) entries; they are written on the next flush.
+
+        Can be called from any thread.
+        """
+        with self._lock:
+            was_empty = not self._pending
+            self._pending.extend(self.format_html(message, level) for message, level in entries)
+        if was_empty:
+            self._flush_requested.emit()
+
+    def _start_timer(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """
+        @brief Writes every queued message to the console in a single edit block.
+        """
+        if QThread.currentThread() is not self.thread():
+            self._flush_requested.emit()  # la scrittura avviene solo nel thread GUI
+            return
+        with self._lock:
+            lines, self._pending = self._pending, []
+        if not lines or self.console is None:
+            return
+
+        try:
+            scrollbar = self.console.verticalScrollBar()
+            at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+
+            document = self.console.document()
+            cursor = QTextCursor(document)
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.beginEditBlock()
+            for html in lines:
+                if not document.isEmpty():
+                    cursor.insertBlock()
+                cursor.insertHtml(html)
+            cursor.endEditBlock()
+
+            # Segue il fondo solo se l'utente non sta leggendo righe precedenti
+            if at_bottom:
+                scrollbar.setValue(scrollbar.maximum())
+        except RuntimeError:
+            for html in lines:
+                print(f"[LOGGER ERROR] QTextEdit distrutto. Messaggio:\n{html}")
+
+    def _on_console_destroyed(self, *args):
+        self.console = None
+        self._timer.stop()
+
+
+def _find_console():
+    """
+    @brief Looks for the `console_output` widget among the top-level windows.
+    """
+    for w in QApplication.topLevelWidgets():
+        if hasattr(w, "console_output"):
+            return w.console_output
+    return None
+
+
+def _console_alive(console) -> bool:
+    try:
+        console.objectName()  # solleva RuntimeError se il widget C++ è stato distrutto
+        return True
+    except RuntimeError:
+        return False
+
+
 class LOGHandler:
     """
 @brief Outputs messages to a QTextEdit widget, with color formatting per log level.
 
 This class is mainly used to show logs in the GUI during runtime.  
+Messages are buffered in a ConsoleSink and written in blocks on a timer.
 If the GUI console is not available, logs fall back to standard output.
 """
     def __init__(self, console_widget=None):
-        self._console = console_widget  # riferimento iniziale, ma non permanente
+        self._console = console_widget  # riferimento memorizzato dopo la prima ricerca
 
     @property
     def console(self):
-        # Cerca un QTextEdit attivo con nome console_output
-        for w in QApplication.topLevelWidgets():
-            if hasattr(w, "console_output"):
-                return w.console_output
-        return self._console  # fallback se non troviamo nulla
+        # Usa il riferimento memorizzato finché il widget esiste, altrimenti lo cerca di nuovo
+        if self._console is not None and _console_alive(self._console):
+            return self._console
+        self._console = _find_console()
+        return self._console
+
+    @staticmethod
+    def format_html(message, level="info") -> str:
+        """
+        @brief Builds the colored HTML line shown in the console for a message.
+        """
+        return ConsoleSink.format_html(message, level)
 
     def log(self, message, level="info"):
+        self.log_batch([(message, level)])
+
+    def log_batch(self, entries):
+        """
+        @brief Queues several messages for the console; they are written in one block.
+
+        @param entries List of (message, level) tuples.
+        """
+        if not entries:
+            return
         console = self.console
         if console is None:
-            print(f"[{level.upper()}] {message}")
+            for message, level in entries:
+                print(f"[{level.upper()}] {message}")
             return
+        ConsoleSink.for_console(console).push(entries)
+
+    def flush(self):
+        """
+        @brief Immediately writes the queued messages to the console.
+        """
+        console = self.console
+        if console is not None:
+            ConsoleSink.for_console(console).flush()
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """
+    @brief RotatingFileHandler that also rolls the file over at midnight.
+
+    The file is rotated when it exceeds `maxBytes` or when the first record of a
+    new day is written; backups keep the usual `log.txt.1`, `log.txt.2` names.
+    """
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, **kwargs)
+        # Se il file esistente è di un giorno precedente, ruota alla prima scrittura
+        start = os.path.getmtime(filename) if os.path.exists(filename) else time.time()
+        self.rollover_at = self._next_midnight(start)
+
+    @staticmethod
+    def _next_midnight(timestamp: float) -> float:
+        t = time.localtime(timestamp)
+        midnight = time.mktime((t.tm_year, t.tm_mon, t.tm_mday, 0, 0, 0, 0, 0, -1))
+        return midnight + 24 * 60 * 60
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at and os.path.exists(self.baseFilename) \
+                and os.path.getsize(self.baseFilename) > 0:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_midnight(time.time())
 
-        try:
-            cursor = console.textCursor()
-            if level == "error":
-                color = "#ff5555"
-            elif level == "warning":
-                color = "#f1c40f"
-            elif level == "success":
-                color = "#33ff99"
-            else:
-                color = "#d4d4d4"
-
-            html = f'<span style="color:{color};">[{level.upper()}]</span> {message}<br>'
-            console.moveCursor(QTextCursor.MoveOperation.End)
-            console.insertHtml(html)
-            console.moveCursor(QTextCursor.MoveOperation.End)
-        except RuntimeError:
-            print(f"[LOGGER ERROR] QTextEdit distrutto. Messaggio:\n[{level.upper()}] {message}")
 
 class GeneralLogHandler:
     """
     @brief Singleton logger that writes to both file and GUI console (if available).
 
-    Supports rotating file logging and colored HTML output to QTextEdit.  
+    Callers only put records on a queue; a QueueListener thread writes them to
+    the log file, which is rotated by size and by day. The queue is drained on
+    exit (atexit), so no record is lost when the application closes.
     All logging levels (debug, info, warning, error) are available.
     """
 
+    MAX_BYTES = 20 * 1024 * 1024  # 20 MB
+    BACKUP_COUNT = 2
+
     _instance = None
 
     def __new__(cls, console_widget=None):
@@ -89,15 +287,18 @@ class GeneralLogHandler:
         self._console = console_widget
         self._logger = logging.getLogger("ESPHomeGUIeasy")
         self._logger.setLevel(logging.DEBUG)
+        self._queue = None
+        self._listener = None
+        self._file_handler = None
 
-        # Aggiunge RotatingFileHandler se non presente
-        if not any(isinstance(h, RotatingFileHandler) for h in self._logger.handlers):
+        # Aggiunge il QueueHandler (e il thread di scrittura) se non presente
+        if not any(isinstance(h, QueueHandler) for h in self._logger.handlers):
             os.makedirs(os.path.dirname(conf.LOG_PATH), exist_ok=True)
-            handler = RotatingFileHandler(
+            handler = SizeAndTimeRotatingFileHandler(
                 conf.LOG_PATH,
                 mode='a',
-                maxBytes=20 * 1024 * 1024,  # 20 MB
-                backupCount=2,
+                maxBytes=self.MAX_BYTES,
+                backupCount=self.BACKUP_COUNT,
                 encoding='utf-8'
             )
             formatter = logging.Formatter(
@@ -106,14 +307,46 @@ class GeneralLogHandler:
             )
             handler.setFormatter(formatter)
             handler.setLevel(logging.DEBUG)
-            self._logger.addHandler(handler)
+
+            self._queue = queue.Queue(-1)
+            self._listener = QueueListener(self._queue, handler, respect_handler_level=True)
+            self._listener.start()
+            self._file_handler = handler
+            self._logger.addHandler(QueueHandler(self._queue))
+            atexit.register(self.shutdown)
+
+    def flush(self):
+        """
+        @brief Blocks until every queued record has been written to the log file.
+        """
+        if self._listener is not None:
+            self._queue.join()
+        if self._file_handler is not None:
+            self._file_handler.flush()
+
+    def shutdown(self):
+        """
+        @brief Drains the queue and stops the writer thread.
+
+        Records logged afterwards are written synchronously, so late messages
+        (e.g. from atexit handlers) still reach the file.
+        """
+        if self._listener is None:
+            return
+        listener, self._listener = self._listener, None
+        listener.stop()  # scrive tutti i record ancora in coda
+        for h in list(self._logger.handlers):
+            if isinstance(h, QueueHandler):
+                self._logger.removeHandler(h)
+        self._logger.addHandler(self._file_handler)
+        self._file_handler.flush()
 
     @property
     def console(self):
-        # Cerca un QTextEdit con attributo console_output
-        for w in QApplication.topLevelWidgets():
-            if hasattr(w, "console_output"):
-                return w.console_output
+        # Usa il riferimento memorizzato finché il widget esiste, altrimenti lo cerca di nuovo
+        if self._console is not None and _console_alive(self._console):
+            return self._console
+        self._console = _find_console()
         return self._console
 
     def log(self, message: str, level: str = "info"):
@@ -126,18 +359,7 @@ class GeneralLogHandler:
         # GUI console logger
         console = self.console
         if console is not None:
-            color = {
-                "error": "#ff5555",
-                "warning": "#f1c40f",
-                "success": "#33ff99",
-                "debug": "#8888ff",
-                "info": "#d4d4d4"
-            }.get(level.lower(), "#d4d4d4")
-            html = f'<span style="color:{color};">[{level.upper()}]</span> {message}<br>'
-            cursor = console.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.End)
-            console.insertHtml(html)
-            cursor.movePosition(QTextCursor.MoveOperation.End)
+            ConsoleSink.for_console(console).push([(message, level)])
 
     def log_exception(self, context: str = "Errore sconosciuto"):
         """
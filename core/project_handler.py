@@ -8,8 +8,9 @@
 @brief Core logic: YAML handling, logging, settings, flashing, etc.
 
 Implements:
-- ExportWorker: compresses a project directory into a .zip archive
-- ImportWorker: extracts a project ZIP and locates the YAML file
+- ExportWorker: compresses a project directory into a .zip archive, skipping
+  build/cache folders and storing already-compressed files as they are
+- ImportWorker: validates and extracts a project ZIP and locates the main YAML file
 - ProjectHandler: static interface to trigger threaded import/export
 
 Integrates with Qt signals to update the GUI and uses a custom progress dialog.
@@ -19,50 +20,218 @@ Integrates with Qt signals to update the GUI and uses a custom progress dialog.
 @license GNU Affero General Public License v3.0 (AGPLv3)
 """
 
-import os, zipfile
+import os, json, stat, time, zipfile, fnmatch
+from concurrent.futures import ThreadPoolExecutor
 from core.translator import Translator
+from core.settings_db import get_setting
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
 from gui.progress_dialog import ProgressDialog
 
+class _ThrottledProgress:
+    """
+    @brief Emits a progress(current, total) signal in KiB, at most every PROGRESS_INTERVAL_S.
+    """
+    PROGRESS_INTERVAL_S = 0.1
+
+    def __init__(self, signal, total_bytes: int):
+        self.signal = signal
+        self.total = max(total_bytes // 1024, 1)
+        self.done = 0
+        self._last = 0.0
+
+    def add(self, nbytes: int):
+        self.done += nbytes
+        now = time.monotonic()
+        if now - self._last >= self.PROGRESS_INTERVAL_S:
+            self._last = now
+            self.signal.emit(min(self.done // 1024, self.total), self.total)
+
+    def finish(self):
+        self.signal.emit(self.total, self.total)
+
+
+class ArchiveValidationError(Exception):
+    """
+    @brief Raised when a project archive is unsafe or exceeds the import limits.
+    """
+    pass
+
+
 class ImportWorker(QObject):
     """
     @brief Qt worker class for importing ESPHome projects from a ZIP archive.
 
-    Extracts files to a destination folder and tries to locate a `.yaml` file to open automatically.
+    The central directory is read once and validated before anything is written:
+    member paths must stay inside the destination folder (no absolute paths,
+    `..` or links), and member count, total size and compression ratio are
+    bounded. Members are then extracted with large buffered copies, and the
+    main YAML is located from `info.json` instead of walking the extracted tree.
+    If extraction fails, the files and folders created by the import are removed.
 
-    @signal progress(current: int, total: int): Emits progress percentage during extraction.
+    @signal progress(current: int, total: int): Emits progress in KiB, throttled.
+    @signal failed(reason: str): Emitted when the archive is rejected or cannot be extracted.
     @signal finished(path_yaml: str, path_zip: str): Emits the YAML path once import is complete.
     """
     progress = pyqtSignal(int, int)   # (current, total)
+    failed = pyqtSignal(str)          # motivo
     finished = pyqtSignal(str, str)   # path_yaml, path_zip
 
+    MAX_MEMBERS = 20000
+    MAX_TOTAL_BYTES = 1024 * 1024 * 1024    # 1 GiB estratti al massimo
+    MAX_RATIO = 200                         # rapporto dimensione/compressione oltre cui l'archivio è sospetto
+    RATIO_MIN_SIZE = 1024 * 1024            # il rapporto si controlla solo sui file più grandi di così
+    CHUNK_SIZE = 1024 * 1024
+
     def __init__(self, path_zip, path_dest):
         super().__init__()
         self.path_zip = path_zip
         self.path_dest = path_dest
 
+    @staticmethod
+    def safe_parts(name: str):
+        """
+        @brief Splits a member name into path components, rejecting unsafe names.
+
+        @throws ArchiveValidationError for absolute paths, drive letters or `..` components.
+        """
+        name = name.replace("\\", "/")
+        if name.startswith("/") or (len(name) > 1 and name[1] == ":"):
+            raise ArchiveValidationError(f"absolute path: {name}")
+        parts = [part for part in name.split("/") if part not in ("", ".")]
+        if any(part == ".." for part in parts):
+            raise ArchiveValidationError(f"path outside the project: {name}")
+        return parts
+
+    @classmethod
+    def validate(cls, infos) -> list:
+        """
+        @brief Checks every member of the central directory before extraction.
+
+        @param infos List of zipfile.ZipInfo.
+        @return List of (ZipInfo, path parts) of the files to extract.
+        @throws ArchiveValidationError if the archive must be rejected.
+        """
+        if len(infos) > cls.MAX_MEMBERS:
+            raise ArchiveValidationError(f"too many members ({len(infos)})")
+        members, total = [], 0
+        for info in infos:
+            parts = cls.safe_parts(info.filename)
+            if stat.S_ISLNK(info.external_attr >> 16):
+                raise ArchiveValidationError(f"link not allowed: {info.filename}")
+            if info.is_dir() or not parts:
+                continue
+            total += info.file_size
+            if total > cls.MAX_TOTAL_BYTES:
+                raise ArchiveValidationError("archive too large once extracted")
+            if info.file_size > cls.RATIO_MIN_SIZE and info.file_size > cls.MAX_RATIO * max(info.compress_size, 1):
+                raise ArchiveValidationError(f"suspicious compression ratio: {info.filename}")
+            members.append((info, parts))
+        return members
+
+    @staticmethod
+    def find_main_yaml(zipf, members) -> str:
+        """
+        @brief Picks the main YAML of the project from the archive listing.
+
+        Order: the file named by `info.json` ("yaml" key, or "<name>.yaml"),
+        then `project.yaml` next to it, then the least nested YAML file.
+
+        @return Archive path ("a/b.yaml") of the main YAML, or None.
+        """
+        names = {"/".join(parts): info for info, parts in members}
+        yamls = [n for n in names if n.lower().endswith((".yaml", ".yml"))]
+        if not yamls:
+            return None
+
+        infos = sorted((n for n in names if n.split("/")[-1] == "info.json"), key=lambda n: n.count("/"))
+        if infos:
+            folder = infos[0].rsplit("/", 1)[0] + "/" if "/" in infos[0] else ""
+            try:
+                data = json.loads(zipf.read(names[infos[0]]).decode("utf-8"))
+            except (ValueError, UnicodeDecodeError, zipfile.BadZipFile):
+                data = {}
+            candidates = []
+            if isinstance(data, dict):
+                if isinstance(data.get("yaml"), str):
+                    candidates.append(data["yaml"])
+                if isinstance(data.get("name"), str):
+                    candidates.append(f"{data['name'].strip()}.yaml")
+            candidates.append("project.yaml")
+            for candidate in candidates:
+                if folder + candidate in names:
+                    return folder + candidate
+
+        return min(yamls, key=lambda n: (n.count("/"), n))
+
+    @staticmethod
+    def _make_dirs(path: str, new_dirs: list):
+        """
+        @brief Like os.makedirs, appending to new_dirs every folder it actually creates (top-down).
+        """
+        missing = []
+        while path and not os.path.isdir(path):
+            missing.append(path)
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        for folder in reversed(missing):
+            os.makedirs(folder, exist_ok=True)
+            new_dirs.append(folder)
+
+    @staticmethod
+    def _rollback(new_files: list, new_dirs: list):
+        """
+        @brief Removes what a failed import created; files that existed before are left as they are.
+        """
+        for path in reversed(new_files):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        for folder in reversed(new_dirs):
+            try:
+                os.rmdir(folder)  # solo se vuota: non tocca file che non sono di questo import
+            except OSError:
+                pass
+
     def run(self):
         base_name = os.path.splitext(os.path.basename(self.path_zip))[0]
         final_proj_dir = os.path.join(self.path_dest, base_name)
-        os.makedirs(final_proj_dir, exist_ok=True)
 
         yaml_found = None
+        new_files, new_dirs = [], []  # creati da questo import, da rimuovere in caso di errore
         try:
             with zipfile.ZipFile(self.path_zip, 'r') as zipf:
-                filelist = zipf.namelist()
-                total = len(filelist)
-                for i, member in enumerate(filelist, 1):
-                    zipf.extract(member, final_proj_dir)
-                    self.progress.emit(i, total)
-            for root, dirs, files in os.walk(final_proj_dir):
-                for file in files:
-                    if file.endswith(".yaml") or file.endswith(".yml"):
-                        yaml_found = os.path.join(root, file)
-                        break
-                if yaml_found:
-                    break
-        except Exception as e:
-            yaml_found = None
+                members = self.validate(zipf.infolist())
+                main_yaml = self.find_main_yaml(zipf, members)
+                progress = _ThrottledProgress(self.progress, sum(info.file_size for info, _ in members))
+
+                self._make_dirs(final_proj_dir, new_dirs)
+                created = {final_proj_dir}
+                for info, parts in members:
+                    target = os.path.join(final_proj_dir, *parts)
+                    folder = os.path.dirname(target)
+                    if folder not in created:
+                        self._make_dirs(folder, new_dirs)
+                        created.add(folder)
+                    if not os.path.exists(target):
+                        new_files.append(target)
+                    written = 0
+                    with zipf.open(info) as src, open(target, "wb") as dst:
+                        while chunk := src.read(self.CHUNK_SIZE):
+                            written += len(chunk)
+                            if written > info.file_size:
+                                raise ArchiveValidationError(f"size mismatch: {info.filename}")
+                            dst.write(chunk)
+                            progress.add(len(chunk))
+            progress.finish()
+            if main_yaml:
+                yaml_found = os.path.join(final_proj_dir, *main_yaml.split("/"))
+        except Exception as e:  # ArchiveValidationError, zip corrotto, errori di scrittura
+            # Nessuna cartella estratta a metà: si rimuove ciò che questo import ha creato
+            self._rollback(new_files, new_dirs)
+            self.failed.emit(str(e))
         self.finished.emit(yaml_found or "", self.path_zip)
 
 ##########################################################################
@@ -73,40 +242,126 @@ class ExportWorker(QObject):
     """
     @brief Qt worker class for exporting a project folder to a compressed `.zip` archive.
 
-    Skips `.pioenvs` and emits signals for progress and completion.
+    Skips the folders and files matching the ignore list (build trees, caches),
+    stores already-compressed files without deflating them again, and reads
+    the next files on a small thread pool while the current one is compressed.
 
-    @signal progress(current: int, total: int): Emits progress during compression.
+    @signal progress(current: int, total: int): Emits progress in KiB, throttled.
     @signal finished(path_zip: str): Emits the final ZIP file path.
     """
     progress = pyqtSignal(int, int)    # (current, total)
     finished = pyqtSignal(str)         # path_zip
 
-    def __init__(self, project_dir, path_zip):
+    # Cartelle/file esclusi per default (pattern fnmatch sul nome); impostazione "export_ignore"
+    DEFAULT_IGNORE = (".esphome", ".pioenvs", ".piolibdeps", ".pio", ".temp", "__pycache__", "*.pyc")
+    # Formati già compressi: deflate costa tempo e non riduce la dimensione
+    STORED_EXTENSIONS = {
+        ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".zip", ".gz", ".tgz", ".bz2", ".xz",
+        ".7z", ".rar", ".bin", ".elf", ".ota", ".mp3", ".ogg", ".woff", ".woff2", ".pdf"
+    }
+    CHUNK_SIZE = 1024 * 1024
+    READ_WORKERS = 4
+    PREFETCH_BYTES = 32 * 1024 * 1024      # dati letti in anticipo al massimo
+    PREFETCH_MAX_FILE = 8 * 1024 * 1024    # file più grandi vengono letti a blocchi in streaming
+
+    def __init__(self, project_dir, path_zip, ignore=None):
         super().__init__()
         self.project_dir = project_dir
         self.path_zip = path_zip
+        self.ignore = list(ignore) if ignore is not None else self.ignore_patterns()
 
-    def run(self):
+    @classmethod
+    def ignore_patterns(cls) -> list:
+        """
+        @brief Returns the ignore list: the comma-separated "export_ignore" setting or DEFAULT_IGNORE.
+        """
+        value = get_setting("export_ignore")
+        if not value:
+            return list(cls.DEFAULT_IGNORE)
+        return [p.strip() for p in value.split(",") if p.strip()]
+
+    def _ignored(self, name: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.ignore)
+
+    def collect_files(self) -> list:
+        """
+        @brief Lists the files to export, without descending into ignored folders.
+
+        @return List of (absolute path, archive path, size).
+        """
+        zip_abs = os.path.abspath(self.path_zip)
         filelist = []
         for root, dirs, files in os.walk(self.project_dir):
-            for file in files:
+            dirs[:] = sorted(d for d in dirs if not self._ignored(d))
+            for file in sorted(files):
                 abs_path = os.path.join(root, file)
-                rel_path = os.path.relpath(abs_path, self.project_dir)
-                if not rel_path.startswith('.pioenvs'):
-                    filelist.append((abs_path, rel_path))
-        total = len(filelist)
+                if self._ignored(file) or os.path.abspath(abs_path) == zip_abs:
+                    continue
+                try:
+                    size = os.path.getsize(abs_path)
+                except OSError:
+                    continue
+                filelist.append((abs_path, os.path.relpath(abs_path, self.project_dir), size))
+        return filelist
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _prefetched(self, pool, filelist):
+        """
+        @brief Yields (abs_path, rel_path, size, future) in order, keeping up to PREFETCH_BYTES read ahead.
+
+        future is None for big files, which are streamed by the caller.
+        """
+        pending, in_flight, next_idx = [], 0, 0
+        while pending or next_idx < len(filelist):
+            while next_idx < len(filelist) and (in_flight < self.PREFETCH_BYTES or not pending):
+                abs_path, rel_path, size = filelist[next_idx]
+                next_idx += 1
+                future = None
+                if size <= self.PREFETCH_MAX_FILE:
+                    future = pool.submit(self._read, abs_path)
+                    in_flight += size
+                pending.append((abs_path, rel_path, size, future))
+                if future is None:
+                    break  # il file grande va scritto prima di leggere oltre
+            item = pending.pop(0)
+            if item[3] is not None:
+                in_flight -= item[2]
+            yield item
+
+    def run(self):
         try:
-            with zipfile.ZipFile(self.path_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for i, (abs_path, rel_path) in enumerate(filelist, 1):
-                    zipf.write(abs_path, rel_path)
-                    self.progress.emit(i, total)
+            filelist = self.collect_files()
+            progress = _ThrottledProgress(self.progress, sum(size for _, _, size in filelist))
+            with zipfile.ZipFile(self.path_zip, 'w', zipfile.ZIP_DEFLATED) as zipf, \
+                    ThreadPoolExecutor(max_workers=self.READ_WORKERS) as pool:
+                for abs_path, rel_path, size, future in self._prefetched(pool, filelist):
+                    zinfo = zipfile.ZipInfo.from_file(abs_path, rel_path)
+                    ext = os.path.splitext(rel_path)[1].lower()
+                    zinfo.compress_type = zipfile.ZIP_STORED if ext in self.STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+                    with zipf.open(zinfo, 'w') as dest:
+                        if future is not None:
+                            data = memoryview(future.result())
+                            for start in range(0, len(data), self.CHUNK_SIZE):
+                                chunk = data[start:start + self.CHUNK_SIZE]
+                                dest.write(chunk)
+                                progress.add(len(chunk))
+                        else:
+                            with open(abs_path, "rb") as src:
+                                while chunk := src.read(self.CHUNK_SIZE):
+                                    dest.write(chunk)
+                                    progress.add(len(chunk))
+            progress.finish()
             self.finished.emit(self.path_zip)
         except Exception:
-            self.finished.emit("")        
+            self.finished.emit("")
 
 ##########################################################################
 #                                                                        #
-##########################################################################           
+##########################################################################
 
 class ProjectHandler:
     """
@@ -199,6 +454,9 @@ class ProjectHandler:
         def on_progress(current, total):
             progress_dialog.set_progress(current, total)
 
+        def on_failed(reason):
+            logger(Translator.tr("import_invalid_archive").format(error=reason), "error")
+
         def on_finished(yaml_path, zip_path):
             progress_dialog.close()
             if yaml_path and os.path.exists(yaml_path):
@@ -212,6 +470,7 @@ class ProjectHandler:
             thread.deleteLater()
 
         worker.progress.connect(on_progress)
+        worker.failed.connect(on_failed)
         worker.finished.connect(on_finished)
         thread.started.connect(worker.run)
         thread.start()
\ No newline at end of file
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+@file project_index.py
+@brief Persistent index of the user projects, revalidated by modification times.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the ProjectIndex class. The metadata of every project under
+`DEFAULT_PROJECT_DIR/<category>/<project>/info.json` is stored in the settings
+database (`project_index` table), together with the mtime and size of its
+info.json. The mtime of each category folder is stored too
+(`project_index_dirs` table):
+- a category whose folder did not change is not listed again
+- an info.json is parsed again only if its mtime or size changed
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import os, json, time, threading
+from pathlib import Path
+from config.GUIconfig import conf
+from core.settings_db import SettingsStore
+from core.log_handler import GeneralLogHandler
+
+
+class ProjectIndex:
+    """
+    @brief Static, incrementally refreshed index of the user projects.
+
+    Rows are kept in memory after the first load, so a refresh with no
+    changes costs one stat per category and one per info.json.
+    """
+    # Un mtime più recente di così non è affidabile (risoluzione del filesystem)
+    MTIME_GRACE_S = 2.0
+
+    _lock = threading.RLock()
+    _db_path = None     # database da cui sono state caricate le righe in memoria
+    _projects = {}      # percorso progetto → {"category", "info_mtime", "info_size", "data"}
+    _dirs = {}          # percorso categoria → mtime_ns (-1 = da rileggere)
+
+    # -----------------------------------------------
+    # |                  Database                   |
+    # -----------------------------------------------
+    @classmethod
+    def _ensure_loaded(cls):
+        """
+        @brief Creates the tables if needed and loads the stored rows (once per database).
+        """
+        store = SettingsStore.instance()
+        if cls._db_path == store.db_path:
+            return
+        with store.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS project_index (
+                    path TEXT PRIMARY KEY,
+                    category TEXT NOT NULL,
+                    info_mtime INTEGER NOT NULL,
+                    info_size INTEGER NOT NULL,
+                    data TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS project_index_dirs (
+                    path TEXT PRIMARY KEY,
+                    mtime INTEGER NOT NULL
+                )
+            """)
+        projects = {}
+        for path, category, info_mtime, info_size, data in store.execute(
+                "SELECT path, category, info_mtime, info_size, data FROM project_index"):
+            try:
+                data = json.loads(data) if data else None
+            except ValueError:
+                data = None
+            projects[path] = {"category": category, "info_mtime": info_mtime, "info_size": info_size, "data": data}
+        cls._projects = projects
+        cls._dirs = dict(store.execute("SELECT path, mtime FROM project_index_dirs"))
+        cls._db_path = store.db_path
+
+    @staticmethod
+    def _stable_mtime(st) -> int:
+        """
+        @brief Returns st_mtime_ns, or -1 if the timestamp is too recent to be trusted.
+        """
+        if time.time() - st.st_mtime < ProjectIndex.MTIME_GRACE_S:
+            return -1
+        return st.st_mtime_ns
+
+    # -----------------------------------------------
+    # |                 Scansione                   |
+    # -----------------------------------------------
+    @classmethod
+    def _read_info(cls, info_path: str):
+        try:
+            with open(info_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else None
+        except Exception as e:
+            GeneralLogHandler().warning(f"Errore caricamento {info_path}: {e}")
+            return None
+
+    @classmethod
+    def refresh(cls, root=None) -> list:
+        """
+        @brief Brings the index up to date with the disk and returns every project.
+
+        @param root Projects folder (defaults to conf.DEFAULT_PROJECT_DIR).
+        @return List of metadata dicts (content of info.json plus "__path" and "category"),
+                sorted by category and folder.
+        """
+        with cls._lock:
+            cls.sync(root)
+            return cls.projects(root)
+
+    @classmethod
+    def sync(cls, root=None) -> dict:
+        """
+        @brief Brings the index up to date with the disk.
+
+        @param root Projects folder (defaults to conf.DEFAULT_PROJECT_DIR).
+        @return Dict with the project paths that were "added", "changed" and "removed".
+        """
+        root = Path(root or conf.DEFAULT_PROJECT_DIR)
+        with cls._lock:
+            cls._ensure_loaded()
+            before = {path: row["data"] for path, row in cls._projects.items()}
+            upserts, deletes, dir_updates, dir_deletes = [], [], {}, []
+
+            categories = {}
+            if root.is_dir():
+                with os.scandir(root) as it:
+                    for entry in it:
+                        if entry.is_dir():
+                            categories[entry.path] = entry
+
+            # Categorie rimosse
+            for dir_path in [d for d in cls._dirs if Path(d).parent == root and d not in categories]:
+                dir_deletes.append(dir_path)
+                del cls._dirs[dir_path]
+
+            seen = set()
+            for dir_path, entry in categories.items():
+                try:
+                    mtime = cls._stable_mtime(entry.stat())
+                except OSError:
+                    continue
+                if mtime != -1 and cls._dirs.get(dir_path) == mtime:
+                    # Cartella invariata: stessi progetti dell'ultima scansione
+                    project_paths = [p for p, row in cls._projects.items()
+                                     if row["category"] == entry.name and os.path.dirname(p) == dir_path]
+                else:
+                    with os.scandir(dir_path) as it:
+                        project_paths = [e.path for e in it if e.is_dir()]
+                    dir_updates[dir_path] = mtime
+
+                for project_path in project_paths:
+                    seen.add(project_path)
+                    row = cls._projects.get(project_path)
+                    try:
+                        st = os.stat(os.path.join(project_path, "info.json"))
+                    except OSError:
+                        # Cartella senza info.json: resta indicizzata (vuota) finché non compare il file
+                        if row is None or row["info_size"] != -1:
+                            cls._projects[project_path] = {"category": entry.name, "info_mtime": -1,
+                                                           "info_size": -1, "data": None}
+                            upserts.append(project_path)
+                        continue
+                    info_mtime = cls._stable_mtime(st)
+                    if (row is not None and info_mtime != -1 and row["info_mtime"] == info_mtime
+                            and row["info_size"] == st.st_size and row["category"] == entry.name):
+                        continue
+                    data = cls._read_info(os.path.join(project_path, "info.json"))
+                    row = {"category": entry.name, "info_mtime": info_mtime, "info_size": st.st_size, "data": data}
+                    cls._projects[project_path] = row
+                    upserts.append(project_path)
+
+            # Progetti spariti (cartella o categoria rimossa)
+            prefix = str(root) + os.sep
+            for project_path in [p for p in cls._projects if p.startswith(prefix) and p not in seen]:
+                deletes.append(project_path)
+                del cls._projects[project_path]
+
+            cls._save(upserts, deletes, dir_updates, dir_deletes)
+
+            changes = {"added": [], "changed": [], "removed": []}
+            for path in upserts + deletes:
+                row = cls._projects.get(path)
+                old, new = before.get(path), row["data"] if row is not None else None
+                if new is not None and old is None:
+                    changes["added"].append(path)
+                elif new is None and old is not None:
+                    changes["removed"].append(path)
+                elif new != old:  # un file riletto ma identico non genera eventi
+                    changes["changed"].append(path)
+            return changes
+
+    @classmethod
+    def _save(cls, upserts, deletes, dir_updates, dir_deletes):
+        if not (upserts or deletes or dir_updates or dir_deletes):
+            return
+        rows = []
+        for path in upserts:
+            row = cls._projects[path]
+            data = json.dumps(row["data"], ensure_ascii=False) if row["data"] is not None else None
+            rows.append((path, row["category"], row["info_mtime"], row["info_size"], data))
+        with SettingsStore.instance().transaction() as conn:
+            conn.executemany("""
+                INSERT INTO project_index (path, category, info_mtime, info_size, data)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET category=excluded.category, info_mtime=excluded.info_mtime,
+                    info_size=excluded.info_size, data=excluded.data
+            """, rows)
+            conn.executemany("DELETE FROM project_index WHERE path = ?", [(p,) for p in deletes])
+            conn.executemany("""
+                INSERT INTO project_index_dirs (path, mtime) VALUES (?, ?)
+                ON CONFLICT(path) DO UPDATE SET mtime=excluded.mtime
+            """, list(dir_updates.items()))
+            conn.executemany("DELETE FROM project_index_dirs WHERE path = ?", [(p,) for p in dir_deletes])
+
+    @classmethod
+    def projects(cls, root=None) -> list:
+        """
+        @brief Returns the indexed projects without touching the disk.
+
+        @param root Projects folder (defaults to conf.DEFAULT_PROJECT_DIR).
+        """
+        prefix = str(Path(root or conf.DEFAULT_PROJECT_DIR)) + os.sep
+        with cls._lock:
+            cls._ensure_loaded()
+            result = []
+            for path in sorted(cls._projects):
+                row = cls._projects[path]
+                if row["data"] is None or not path.startswith(prefix):
+                    continue
+                data = dict(row["data"])
+                data["__path"] = path
+                data["category"] = row["category"]
+                result.append(data)
+            result.sort(key=lambda d: d["category"])
+            return result
+
+    @classmethod
+    def project_folders(cls, root=None) -> list:
+        """
+        @brief Returns the indexed project folders, including those without a valid info.json.
+        """
+        prefix = str(Path(root or conf.DEFAULT_PROJECT_DIR)) + os.sep
+        with cls._lock:
+            cls._ensure_loaded()
+            return [path for path in cls._projects if path.startswith(prefix)]
+
+    @classmethod
+    def invalidate(cls, project_path=None):
+        """
+        @brief Forces a project (or, without arguments, every project) to be read again.
+        """
+        with cls._lock:
+            cls._ensure_loaded()
+            if project_path is None:
+                cls._projects, cls._dirs = {}, {}
+                with SettingsStore.instance().transaction() as conn:
+                    conn.execute("DELETE FROM project_index")
+                    conn.execute("DELETE FROM project_index_dirs")
+                return
+            project_path = str(project_path)
+            row = cls._projects.get(project_path)
+            if row is not None:
+                row["info_mtime"] = -1
+            parent = os.path.dirname(project_path)
+            if parent in cls._dirs:
+                cls._dirs[parent] = -1
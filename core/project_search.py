@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+@file project_search.py
+@brief Full-text search over the YAML files and info.json of the user projects.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the ProjectSearch class, an SQLite FTS5 index stored in the
+settings database (`project_search` table). Every project of the
+ProjectIndex is indexed with its name, category, info.json and YAML text,
+so a query like `dht GPIO4` finds the projects using that platform and pin.
+
+The index is incremental: a stamp built from the mtime and size of the
+indexed files is kept in `project_search_state` (with the rowid of the FTS
+document), and only projects whose stamp changed are indexed again.
+The GUI runs update() on a SearchIndexWorker (see ProjectWatcher) and
+search() only queries the index, so typing never reads project files.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import os, sqlite3, threading
+from pathlib import Path
+from PyQt6.QtCore import QObject, pyqtSignal
+from config.GUIconfig import conf
+from core.settings_db import SettingsStore
+from core.project_index import ProjectIndex
+from core.log_handler import GeneralLogHandler
+
+
+class ProjectSearch:
+    """
+    @brief Static FTS5 index of the user projects.
+
+    If the SQLite library has no FTS5 support, available() is False and
+    search() returns an empty list.
+    """
+    MAX_RESULTS = 200
+    MAX_FILE_BYTES = 2 * 1024 * 1024  # file più grandi non vengono indicizzati
+
+    _lock = threading.RLock()         # serializza update() e clear()
+    _tables_lock = threading.Lock()   # solo per la creazione delle tabelle: search() non attende un update()
+    _db_path = None
+    _available = False
+
+    @classmethod
+    def _ensure_tables(cls) -> bool:
+        with cls._tables_lock:
+            store = SettingsStore.instance()
+            if cls._db_path == store.db_path:
+                return cls._available
+            try:
+                with store.transaction() as conn:
+                    # "_" fa parte delle parole: wifi_ssid, device_name, ...
+                    conn.execute("""
+                        CREATE VIRTUAL TABLE IF NOT EXISTS project_search USING fts5(
+                            path UNINDEXED, name, category, info, yaml,
+                            tokenize = "unicode61 tokenchars '_'"
+                        )
+                    """)
+                    conn.execute("""
+                        CREATE TABLE IF NOT EXISTS project_search_state (
+                            path TEXT PRIMARY KEY,
+                            stamp TEXT NOT NULL,
+                            doc_id INTEGER NOT NULL
+                        )
+                    """)
+                cls._available = True
+            except sqlite3.OperationalError as e:
+                GeneralLogHandler().warning(f"Ricerca progetti non disponibile (FTS5): {e}")
+                cls._available = False
+            cls._db_path = store.db_path
+            return cls._available
+
+    @classmethod
+    def available(cls) -> bool:
+        return cls._ensure_tables()
+
+    # -----------------------------------------------
+    # |                Indicizzazione               |
+    # -----------------------------------------------
+    @staticmethod
+    def _indexed_files(folder: str) -> list:
+        """
+        @brief Returns the (path, stat) of info.json and of the YAML files of a project.
+        """
+        files = []
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    name = entry.name.lower()
+                    if entry.is_file() and (name == "info.json" or name.endswith((".yaml", ".yml"))):
+                        files.append((entry.path, entry.stat()))
+        except OSError:
+            pass
+        files.sort(key=lambda item: item[0])
+        return files
+
+    @classmethod
+    def _read_text(cls, path: str, st) -> str:
+        if st.st_size > cls.MAX_FILE_BYTES:
+            return ""
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read()
+        except OSError:
+            return ""
+
+    @classmethod
+    def update(cls, root=None) -> int:
+        """
+        @brief Indexes the projects added or changed since the last update and drops the removed ones.
+
+        @param root Projects folder (defaults to conf.DEFAULT_PROJECT_DIR).
+        @return Number of projects indexed again.
+        """
+        root = Path(root or conf.DEFAULT_PROJECT_DIR)
+        with cls._lock:
+            if not cls._ensure_tables():
+                return 0
+            store = SettingsStore.instance()
+            ProjectIndex.sync(root)
+            metadata = {p["__path"]: p for p in ProjectIndex.projects(root)}
+            stored = {path: (stamp, doc_id) for path, stamp, doc_id in
+                      store.execute("SELECT path, stamp, doc_id FROM project_search_state")}
+
+            prefix = str(root) + os.sep
+            rows, stale = [], []
+            for folder in ProjectIndex.project_folders(root):
+                files = cls._indexed_files(folder)
+                stamp = ";".join(f"{os.path.basename(p)}:{st.st_mtime_ns}:{st.st_size}" for p, st in files)
+                previous = stored.pop(folder, None)
+                if previous is not None:
+                    if previous[0] == stamp:
+                        continue
+                    stale.append((previous[1],))
+                info = metadata.get(folder, {})
+                info_text = " ".join(str(v) for k, v in info.items() if not k.startswith("__") and k != "changelog")
+                yaml_text = "\n".join(cls._read_text(p, st) for p, st in files if not p.endswith("info.json"))
+                rows.append((folder, stamp, (folder, str(info.get("name", os.path.basename(folder))),
+                             info.get("category", os.path.basename(os.path.dirname(folder))), info_text, yaml_text)))
+
+            removed = [path for path in stored if path.startswith(prefix)]
+            stale.extend((stored[path][1],) for path in removed)
+            if rows or stale:
+                with store.transaction() as conn:
+                    conn.executemany("DELETE FROM project_search WHERE rowid = ?", stale)
+                    conn.executemany("DELETE FROM project_search_state WHERE path = ?", [(p,) for p in removed])
+                    for folder, stamp, document in rows:
+                        cursor = conn.execute(
+                            "INSERT INTO project_search (path, name, category, info, yaml) VALUES (?, ?, ?, ?, ?)",
+                            document
+                        )
+                        conn.execute("""
+                            INSERT INTO project_search_state (path, stamp, doc_id) VALUES (?, ?, ?)
+                            ON CONFLICT(path) DO UPDATE SET stamp=excluded.stamp, doc_id=excluded.doc_id
+                        """, (folder, stamp, cursor.lastrowid))
+            return len(rows)
+
+    # -----------------------------------------------
+    # |                   Ricerca                   |
+    # -----------------------------------------------
+    @staticmethod
+    def build_query(text: str) -> str:
+        """
+        @brief Converts the text typed by the user into an FTS5 query.
+
+        Every word must match (AND), as a prefix: `gpio dht` → `"gpio"* "dht"*`.
+        """
+        terms = []
+        for word in text.split():
+            word = word.strip("\"'")
+            if word:
+                terms.append('"' + word.replace('"', '""') + '"*')
+        return " ".join(terms)
+
+    @classmethod
+    def search(cls, text: str, root=None, update: bool = True) -> list:
+        """
+        @brief Searches the projects whose name, metadata or YAML contain every word of `text`.
+
+        @param text Words to search (prefix match, case insensitive).
+        @param root Projects folder (defaults to conf.DEFAULT_PROJECT_DIR).
+        @param update Bring the index up to date before searching (reads the project
+               files: from the GUI pass False and let a SearchIndexWorker update it).
+        @return List of dicts {"path", "name", "category", "snippet"}, best matches first.
+        """
+        query = cls.build_query(text)
+        if not query or not cls._ensure_tables():
+            return []
+        if update:
+            cls.update(root)
+        prefix = str(Path(root or conf.DEFAULT_PROJECT_DIR)) + os.sep
+        try:
+            rows = SettingsStore.instance().execute("""
+                SELECT path, name, category, snippet(project_search, -1, '[', ']', '…', 8)
+                FROM project_search
+                WHERE project_search MATCH ?
+                ORDER BY bm25(project_search, 0.0, 10.0, 2.0, 2.0, 1.0)
+                LIMIT ?
+            """, (query, cls.MAX_RESULTS))
+        except sqlite3.OperationalError as e:
+            GeneralLogHandler().warning(f"Query di ricerca non valida '{text}': {e}")
+            return []
+        return [
+            {"path": path, "name": name, "category": category, "snippet": snippet}
+            for path, name, category, snippet in rows if path.startswith(prefix)
+        ]
+
+    @classmethod
+    def clear(cls):
+        """
+        @brief Empties the search index (it is rebuilt by the next update).
+        """
+        with cls._lock:
+            if not cls._ensure_tables():
+                return
+            with SettingsStore.instance().transaction() as conn:
+                conn.execute("DELETE FROM project_search")
+                conn.execute("DELETE FROM project_search_state")
+
+
+class SearchIndexWorker(QObject):
+    """
+    @brief Runs ProjectSearch.update() on a QThread (it reads every changed project file).
+
+    @param root Projects folder (defaults to conf.DEFAULT_PROJECT_DIR).
+
+    @signal finished(count: int): Number of projects indexed again, -1 on error.
+    """
+    finished = pyqtSignal(int)
+
+    def __init__(self, root=None):
+        super().__init__()
+        self.root = root
+
+    def run(self):
+        try:
+            count = ProjectSearch.update(self.root)
+        except Exception:
+            GeneralLogHandler().log_exception("Aggiornamento dell'indice di ricerca progetti fallito")
+            count = -1
+        self.finished.emit(count)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+@file project_watcher.py
+@brief Live watcher of the user projects folder.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the ProjectWatcher class. A QFileSystemWatcher follows
+`DEFAULT_PROJECT_DIR`, its category folders, every project folder and every
+`info.json`. Notifications are collected for DEBOUNCE_MS, then the
+ProjectIndex is synchronized once and the resulting add / change / remove
+events are emitted with the projects_changed signal.
+
+Projects created by scripts, copied by hand or updated by a git pull appear
+in the open windows without a full rescan.
+
+The watcher also keeps the ProjectSearch full-text index up to date, on a
+SearchIndexWorker thread, so the search bar only runs the FTS query.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import os
+from pathlib import Path
+from PyQt6.QtCore import QObject, QTimer, QThread, QFileSystemWatcher, pyqtSignal
+from config.GUIconfig import conf
+from core.project_index import ProjectIndex
+from core.project_search import SearchIndexWorker
+from core.log_handler import GeneralLogHandler
+
+
+class ProjectWatcher(QObject):
+    """
+    @brief Debounced filesystem watcher feeding the ProjectIndex.
+
+    Use instance() from the GUI thread: one watcher is shared by every window.
+
+    @signal projects_changed(changes: dict): Emitted with the project paths that were
+            "added", "changed" and "removed" after a burst of filesystem events.
+    @signal search_index_updated(count: int): Emitted when an update of the search index ends,
+            with the number of projects indexed again (-1 on error).
+    """
+    projects_changed = pyqtSignal(dict)
+    search_index_updated = pyqtSignal(int)
+
+    DEBOUNCE_MS = 300
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> "ProjectWatcher":
+        """
+        @brief Returns the watcher of `conf.DEFAULT_PROJECT_DIR`, creating it on first use.
+        """
+        root = Path(conf.DEFAULT_PROJECT_DIR)
+        if cls._instance is None or cls._instance.root != root:
+            if cls._instance is not None:
+                cls._instance.stop()
+            cls._instance = cls(root)
+        cls._instance.update_watch_list()  # la cartella potrebbe essere stata creata nel frattempo
+        return cls._instance
+
+    def __init__(self, root=None):
+        super().__init__()
+        self.root = Path(root or conf.DEFAULT_PROJECT_DIR)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._flush)
+
+        self._index_worker = None
+        self._index_thread = None
+        self._index_pending = False  # richiesta arrivata durante un aggiornamento in corso
+
+    def _on_path_changed(self, path: str):
+        # Ogni notifica riavvia il timer: una raffica di eventi produce un solo aggiornamento
+        self._timer.start()
+
+    def _flush(self):
+        try:
+            changes = ProjectIndex.sync(self.root)
+        except Exception as e:
+            GeneralLogHandler().error(f"Aggiornamento indice progetti fallito: {e}")
+            return
+        self.update_watch_list()
+        if any(changes.values()):
+            self.update_search_index()
+            self.projects_changed.emit(changes)
+
+    def update_search_index(self):
+        """
+        @brief Brings the ProjectSearch index up to date on a worker thread.
+
+        Requests made while an update is running are merged into one more update at its end.
+        """
+        if self._index_thread is not None:
+            self._index_pending = True
+            return
+        self._index_pending = False
+        worker = SearchIndexWorker(self.root)
+        thread = QThread()
+        worker.moveToThread(thread)
+        worker.finished.connect(self._on_search_index_updated)
+        thread.started.connect(worker.run)
+        self._index_worker, self._index_thread = worker, thread
+        thread.start()
+
+    def _release_index_thread(self):
+        worker, thread = self._index_worker, self._index_thread
+        self._index_worker = self._index_thread = None
+        if thread is not None:
+            thread.quit()
+            thread.wait()
+            worker.deleteLater()
+            thread.deleteLater()
+
+    def _on_search_index_updated(self, count: int):
+        self._release_index_thread()
+        if self._index_pending:
+            self.update_search_index()
+        self.search_index_updated.emit(count)
+
+    def update_watch_list(self):
+        """
+        @brief Aligns the watched paths with the current folders and info.json files.
+        """
+        wanted = set()
+        if self.root.is_dir():
+            wanted.add(str(self.root))
+            with os.scandir(self.root) as it:
+                wanted.update(entry.path for entry in it if entry.is_dir())
+            for folder in ProjectIndex.project_folders(self.root):
+                wanted.add(folder)
+                info_path = os.path.join(folder, "info.json")
+                if os.path.isfile(info_path):
+                    wanted.add(info_path)
+
+        current = set(self._watcher.directories()) | set(self._watcher.files())
+        stale = current - wanted
+        if stale:
+            self._watcher.removePaths(list(stale))
+        missing = wanted - current
+        if missing:
+            self._watcher.addPaths(list(missing))
+
+    def stop(self):
+        """
+        @brief Stops watching (pending events are discarded).
+        """
+        self._timer.stop()
+        self._index_pending = False
+        self._release_index_thread()  # attende l'aggiornamento in corso: il thread non può restare orfano
+        paths = self._watcher.directories() + self._watcher.files()
+        if paths:
+            self._watcher.removePaths(paths)
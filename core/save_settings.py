@@ -12,6 +12,10 @@ Updates:
 - Default project path
 - Splash screen display toggle
 - Update check toggle
+- Compile cache toggle
+- Community projects offline mode
+- Console line limit
+- Deferred highlighting threshold
 
 Also refreshes the GUI to apply changes immediately.
 
@@ -20,10 +24,11 @@ Also refreshes the GUI to apply changes immediately.
 @license GNU Affero General Public License v3.0 (AGPLv3)
 """
 
-from core.settings_db import set_setting
+from core.settings_db import set_setting, set_settings
 from PyQt6.QtWidgets import QApplication
 from core.translator import Translator
 from config.GUIconfig import LANGUAGES
+from core.log_handler import ConsoleSink
 
 def save_settings(dialog):
     """
@@ -54,19 +59,58 @@ def save_settings(dialog):
             if hasattr(widget, "aggiorna_tutte_le_label"):
                 widget.aggiorna_tutte_le_label()
 
+    # Le altre impostazioni sono salvate in un'unica transazione
+    values = {}
+
     # --- PROJECT PATH ---
     project_path = dialog.project_path_edit.text().strip()
     if project_path:
-        set_setting("default_project_path", project_path)
+        values["default_project_path"] = project_path
 
     # --- SPLASH SCREEN ---
     splash_enabled = dialog.splash_checkbox.isChecked()
-    set_setting("show_splash", "1" if splash_enabled else "0")
+    values["show_splash"] = "1" if splash_enabled else "0"
 
     # --- CHECK AGGIORNAMENTI ---
     check_updates = dialog.update_checkbox.isChecked()
-    set_setting("check_updates", "1" if check_updates else "0")
-
-
-
-
+    values["check_updates"] = "1" if check_updates else "0"
+
+    # --- CACHE DI COMPILAZIONE ---
+    if hasattr(dialog, "compile_cache_checkbox"):
+        values["compile_cache"] = "1" if dialog.compile_cache_checkbox.isChecked() else "0"
+
+    # --- MODALITÀ OFFLINE PROGETTI COMMUNITY ---
+    if hasattr(dialog, "community_offline_checkbox"):
+        values["community_offline"] = "1" if dialog.community_offline_checkbox.isChecked() else "0"
+
+    # --- LIMITE RIGHE CONSOLE ---
+    max_lines = None
+    if hasattr(dialog, "console_lines_spin"):
+        max_lines = dialog.console_lines_spin.value()
+        values["console_max_lines"] = str(max_lines)
+
+    # --- SOGLIA EVIDENZIAZIONE DIFFERITA ---
+    highlight_lines = None
+    if hasattr(dialog, "highlight_lines_spin"):
+        highlight_lines = dialog.highlight_lines_spin.value()
+        values["highlight_deferred_lines"] = str(highlight_lines)
+
+    # --- ESCLUSIONI ESPORTAZIONE PROGETTI ---
+    if hasattr(dialog, "export_ignore_input"):
+        patterns = [p.strip() for p in dialog.export_ignore_input.text().split(",") if p.strip()]
+        values["export_ignore"] = ", ".join(patterns)  # vuoto = lista predefinita
+
+    set_settings(values)
+
+    if highlight_lines is not None:
+        for widget in QApplication.topLevelWidgets():
+            highlighter = getattr(widget, "highlighter", None)
+            if highlighter is not None and hasattr(highlighter, "large_document_lines"):
+                highlighter.large_document_lines = highlight_lines
+
+    if max_lines is not None:
+        # Applica subito il limite alla console aperta
+        for widget in QApplication.topLevelWidgets():
+            console = getattr(widget, "console_output", None)
+            if console is not None:
+                ConsoleSink.for_console(console).set_max_lines(max_lines)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+@file sensor_catalog.py
+@brief Headless access to the sensor definitions of sensors.json.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the SensorCatalog class, used when sensor blocks are rebuilt from
+YAML: definitions are looked up through dictionaries (by platform and by label)
+without creating any widget.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+from core.catalog_registry import CatalogRegistry
+from core.log_handler import GeneralLogHandler
+from core.translator import Translator
+
+
+class SensorCatalog:
+    """
+    @brief Static, indexed view of the sensor catalog.
+
+    Lookups use the CatalogRegistry indexes of sensors.json (by platform and
+    by label), rebuilt only when the file changes on disk.
+    """
+
+    @classmethod
+    def sensors(cls, path: str = None) -> list:
+        """
+        @brief Returns every sensor definition.
+        """
+        return CatalogRegistry.catalog("sensors", path)
+
+    @classmethod
+    def find(cls, platform: str, label: str = None, path: str = None):
+        """
+        @brief Finds the definition of a sensor by platform or by label.
+
+        Same result as scanning the list for the first definition whose platform
+        or label matches; the list is scanned only when the two match different
+        definitions.
+
+        @param platform Sensor platform as written in the YAML (e.g. "dht").
+        @param label Sensor name, compared with the catalog labels.
+        @param path Optional sensors.json path.
+        @return Definition dict, or None if not found or if sensors.json cannot be read.
+        """
+        try:
+            by_platform = CatalogRegistry.catalog_index("sensors", "platform", path)
+            by_label = CatalogRegistry.catalog_index("sensors", "label", path)
+        except Exception as e:
+            # sensors.json mancante o non valido: il sensore viene saltato come se non fosse definito
+            GeneralLogHandler().error(Translator.tr("log_failed_load_sensors").format(error=str(e)))
+            return None
+        platform_match = by_platform.get((platform or "").lower())
+        label_match = by_label.get(label)
+        if platform_match is None or label_match is None or platform_match is label_match:
+            return platform_match or label_match
+        # Corrispondenze diverse: vince la prima definizione dell'elenco, come nella scansione lineare
+        return next(s for s in cls.sensors(path) if s is platform_match or s is label_match)
+
+    @staticmethod
+    def detect_connection_type(sensor: dict) -> str:
+        """
+        @brief Determines the connection type of a sensor from its parameters.
+
+        @return "I2C", "Analogico", "Digitale" or "Sconosciuto".
+        """
+        keys = [p["key"] for p in sensor.get("params", [])]
+        if any("i2c" in k.lower() for k in keys):
+            return "I2C"
+        elif "analog" in sensor.get("label", "").lower():
+            return "Analogico"
+        elif "gpio" in sensor.get("platform", "").lower():
+            return "Digitale"
+        return "Sconosciuto"
@@ -12,17 +12,135 @@ Handles:
 - Get/set operations for key-value pairs in user config
 - Storage of recently opened projects with timestamps
 
+All the functions share one long-lived connection (WAL mode) owned by the
+SettingsStore singleton. The `settings` table is loaded once into memory:
+reads are dictionary lookups, writes go to the database and to the cache.
+
 @version \ref PROJECT_NUMBER
 @date July 2025
 @license GNU Affero General Public License v3.0 (AGPLv3)
 """
 
-import sqlite3, os, traceback
+import sqlite3, os, traceback, threading
+from contextlib import contextmanager
 from config.GUIconfig import conf
 from core.log_handler import GeneralLogHandler
 
 logger = GeneralLogHandler()
 
+
+class SettingsStore:
+    """
+    @brief Single shared connection to the settings database, with a write-through cache.
+
+    The connection is opened lazily, can be used from any thread (access is
+    serialized by a lock) and stays open for the whole session.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = None
+        self._cache = None  # dict key -> value, caricato alla prima lettura
+        self._lock = threading.RLock()
+
+    @classmethod
+    def instance(cls) -> "SettingsStore":
+        """
+        @brief Returns the store of the current `conf.USER_DB_PATH`.
+        """
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance.db_path != conf.USER_DB_PATH:
+                if cls._instance is not None:
+                    cls._instance.close()
+                cls._instance = cls(conf.USER_DB_PATH)
+            return cls._instance
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.DatabaseError:
+                pass  # es. filesystem che non supporta WAL: resta il journal di default
+            self._conn = conn
+        return self._conn
+
+    def create_tables(self):
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS recent_files (
+                    path TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    last_opened TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            self.conn.commit()
+            self._cache = None  # ricarica dopo la (eventuale) creazione
+
+    def _load_cache(self) -> dict:
+        if self._cache is None:
+            rows = self.conn.execute("SELECT key, value FROM settings").fetchall()
+            self._cache = dict(rows)
+        return self._cache
+
+    def get(self, key: str):
+        with self._lock:
+            return self._load_cache().get(key)
+
+    def set_many(self, values: dict):
+        """
+        @brief Writes several settings in a single transaction, then updates the cache.
+        """
+        if not values:
+            return
+        items = [(key, value) for key, value in values.items()]
+        with self._lock:
+            with self.conn:  # commit, o rollback in caso di errore
+                self.conn.executemany("""
+                    INSERT INTO settings (key, value) VALUES (?, ?)
+                    ON CONFLICT(key) DO UPDATE SET value=excluded.value
+                """, items)
+            if self._cache is not None:
+                self._cache.update(items)
+
+    @contextmanager
+    def transaction(self):
+        """
+        @brief Context manager yielding the connection inside a single transaction.
+
+        Commits on success, rolls back on error; other threads wait on the lock.
+        """
+        with self._lock:
+            with self.conn:
+                yield self.conn
+
+    def execute(self, sql: str, params=(), commit: bool = False) -> list:
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            results = cursor.fetchall()
+            if commit:
+                self.conn.commit()
+            return results
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._cache = None
+
+
 def init_db():
     """
     @brief Initializes the SQLite database if not already present.
@@ -30,23 +148,7 @@ def init_db():
     Creates `settings` and `recent_files` tables if they do not exist.
     Does not insert any default values.
     """
-    conn = sqlite3.connect(conf.USER_DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS settings (
-            key TEXT PRIMARY KEY,
-            value TEXT NOT NULL
-        )
-    """)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS recent_files (
-            path TEXT PRIMARY KEY,
-            filename TEXT NOT NULL,
-            last_opened TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    conn.commit()
-    conn.close()
+    SettingsStore.instance().create_tables()
 
 
 def set_setting(key: str, value: str):
@@ -59,14 +161,16 @@ def set_setting(key: str, value: str):
     if key == "language":
         logger = GeneralLogHandler()
         logger.debug(f"set_setting('language', '{value}') chiamato da:\n{''.join(traceback.format_stack(limit=5))}")
-    conn = sqlite3.connect(conf.USER_DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO settings (key, value) VALUES (?, ?)
-        ON CONFLICT(key) DO UPDATE SET value=excluded.value
-    """, (key, value))
-    conn.commit()
-    conn.close()
+    SettingsStore.instance().set_many({key: value})
+
+
+def set_settings(values: dict):
+    """
+    @brief Sets or updates several settings at once, in a single transaction.
+
+    @param values Dictionary of setting names and string values.
+    """
+    SettingsStore.instance().set_many(values)
 
 
 def get_setting(key: str) -> str | None:
@@ -77,12 +181,8 @@ def get_setting(key: str) -> str | None:
     @return The stored value, or None if not found or an error occurs.
     """
     try:
-        conn = sqlite3.connect(conf.USER_DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT value FROM settings WHERE key=?", (key,))
-        result = cursor.fetchone()
-        conn.close()
-        return result[0].strip() if result and result[0].strip() else None
+        value = SettingsStore.instance().get(key)
+        return value.strip() if value and value.strip() else None
     except Exception:
         return None
 
@@ -94,15 +194,11 @@ def add_recent_file(path: str):
     @param path Absolute path to the YAML file.
     """
     filename = os.path.basename(path)
-    conn = sqlite3.connect(conf.USER_DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
+    SettingsStore.instance().execute("""
         INSERT INTO recent_files (path, filename, last_opened)
         VALUES (?, ?, CURRENT_TIMESTAMP)
         ON CONFLICT(path) DO UPDATE SET last_opened=CURRENT_TIMESTAMP, filename=excluded.filename
-    """, (path, filename))
-    conn.commit()
-    conn.close()
+    """, (path, filename), commit=True)
 
 
 def get_recent_files(limit: int = 4) -> list[tuple[str, str]]:
@@ -112,13 +208,8 @@ def get_recent_files(limit: int = 4) -> list[tuple[str, str]]:
     @param limit Maximum number of entries to return.
     @return List of tuples (path, filename) ordered by last_opened descending.
     """
-    conn = sqlite3.connect(conf.USER_DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
+    return SettingsStore.instance().execute("""
         SELECT path, filename FROM recent_files
         ORDER BY last_opened DESC
         LIMIT ?
     """, (limit,))
-    results = cursor.fetchall()
-    conn.close()
-    return results
@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+"""
+@file snapshot_store.py
+@brief Content-addressed, deduplicated snapshots of project folders.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the SnapshotStore class. Layout under `conf.SNAPSHOT_FOLDER`:
+- `objects/<ab>/<sha256>`: file contents, stored once whatever the number of
+  snapshots (and projects) referencing them
+- `manifests/<project key>/<snapshot id>.json`: one small manifest per snapshot,
+  mapping every relative path to its hash, size, mode and mtime
+
+A new snapshot hashes only the files whose size or mtime differ from the
+previous manifest of the same project, so disk use and time grow with the
+changed files only. Build and cache folders are skipped with the same ignore
+list used by the project export. Only the newest MAX_SNAPSHOTS snapshots of a
+project are kept; the objects no longer referenced are then removed.
+
+Snapshots are limited to real project folders (see is_snapshot_allowed()), and
+a restore is planned first (plan_restore()) so the GUI can confirm the files
+it is going to overwrite and remove. SnapshotWorker runs both on a QThread.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import os, re, json, time, shutil, hashlib, fnmatch
+from datetime import datetime
+from pathlib import Path
+from PyQt6.QtCore import QObject, pyqtSignal
+from config.GUIconfig import conf
+from core.project_handler import ExportWorker
+from core.log_handler import GeneralLogHandler
+
+
+class SnapshotStore:
+    """
+    @brief Stores and restores project snapshots made of deduplicated file objects.
+    """
+    CHUNK_SIZE = 1024 * 1024
+    MAX_SNAPSHOTS = 20  # snapshot conservati per progetto
+
+    def __init__(self, root=None, ignore=None):
+        self.root = Path(root or conf.SNAPSHOT_FOLDER)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+        self.ignore = list(ignore) if ignore is not None else ExportWorker.ignore_patterns()
+        self.logger = GeneralLogHandler()
+
+    # -----------------------------------------------
+    # |                   Oggetti                   |
+    # -----------------------------------------------
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    @classmethod
+    def _hash_file(cls, path: str) -> str:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(cls.CHUNK_SIZE):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _store_object(self, path: str, digest: str) -> bool:
+        """
+        @brief Copies a file into the object store, unless an object with the same hash exists.
+
+        @return True if a new object was written.
+        """
+        target = self._object_path(digest)
+        if target.exists():
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{digest}.{os.getpid()}.tmp")
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+        return True
+
+    # -----------------------------------------------
+    # |                  Ambito                     |
+    # -----------------------------------------------
+    @staticmethod
+    def is_snapshot_allowed(project_dir) -> bool:
+        """
+        @brief Tells whether a folder can be snapshotted (and restored, which removes files).
+
+        Allowed: folders under DEFAULT_PROJECT_DIR or COMMUNITY_LOCAL_FOLDER, and
+        elsewhere only folders holding a single YAML (besides secrets.yaml), so a YAML
+        opened from a shared folder such as Downloads never snapshots the whole folder.
+        """
+        project_dir = os.path.abspath(str(project_dir))
+        for root in (conf.DEFAULT_PROJECT_DIR, conf.COMMUNITY_LOCAL_FOLDER):
+            root = os.path.abspath(str(root))
+            if project_dir != root and project_dir.startswith(root + os.sep):
+                return True
+        try:
+            with os.scandir(project_dir) as it:
+                yamls = [e.name for e in it if e.is_file() and e.name.lower().endswith((".yaml", ".yml"))
+                         and e.name.lower() not in ("secrets.yaml", "secrets.yml")]
+        except OSError:
+            return False
+        return len(yamls) == 1
+
+    # -----------------------------------------------
+    # |                  Manifest                   |
+    # -----------------------------------------------
+    @staticmethod
+    def project_key(project_dir) -> str:
+        """
+        @brief Folder name of the manifests of a project: "<folder name>-<hash of the absolute path>".
+        """
+        abs_path = os.path.abspath(str(project_dir))
+        slug = re.sub(r"[^\w\-]+", "_", os.path.basename(abs_path)) or "project"
+        return f"{slug}-{hashlib.sha1(abs_path.encode('utf-8')).hexdigest()[:10]}"
+
+    def _project_manifests(self, project_dir) -> Path:
+        return self.manifests_dir / self.project_key(project_dir)
+
+    def _load_manifest(self, project_dir, snapshot_id: str) -> dict:
+        with open(self._project_manifests(project_dir) / f"{snapshot_id}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def list_snapshots(self, project_dir) -> list:
+        """
+        @brief Lists the snapshots of a project, newest first.
+
+        @return List of dicts {"id", "created", "label", "files", "size"}.
+        """
+        folder = self._project_manifests(project_dir)
+        if not folder.is_dir():
+            return []
+        result = []
+        for manifest_path in sorted(folder.glob("*.json"), reverse=True):
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            result.append({
+                "id": manifest_path.stem,
+                "created": manifest.get("created", ""),
+                "label": manifest.get("label", ""),
+                "files": len(manifest.get("files", {})),
+                "size": sum(entry["size"] for entry in manifest.get("files", {}).values())
+            })
+        return result
+
+    # -----------------------------------------------
+    # |                  Snapshot                   |
+    # -----------------------------------------------
+    def _ignored(self, name: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.ignore)
+
+    def _scan(self, project_dir: str):
+        """
+        @brief Yields (relative path with "/", absolute path, os.stat_result) of the files to snapshot.
+        """
+        for root, dirs, files in os.walk(project_dir):
+            dirs[:] = sorted(d for d in dirs if not self._ignored(d))
+            for name in sorted(files):
+                if self._ignored(name):
+                    continue
+                abs_path = os.path.join(root, name)
+                try:
+                    st = os.stat(abs_path)
+                except OSError:
+                    continue
+                rel = os.path.relpath(abs_path, project_dir).replace(os.sep, "/")
+                yield rel, abs_path, st
+
+    def create(self, project_dir, label: str = "", prune: bool = True) -> dict:
+        """
+        @brief Takes a snapshot of a project folder.
+
+        @param project_dir Project folder.
+        @param label Optional description (e.g. "before changing the board").
+        @param prune Drop the snapshots beyond MAX_SNAPSHOTS afterwards.
+        @return Dict {"id", "files", "new_objects", "new_bytes"}.
+        """
+        project_dir = os.path.abspath(str(project_dir))
+        previous = {}
+        snapshots = self.list_snapshots(project_dir)
+        if snapshots:
+            try:
+                previous = self._load_manifest(project_dir, snapshots[0]["id"]).get("files", {})
+            except (OSError, ValueError):
+                previous = {}
+
+        files, new_objects, new_bytes = {}, 0, 0
+        for rel, abs_path, st in self._scan(project_dir):
+            old = previous.get(rel)
+            if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns \
+                    and self._object_path(old["hash"]).exists():
+                digest = old["hash"]  # file invariato: niente da rileggere
+            else:
+                digest = self._hash_file(abs_path)
+                if self._store_object(abs_path, digest):
+                    new_objects += 1
+                    new_bytes += st.st_size
+            files[rel] = {"hash": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                          "mode": st.st_mode & 0o777}
+
+        now = datetime.now()
+        snapshot_id = now.strftime("%Y%m%d-%H%M%S-%f")
+        manifest = {
+            "project": project_dir,
+            "created": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "label": label,
+            "files": files
+        }
+        folder = self._project_manifests(project_dir)
+        folder.mkdir(parents=True, exist_ok=True)
+        tmp = folder / f"{snapshot_id}.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, folder / f"{snapshot_id}.json")
+        if prune:
+            self.prune(project_dir)
+        return {"id": snapshot_id, "files": len(files), "new_objects": new_objects, "new_bytes": new_bytes}
+
+    def plan_restore(self, project_dir, snapshot_id: str) -> dict:
+        """
+        @brief Computes what restore() would do, without touching the project folder.
+
+        @return Dict {"restore": [relative paths to overwrite or recreate],
+                "remove": [relative paths created after the snapshot]}.
+        @throws OSError / ValueError if the manifest or an object is missing.
+        """
+        project_dir = os.path.abspath(str(project_dir))
+        files = self._load_manifest(project_dir, snapshot_id).get("files", {})
+        missing = [rel for rel, entry in files.items() if not self._object_path(entry["hash"]).exists()]
+        if missing:
+            raise FileNotFoundError(f"snapshot {snapshot_id}: missing objects for {', '.join(missing[:5])}")
+
+        current = {rel: (abs_path, st) for rel, abs_path, st in self._scan(project_dir)}
+        to_restore = []
+        for rel, entry in files.items():
+            found = current.pop(rel, None)
+            if found is not None:
+                abs_path, st = found
+                if st.st_size == entry["size"] and (st.st_mtime_ns == entry["mtime_ns"]
+                                                    or self._hash_file(abs_path) == entry["hash"]):
+                    continue
+            to_restore.append(rel)
+        return {"restore": sorted(to_restore), "remove": sorted(current)}
+
+    def restore(self, project_dir, snapshot_id: str, allowed_removals=None, backup: bool = True) -> dict:
+        """
+        @brief Brings a project folder back to the state of a snapshot.
+
+        Files identical to the snapshot are left alone, changed or missing ones are
+        copied from the object store, files created after the snapshot are removed
+        (ignored folders such as build trees are never touched).
+
+        @param project_dir Project folder.
+        @param snapshot_id Id returned by create() / list_snapshots().
+        @param allowed_removals Relative paths the user agreed to remove (the "remove" list of
+               plan_restore()); files created in the meantime are kept. None removes every extra file.
+        @param backup Take a snapshot of the current state first, so the restore can be undone.
+        @return Dict {"restored", "removed", "backup"}.
+        @throws OSError / ValueError if the manifest or an object is missing.
+        """
+        project_dir = os.path.abspath(str(project_dir))
+        files = self._load_manifest(project_dir, snapshot_id).get("files", {})
+        plan = self.plan_restore(project_dir, snapshot_id)
+
+        # Niente pulizia prima della copia: lo snapshot da ripristinare potrebbe essere il più vecchio
+        backup_id = self.create(project_dir, label=f"before restore {snapshot_id}", prune=False)["id"] if backup else None
+
+        for rel in plan["restore"]:
+            entry = files[rel]
+            target = os.path.join(project_dir, *rel.split("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.restore.tmp"
+            shutil.copyfile(self._object_path(entry["hash"]), tmp)
+            os.chmod(tmp, entry.get("mode", 0o644))
+            os.replace(tmp, target)
+            os.utime(target, ns=(time.time_ns(), entry["mtime_ns"]))
+
+        removed = 0
+        allowed = None if allowed_removals is None else set(allowed_removals)
+        for rel in plan["remove"]:
+            if allowed is not None and rel not in allowed:
+                continue
+            os.remove(os.path.join(project_dir, *rel.split("/")))
+            removed += 1
+        if backup:
+            self.prune(project_dir, keep=(snapshot_id,))
+        return {"restored": len(plan["restore"]), "removed": removed, "backup": backup_id}
+
+    # -----------------------------------------------
+    # |                  Pulizia                    |
+    # -----------------------------------------------
+    def delete(self, project_dir, snapshot_id: str):
+        """
+        @brief Deletes a snapshot manifest (objects are freed by collect_garbage()).
+        """
+        path = self._project_manifests(project_dir) / f"{snapshot_id}.json"
+        if path.exists():
+            path.unlink()
+
+    def prune(self, project_dir, keep=()) -> int:
+        """
+        @brief Keeps the newest MAX_SNAPSHOTS snapshots of a project and frees the unused objects.
+
+        @param keep Snapshot ids never deleted (e.g. the one just restored); older ones go instead.
+        @return Number of snapshots deleted.
+        """
+        snapshots = self.list_snapshots(project_dir)
+        excess = len(snapshots) - self.MAX_SNAPSHOTS
+        if excess <= 0:
+            return 0
+        old = [snapshot for snapshot in snapshots if snapshot["id"] not in keep][-excess:]
+        for snapshot in old:
+            self.delete(project_dir, snapshot["id"])
+        if old:
+            self.collect_garbage()
+        return len(old)
+
+    def collect_garbage(self) -> int:
+        """
+        @brief Removes the objects no longer referenced by any manifest.
+
+        @return Number of objects removed.
+        """
+        referenced = set()
+        for manifest_path in self.manifests_dir.glob("*/*.json"):
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    referenced.update(entry["hash"] for entry in json.load(f).get("files", {}).values())
+            except (OSError, ValueError, KeyError) as e:
+                # Manifest illeggibile: meglio non cancellare nulla
+                self.logger.warning(f"Snapshot GC interrotto, manifest non leggibile {manifest_path}: {e}")
+                return 0
+        removed = 0
+        for obj in self.objects_dir.glob("*/*"):
+            if obj.name not in referenced:
+                obj.unlink()
+                removed += 1
+        return removed
+
+
+class SnapshotWorker(QObject):
+    """
+    @brief Runs a SnapshotStore operation on a QThread (hashing and copying stay off the GUI thread).
+
+    @param action "create", "plan" or "restore".
+    @param project_dir Project folder.
+    @param label Snapshot description ("create").
+    @param snapshot_id Snapshot to plan or restore ("plan", "restore").
+    @param allowed_removals Files the user confirmed for removal ("restore").
+
+    @signal finished(result: dict): Result of the SnapshotStore method.
+    @signal failed(error: str): Error message.
+    """
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, action: str, project_dir, label: str = "", snapshot_id: str = "", allowed_removals=None):
+        super().__init__()
+        self.action = action
+        self.project_dir = project_dir
+        self.label = label
+        self.snapshot_id = snapshot_id
+        self.allowed_removals = allowed_removals
+
+    def run(self):
+        try:
+            store = SnapshotStore()
+            if self.action == "create":
+                result = store.create(self.project_dir, self.label)
+            elif self.action == "plan":
+                result = store.plan_restore(self.project_dir, self.snapshot_id)
+            else:
+                result = store.restore(self.project_dir, self.snapshot_id, self.allowed_removals)
+        except Exception as e:
+            GeneralLogHandler().log_exception(f"Errore snapshot ({self.action}) su {self.project_dir}")
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(result)
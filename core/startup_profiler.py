@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+@file startup_profiler.py
+@brief Built-in startup profiler (`main.py --profile-startup`).
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the StartupProfiler class. When enabled it records:
+- the time spent in every import statement that loaded new modules
+  (cumulative and self time, per thread, like `python -X importtime`)
+- the wall clock of the startup phases (QApplication, database, splash
+  checks, main window...) measured from the start of main.py
+- instant marks such as the first window shown
+
+The report is written as plain text to `LOG_DIR/startup_profile.txt`.
+When disabled every call is a no-op, so the hooks can stay in the code.
+
+Only stdlib imports at module level: the profiler must be enabled before
+the rest of the application is imported.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import sys, time, builtins, platform, threading, importlib.util
+from contextlib import contextmanager
+from datetime import datetime
+
+_T0 = time.perf_counter()  # riferimento: primo import del profiler (inizio di main.py)
+
+
+class StartupProfiler:
+    """
+    @brief Static collector of import times, phases and marks.
+    """
+    ARGUMENT = "--profile-startup"
+    TOP_IMPORTS = 40
+
+    enabled = False
+    _original_import = None
+    _local = threading.local()
+    _lock = threading.Lock()
+    _imports = []   # (modulo, cumulativo s, self s, thread)
+    _phases = []    # (nome, inizio, fine) in secondi da _T0
+    _open = {}      # fasi iniziate con begin() e non ancora chiuse
+    _marks = []     # (nome, istante)
+
+    @classmethod
+    def enable_from_argv(cls, argv=None) -> bool:
+        """
+        @brief Enables the profiler if `--profile-startup` is on the command line (and removes the flag).
+        """
+        argv = sys.argv if argv is None else argv
+        if cls.ARGUMENT not in argv:
+            return False
+        argv.remove(cls.ARGUMENT)
+        cls.enable()
+        return True
+
+    @classmethod
+    def enable(cls):
+        if cls.enabled:
+            return
+        cls.enabled = True
+        cls._original_import = builtins.__import__
+        builtins.__import__ = cls._timed_import
+
+    @classmethod
+    def disable(cls):
+        if cls.enabled and builtins.__import__ is cls._timed_import:
+            builtins.__import__ = cls._original_import
+        cls.enabled = False
+
+    # -----------------------------------------------
+    # |                   Import                    |
+    # -----------------------------------------------
+    @classmethod
+    def _timed_import(cls, name, globals=None, locals=None, fromlist=(), level=0):
+        original = cls._original_import
+        if level == 0 and name in sys.modules and not fromlist:
+            return original(name, globals, locals, fromlist, level)  # già caricato: nessun costo da misurare
+
+        stack = getattr(cls._local, "stack", None)
+        if stack is None:
+            stack = cls._local.stack = []
+        frame = [0.0]  # tempo speso negli import annidati
+        stack.append(frame)
+        loaded_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            if len(sys.modules) != loaded_before:
+                if level:
+                    try:
+                        name = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+                    except (ImportError, ValueError):
+                        pass
+                with cls._lock:
+                    cls._imports.append((name, elapsed, elapsed - frame[0], threading.current_thread().name))
+
+    # -----------------------------------------------
+    # |                 Fasi e marker               |
+    # -----------------------------------------------
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter() - _T0
+
+    @classmethod
+    def begin(cls, name: str):
+        if cls.enabled:
+            cls._open[name] = cls.now()
+
+    @classmethod
+    def end(cls, name: str):
+        if cls.enabled and name in cls._open:
+            cls._phases.append((name, cls._open.pop(name), cls.now()))
+
+    @classmethod
+    @contextmanager
+    def phase(cls, name: str):
+        """
+        @brief Context manager measuring the wall clock of a startup phase.
+        """
+        cls.begin(name)
+        try:
+            yield
+        finally:
+            cls.end(name)
+
+    @classmethod
+    def add_phase(cls, name: str, start: float, end: float):
+        """
+        @brief Records a phase measured elsewhere, with time.perf_counter() values.
+        """
+        if cls.enabled:
+            with cls._lock:
+                cls._phases.append((name, start - _T0, end - _T0))
+
+    @classmethod
+    def mark(cls, name: str):
+        if cls.enabled:
+            cls._marks.append((name, cls.now()))
+
+    # -----------------------------------------------
+    # |                   Report                    |
+    # -----------------------------------------------
+    @classmethod
+    def report(cls) -> str:
+        lines = [
+            f"ESPHomeGUIeasy startup profile - {datetime.now():%Y-%m-%d %H:%M:%S}",
+            f"Python {platform.python_version()} ({sys.executable}) on {platform.platform()}",
+            f"Total: {cls.now() * 1000:.1f} ms from the start of main.py",
+            "",
+            "Phases (ms from the start of main.py)",
+            f"{'start':>9} {'end':>9} {'duration':>9}  phase",
+        ]
+        for name, start, end in sorted(cls._phases, key=lambda p: p[1]):
+            lines.append(f"{start * 1000:9.1f} {end * 1000:9.1f} {(end - start) * 1000:9.1f}  {name}")
+        for name in cls._open:
+            lines.append(f"{cls._open[name] * 1000:9.1f} {'-':>9} {'-':>9}  {name} (not finished)")
+
+        if cls._marks:
+            lines += ["", "Marks"]
+            lines += [f"{at * 1000:9.1f}  {name}" for name, at in cls._marks]
+
+        imports = sorted(cls._imports, key=lambda i: i[1], reverse=True)
+        # Somma dei tempi self: il cumulativo include gli import annidati e andrebbe contato più volte
+        total_self = sum(i[2] for i in cls._imports)
+        lines += [
+            "",
+            f"Imports: {len(imports)} import statements loading new modules, {total_self * 1000:.1f} ms in total",
+            f"Top {min(cls.TOP_IMPORTS, len(imports))} by cumulative time:",
+            f"{'cumul. ms':>9} {'self ms':>9}  module [thread]",
+        ]
+        for name, cumulative, self_time, thread in imports[:cls.TOP_IMPORTS]:
+            lines.append(f"{cumulative * 1000:9.1f} {self_time * 1000:9.1f}  {name} [{thread}]")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def write_report(cls, path=None):
+        """
+        @brief Writes the report (default: LOG_DIR/startup_profile.txt) and stops timing imports.
+
+        @return Path of the report, or None if the profiler is disabled.
+        """
+        if not cls.enabled:
+            return None
+        if path is None:
+            from config.GUIconfig import conf
+            path = conf.LOG_DIR / "startup_profile.txt"
+        text = cls.report()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        cls.disable()
+        return path
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+@file startup_scheduler.py
+@brief Runs the startup checks concurrently, following their dependencies.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the StartupTask and StartupScheduler classes. Every task declares
+the tasks it depends on, whether it is critical and a time budget:
+- the body of a task runs on a worker thread as soon as its dependencies succeeded
+- the optional `on_result` callback runs on the GUI thread (dialogs, widgets),
+  one callback at a time
+- a critical task that fails or exceeds its budget stops the startup,
+  a non-critical one is only logged and its dependents are skipped
+
+critical_done is emitted as soon as every critical task has completed, so the
+splash screen does not wait for slow optional checks (e.g. the update check).
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import time, traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from core.log_handler import GeneralLogHandler
+
+
+class StartupTask:
+    """
+    @brief A single startup step.
+
+    @param name Unique id of the task (used in `deps`).
+    @param func Body of the task, executed on a worker thread; its return value is passed to on_result.
+    @param message Text (or callable returning the text) shown while the task runs.
+    @param deps Names of the tasks that must succeed before this one starts.
+    @param critical If True, a failure stops the startup.
+    @param budget_s Maximum run time of func, in seconds.
+    @param on_result Optional callback(result) executed on the GUI thread; it may raise to fail the task.
+    """
+    def __init__(self, name: str, func, message="", deps=(), critical: bool = True,
+                 budget_s: float = 10.0, on_result=None):
+        self.name = name
+        self.func = func
+        self.message = message
+        self.deps = tuple(deps)
+        self.critical = critical
+        self.budget_s = budget_s
+        self.on_result = on_result
+
+        self.state = "pending"  # pending, running, done, failed, skipped
+        self.started = 0.0
+        self.elapsed = 0.0
+        self.error = ""
+
+    def text(self) -> str:
+        return str(self.message()) if callable(self.message) else str(self.message)
+
+
+class StartupScheduler(QObject):
+    """
+    @brief Dependency-driven executor of StartupTask objects.
+
+    Create it on the GUI thread, add the tasks, then call start().
+
+    @signal task_started(name: str): A task was submitted to the workers.
+    @signal task_finished(name: str, state: str, elapsed: float): A task completed ("done", "failed" or "skipped").
+    @signal progress(completed: int, total: int): Number of completed tasks.
+    @signal critical_done(): Every critical task succeeded.
+    @signal failed(name: str, error: str): A critical task failed; the remaining tasks are abandoned.
+    @signal finished(): Every task completed.
+    """
+    task_started = pyqtSignal(str)
+    task_finished = pyqtSignal(str, str, float)
+    progress = pyqtSignal(int, int)
+    critical_done = pyqtSignal()
+    failed = pyqtSignal(str, str)
+    finished = pyqtSignal()
+
+    # Risultato di un worker, consegnato al thread della GUI (connessione in coda)
+    _result_ready = pyqtSignal(str, object, str)
+
+    MAX_WORKERS = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = GeneralLogHandler()
+        self.tasks = {}
+        self._pool = None
+        self._timers = {}
+        self._callbacks = deque()   # (task, risultato) in attesa di on_result
+        self._in_callback = False
+        self._aborted = False
+        self._critical_signalled = False
+        self._finished_signalled = False
+        self._result_ready.connect(self._on_result_ready)
+
+    def add_task(self, task: StartupTask) -> StartupTask:
+        if task.name in self.tasks:
+            raise ValueError(f"Task di avvio duplicato: {task.name}")
+        self.tasks[task.name] = task
+        return task
+
+    def start(self):
+        """
+        @brief Validates the dependency graph and starts every task without dependencies.
+
+        @throws ValueError on unknown dependencies or cycles.
+        """
+        for task in self.tasks.values():
+            unknown = [d for d in task.deps if d not in self.tasks]
+            if unknown:
+                raise ValueError(f"Task '{task.name}': dipendenze sconosciute {unknown}")
+        self._check_cycles()
+
+        self._pool = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="startup")
+        self.progress.emit(0, len(self.tasks))
+        self._schedule()
+
+    def _check_cycles(self):
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dipendenza circolare tra i task di avvio: {name}")
+            visiting.add(name)
+            for dep in self.tasks[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.tasks:
+            visit(name)
+
+    def running(self) -> list:
+        return [task for task in self.tasks.values() if task.state == "running"]
+
+    def abort(self):
+        """
+        @brief Abandons the pending tasks (running workers are not interrupted, their results are ignored).
+        """
+        self._aborted = True
+        for timer in self._timers.values():
+            timer.stop()
+        self._timers.clear()
+        self._callbacks.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # -----------------------------------------------
+    # |                 Esecuzione                  |
+    # -----------------------------------------------
+    def _schedule(self):
+        if self._aborted:
+            return
+        for task in self.tasks.values():
+            if task.state != "pending":
+                continue
+            dep_states = [self.tasks[d].state for d in task.deps]
+            if any(state in ("failed", "skipped") for state in dep_states):
+                self._complete(task, "skipped", "dipendenza non soddisfatta")
+                return self._schedule()  # lo skip può sbloccare (o saltare) altri task
+            if all(state == "done" for state in dep_states):
+                self._submit(task)
+        self._check_completion()
+
+    def _submit(self, task: StartupTask):
+        task.state = "running"
+        task.started = time.perf_counter()
+        self.logger.debug(f"Avvio task di avvio '{task.name}'")
+        self.task_started.emit(task.name)
+
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda name=task.name: self._on_timeout(name))
+        timer.start(int(task.budget_s * 1000))
+        self._timers[task.name] = timer
+
+        self._pool.submit(self._run_task, task.name, task.func)
+
+    def _run_task(self, name: str, func):
+        # Thread di lavoro: nessun accesso ai widget, solo il segnale verso la GUI
+        try:
+            result, error = func(), ""
+        except Exception:
+            result, error = None, traceback.format_exc()
+        try:
+            self._result_ready.emit(name, result, error)
+        except RuntimeError:
+            pass  # scheduler già distrutto (applicazione in chiusura)
+
+    def _on_result_ready(self, name: str, result, error: str):
+        task = self.tasks.get(name)
+        if self._aborted or task is None or task.state != "running":
+            return  # task scaduto o avvio interrotto: risultato tardivo ignorato
+        timer = self._timers.pop(name, None)
+        if timer is not None:
+            timer.stop()
+        if error:
+            self._complete(task, "failed", error)
+            return self._schedule()
+        if task.on_result is None:
+            self._complete(task, "done")
+            return self._schedule()
+        task.state = "callback"
+        self._callbacks.append((task, result))
+        self._drain_callbacks()
+
+    def _drain_callbacks(self):
+        # I callback possono aprire dialoghi modali: uno alla volta, mai annidati
+        if self._in_callback:
+            return
+        while self._callbacks and not self._aborted:
+            task, result = self._callbacks.popleft()
+            self._in_callback = True
+            try:
+                task.on_result(result)
+                state, error = "done", ""
+            except Exception:
+                state, error = "failed", traceback.format_exc()
+            finally:
+                self._in_callback = False
+            self._complete(task, state, error)
+            self._schedule()
+
+    def _on_timeout(self, name: str):
+        task = self.tasks.get(name)
+        self._timers.pop(name, None)
+        if self._aborted or task is None or task.state != "running":
+            return
+        self._complete(task, "failed", f"tempo massimo superato ({task.budget_s:.1f} s)")
+        self._schedule()
+
+    def _complete(self, task: StartupTask, state: str, error: str = ""):
+        task.state = state
+        task.error = error
+        task.elapsed = time.perf_counter() - task.started if task.started else 0.0
+        if state == "done":
+            self.logger.debug(f"Task di avvio '{task.name}' completato in {task.elapsed:.3f} s")
+        elif task.critical:
+            self.logger.error(f"Task di avvio critico '{task.name}' {state}: {error}")
+        else:
+            self.logger.warning(f"Task di avvio '{task.name}' {state}: {error.strip().splitlines()[-1] if error else ''}")
+
+        self.task_finished.emit(task.name, state, task.elapsed)
+        completed = sum(1 for t in self.tasks.values() if t.state in ("done", "failed", "skipped"))
+        self.progress.emit(completed, len(self.tasks))
+
+        if task.critical and state != "done":
+            self.abort()
+            self.failed.emit(task.name, error)
+
+    def _check_completion(self):
+        if self._aborted:
+            return
+        if not self._critical_signalled and all(
+                t.state == "done" for t in self.tasks.values() if t.critical):
+            self._critical_signalled = True
+            self.critical_done.emit()
+        if not self._finished_signalled and all(
+                t.state in ("done", "failed", "skipped") for t in self.tasks.values()):
+            self._finished_signalled = True
+            self._pool.shutdown(wait=False)
+            self.finished.emit()
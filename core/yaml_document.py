@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+@file yaml_document.py
+@brief Shared, parse-once model of a YAML text.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+Implements the YamlDocument class: a YAML text is parsed once (ruamel.yaml,
+round-trip mode) and the result is cached by the SHA-1 of the text, so that
+the Settings, Sensors and Modules tabs share the same parse when a project
+is opened or imported.
+
+The parsed data is read-only: code that modifies the YAML must load its own
+copy (see YAMLHandler).
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import hashlib, threading
+from collections import OrderedDict
+from ruamel.yaml import YAML
+from ruamel.yaml.comments import TaggedScalar
+from ruamel.yaml.scalarbool import ScalarBoolean
+
+
+class YamlDocument:
+    """
+    @brief Parsed YAML text, shared between all the readers of the same revision.
+
+    Use YamlDocument.get(text) instead of the constructor: documents are cached
+    by content hash (LRU of CACHE_SIZE entries).
+    """
+    CACHE_SIZE = 8
+
+    _cache = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, text: str):
+        self.text = text
+        self.hash = self.content_hash(text)
+        self.error = None
+        self._plain = None
+
+        yaml = YAML()
+        yaml.preserve_quotes = True
+        try:
+            self.data = yaml.load(text) or {}
+        except Exception as e:
+            self.data = None
+            self.error = e
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """
+        @brief Returns the key used to cache the document of a text.
+        """
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get(cls, source) -> "YamlDocument":
+        """
+        @brief Returns the parsed document of a text, parsing it only on the first request.
+
+        @param source YAML text, or an already built YamlDocument (returned as is).
+        @return YamlDocument instance (check `error` for parse failures).
+        """
+        if isinstance(source, YamlDocument):
+            return source
+        text = source or ""
+        key = cls.content_hash(text)
+        with cls._lock:
+            doc = cls._cache.get(key)
+            if doc is not None:
+                cls._cache.move_to_end(key)
+                return doc
+
+        doc = cls(text)  # parsing fuori dal lock
+        with cls._lock:
+            cls._cache[key] = doc
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return doc
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._cache.clear()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def plain(self):
+        """
+        @brief Returns the data converted to plain Python types (dict, list, str, int, ...).
+
+        Equivalent to a `YAML(typ="safe")` load, except that ESPHome tags
+        (`!secret`, `!lambda`, ...) become the string of their value.
+        Computed once per document.
+        """
+        if self._plain is None and self.data is not None:
+            self._plain = self._to_plain(self.data)
+        return self._plain
+
+    @classmethod
+    def _to_plain(cls, value):
+        if isinstance(value, dict):
+            return {cls._to_plain(k): cls._to_plain(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [cls._to_plain(v) for v in value]
+        if isinstance(value, TaggedScalar):
+            return str(value.value)
+        # I tipi ruamel (ScalarString, ScalarInt, ScalarFloat, ScalarBoolean) derivano dai tipi base
+        if isinstance(value, (bool, ScalarBoolean)):
+            return bool(value)
+        for base in (str, int, float):
+            if isinstance(value, base):
+                return base(value)
+        return value
@@ -13,6 +13,7 @@ Handles:
 - Building sensor sections from GUI canvas
 - Inserting/removing module sections
 - Extracting module data from YAML or widgets
+- Incremental patching of single top-level sections (line edits)
 
 Preserves formatting and comments using ruamel.yaml.
 
@@ -21,16 +22,21 @@ Preserves formatting and comments using ruamel.yaml.
 @license GNU Affero General Public License v3.0 (AGPLv3)
 """
 
-import os, json
+import os, re
 from ruamel.yaml import YAML
 from PyQt6.QtWidgets import *
 from gui.sensor_block_item import SensorBlockItem
 from io import StringIO
+from core.yaml_document import YamlDocument
+from core.catalog_registry import CatalogRegistry
 
 yaml = YAML()
 yaml.indent(mapping=2, sequence=4, offset=2)
 yaml.preserve_quotes = True
 
+# Riga che apre una sezione di primo livello (es. "wifi:", "sensor:")
+_TOP_LEVEL_KEY_RE = re.compile(r"^([^\s#\-\[\]{}'\"][^:#]*?)\s*:(?:\s|$)")
+
 class YAMLHandler:
     """
     @brief Static class to handle YAML operations in the application.
@@ -198,8 +204,7 @@ class YAMLHandler:
         @param modules_schema_path Path to modules_schema.json file.
         @return Dict of enabled modules with their parameters.
         """
-        with open(modules_schema_path, "r", encoding="utf-8") as f:
-            schema = json.load(f)
+        schema = CatalogRegistry.modules_schema(modules_schema_path)
         modules_dict = {}
 
         for human_name, info in schema.items():
@@ -255,10 +260,8 @@ class YAMLHandler:
         try:
             data = yaml.load(current_yaml) or {}
 
-            # Carica lista dei moduli supportati (chiavi YAML)
-            with open(modules_schema_path, "r", encoding="utf-8") as f:
-                schema = json.load(f)
-            supported_modules = [k.lower().replace(" ", "_") for k in schema]
+            # Lista dei moduli supportati (chiavi YAML)
+            supported_modules = CatalogRegistry.modules_by_yaml_key(modules_schema_path)
 
             # Rimuovi sezioni moduli non più attive
             for mod in supported_modules:
@@ -279,17 +282,19 @@ class YAMLHandler:
             return f"# Errore aggiornamento YAML (moduli): {e}"
 
     @staticmethod
-    def extract_modules_from_yaml(yaml_string: str, modules_schema_path: str) -> dict:
+    def extract_modules_from_yaml(yaml_string, modules_schema_path: str) -> dict:
         """
         @brief Reads a YAML string and extracts the values of supported modules as defined in schema.
 
-        @param yaml_string Full YAML content as string.
+        @param yaml_string Full YAML content as string, or its YamlDocument (parsed only once).
         @param modules_schema_path Path to modules_schema.json.
         @return Dict { gui_module_name: {key: value, ...} }
         """
-        with open(modules_schema_path, "r", encoding="utf-8") as f:
-            schema = json.load(f)
-        data = yaml.load(yaml_string) or {}
+        schema = CatalogRegistry.modules_schema(modules_schema_path)
+        doc = YamlDocument.get(yaml_string)
+        if doc.error is not None:
+            raise doc.error
+        data = doc.data
         result = {}
         for gui_name, info in schema.items():
             yaml_key = gui_name.lower().replace(" ", "_")
@@ -313,62 +318,72 @@ class YAMLHandler:
         return result
 
     @staticmethod
-    def generate_yaml_sensors_only_with_log(canvas: QGraphicsScene, current_yaml: str) -> tuple[str, list]:
+    def build_sensor_list(canvas: QGraphicsScene) -> tuple[list, list]:
         """
-        @brief Like generate_yaml_sensors_only, but also returns a list of ignored sensor blocks.
+        @brief Builds the content of the `sensor` section from the blocks in the canvas.
 
         @param canvas QGraphicsScene with sensor items.
-        @param current_yaml YAML input string.
-        @return Tuple (yaml_string, ignored_sensor_names: list)
+        @return Tuple (sensor_blocks: list, ignored_sensor_names: list)
         """
+        sensori = []
         scartati = []
-        try:
-            data = yaml.load(current_yaml) or {}
-            data['sensor'] = []
+        for item in canvas.items():
+            if isinstance(item, SensorBlockItem):
+                if not item.has_valid_data():
+                    scartati.append(item.title)
+                    continue
 
-            for item in canvas.items():
-                if isinstance(item, SensorBlockItem):
-                    if not item.has_valid_data():
-                        scartati.append(item.title)
-                        continue
+                params = {}
+                for key, widget in getattr(item, 'param_widgets', {}).items():
+                    value = None
+                    if isinstance(widget, QSpinBox):
+                        v = widget.value()
+                        value = f"{v}s" if key == "update_interval" else v
+                    elif isinstance(widget, QComboBox):
+                        value = widget.currentText().strip()
+                    elif isinstance(widget, QLineEdit):
+                        txt = widget.text().strip()
+                        if key == "update_interval" and txt.isdigit():
+                            value = f"{txt}s"
+                        elif txt.isdigit():
+                            value = int(txt)
+                        else:
+                            value = txt
 
-                    params = {}
-                    for key, widget in getattr(item, 'param_widgets', {}).items():
-                        value = None
-                        if isinstance(widget, QSpinBox):
-                            v = widget.value()
-                            value = f"{v}s" if key == "update_interval" else v
-                        elif isinstance(widget, QComboBox):
-                            value = widget.currentText().strip()
-                        elif isinstance(widget, QLineEdit):
-                            txt = widget.text().strip()
-                            if key == "update_interval" and txt.isdigit():
-                                value = f"{txt}s"
-                            elif txt.isdigit():
-                                value = int(txt)
-                            else:
-                                value = txt
+                    if value not in ["", None]:
+                        params[key] = value
 
-                        if value not in ["", None]:
-                            params[key] = value
+                raw_name = item.name_edit.text().strip()
+                if raw_name and raw_name != item.title:
+                    params["name"] = raw_name
 
-                    raw_name = item.name_edit.text().strip()
-                    if raw_name and raw_name != item.title:
-                        params["name"] = raw_name
+                sensor_type = item.conn_type_display.text().strip().lower()
+                platform_map = {"analogico": "adc", "digitale": "gpio", "i2c": "i2c"}
+                platform = item.sensor_platform if hasattr(item, 'sensor_platform') else platform_map.get(sensor_type, "custom")
 
-                    sensor_type = item.conn_type_display.text().strip().lower()
-                    platform_map = {"analogico": "adc", "digitale": "gpio", "i2c": "i2c"}
-                    platform = item.sensor_platform if hasattr(item, 'sensor_platform') else platform_map.get(sensor_type, "custom")
+                yaml_block = {"platform": platform}
+                yaml_block.update(params)
 
-                    yaml_block = {"platform": platform}
-                    yaml_block.update(params)
+                for output_key, name_widget in getattr(item, "output_links", {}).items():
+                    nome_output = name_widget.text().strip()
+                    if nome_output:
+                        yaml_block[output_key] = {"name": nome_output}
 
-                    for output_key, name_widget in getattr(item, "output_links", {}).items():
-                        nome_output = name_widget.text().strip()
-                        if nome_output:
-                            yaml_block[output_key] = {"name": nome_output}
+                sensori.append(yaml_block)
+        return sensori, scartati
 
-                    data['sensor'].append(yaml_block)
+    @staticmethod
+    def generate_yaml_sensors_only_with_log(canvas: QGraphicsScene, current_yaml: str) -> tuple[str, list]:
+        """
+        @brief Like generate_yaml_sensors_only, but also returns a list of ignored sensor blocks.
+
+        @param canvas QGraphicsScene with sensor items.
+        @param current_yaml YAML input string.
+        @return Tuple (yaml_string, ignored_sensor_names: list)
+        """
+        try:
+            data = yaml.load(current_yaml) or {}
+            data['sensor'], scartati = YAMLHandler.build_sensor_list(canvas)
 
             output = StringIO()
             yaml.dump(data, output)
@@ -376,3 +391,195 @@ class YAMLHandler:
 
         except Exception as e:
             return f"# Errore aggiornamento YAML (sensori): {e}", []
+
+    # -------------------------------------------------------------------------
+    # |   Patch incrementale: riscrive solo le sezioni di primo livello        |
+    # -------------------------------------------------------------------------
+    # Le modifiche sono liste di tuple (start_line, end_line, new_lines): le righe
+    # [start_line, end_line) del testo vengono sostituite da new_lines.
+    # Ogni metodo patch_* restituisce None quando il testo non è adatto
+    # (documenti multipli, radice non mappa, errori di parsing): in quel caso
+    # si usa il corrispondente generate_* che riscrive tutto il documento.
+
+    @staticmethod
+    def find_top_level_sections(lines: list) -> dict | None:
+        """
+        @brief Locates the top-level sections of a YAML text.
+
+        A section starts at its `key:` line and ends before the blank/comment lines
+        that precede the next top-level key (those belong to the next section).
+
+        @param lines YAML text split on newlines.
+        @return Dict { key: (start_line, end_line) }, or None if the layout is not supported.
+        """
+        starts = []
+        for n, line in enumerate(lines):
+            if not line or line[0] in " \t#":
+                continue
+            if line.startswith(("---", "...", "%")):
+                return None  # più documenti o direttive: non gestito
+            match = _TOP_LEVEL_KEY_RE.match(line)
+            if not match:
+                return None  # radice non mappa (es. lista o flow style)
+            starts.append((match.group(1).strip(), n))
+
+        sections = {}
+        for idx, (key, start) in enumerate(starts):
+            if key in sections:
+                return None  # chiave duplicata
+            end = starts[idx + 1][1] if idx + 1 < len(starts) else len(lines)
+            while end > start + 1 and (not lines[end - 1].strip() or lines[end - 1].startswith("#")):
+                end -= 1
+            sections[key] = (start, end)
+        return sections
+
+    @staticmethod
+    def render_section(key: str, value) -> list:
+        """
+        @brief Serializes a single top-level section with the shared YAML settings.
+
+        @return List of lines (without the trailing empty line).
+        """
+        output = StringIO()
+        yaml.dump({key: value}, output)
+        return output.getvalue().rstrip("\n").split("\n")
+
+    @staticmethod
+    def load_section(lines: list, span: tuple):
+        """
+        @brief Parses only the lines of one top-level section and returns its value.
+        """
+        start, end = span
+        data = yaml.load("\n".join(lines[start:end])) or {}
+        return next(iter(data.values()), None)
+
+    @staticmethod
+    def build_section_edits(current_yaml: str, updates: dict, removals=()) -> list | None:
+        """
+        @brief Computes the line edits that replace, add or remove top-level sections.
+
+        Existing sections are rewritten in place; only the lines that actually
+        change are included in the edit. New sections are appended at the end.
+
+        @param current_yaml Existing YAML as string.
+        @param updates Dict { key: value } of sections to write.
+        @param removals Keys of the sections to delete.
+        @return List of (start_line, end_line, new_lines) sorted by position, or None.
+        """
+        lines = current_yaml.split("\n")
+        sections = YAMLHandler.find_top_level_sections(lines)
+        if sections is None:
+            return None
+
+        edits = []
+        appended = []
+        for key, value in updates.items():
+            new_lines = YAMLHandler.render_section(key, value)
+            if key not in sections:
+                appended.extend(new_lines)
+                continue
+            start, end = sections[key]
+            old_lines = lines[start:end]
+            # Riduce la modifica alle sole righe diverse
+            prefix = 0
+            while prefix < min(len(old_lines), len(new_lines)) and old_lines[prefix] == new_lines[prefix]:
+                prefix += 1
+            suffix = 0
+            while suffix < min(len(old_lines), len(new_lines)) - prefix \
+                    and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+                suffix += 1
+            if prefix == len(old_lines) == len(new_lines):
+                continue  # sezione invariata
+            edits.append((start + prefix, end - suffix, new_lines[prefix:len(new_lines) - suffix]))
+
+        for key in removals:
+            if key in sections and key not in updates:
+                start, end = sections[key]
+                # Rimuove anche le righe vuote che seguono la sezione
+                while end < len(lines) and not lines[end].strip() and end + 1 < len(lines):
+                    end += 1
+                edits.append((start, end, []))
+
+        if appended:
+            # Inserisce prima della riga vuota finale, così il file resta terminato da "\n"
+            pos = len(lines) - 1 if len(lines) > 1 and lines[-1] == "" else len(lines)
+            if pos > 0 and lines[pos - 1].strip():
+                appended.insert(0, "")  # riga vuota di separazione, come nel template
+            edits.append((pos, pos, appended))
+
+        edits.sort(key=lambda e: (e[0], e[1]))
+        return edits
+
+    @staticmethod
+    def apply_line_edits(text: str, edits: list) -> str:
+        """
+        @brief Applies line edits to a text (same result as applying them to the editor).
+        """
+        lines = text.split("\n")
+        for start, end, new_lines in reversed(edits):
+            lines[start:end] = new_lines
+        return "\n".join(lines)
+
+    @staticmethod
+    def patch_general_sections(current_yaml: str, device_name: str, board: str, ssid: str, password: str) -> list | None:
+        """
+        @brief Incremental version of generate_yaml_general_sections().
+
+        Only the `esphome` section is parsed; `esp32` and `wifi` are replaced.
+
+        @return List of line edits, or None if a full regeneration is needed.
+        """
+        try:
+            lines = current_yaml.split("\n")
+            sections = YAMLHandler.find_top_level_sections(lines)
+            if sections is None:
+                return None
+
+            esphome = {}
+            if "esphome" in sections:
+                esphome = YAMLHandler.load_section(lines, sections["esphome"])
+                if not isinstance(esphome, dict):
+                    esphome = {}
+            esphome['name'] = device_name or "nome_dispositivo"
+            esphome['friendly_name'] = device_name or "Dispositivo ESPHome"
+
+            return YAMLHandler.build_section_edits(current_yaml, {
+                'esphome': esphome,
+                'esp32': {
+                    'board': board or "esp32dev",
+                    'framework': {'type': 'arduino'}
+                },
+                'wifi': {
+                    'ssid': ssid or "YourSSID",
+                    'password': password or "YourPassword"
+                }
+            })
+        except Exception:
+            return None
+
+    @staticmethod
+    def patch_sensors_section(canvas: QGraphicsScene, current_yaml: str) -> tuple[list | None, list]:
+        """
+        @brief Incremental version of generate_yaml_sensors_only_with_log().
+
+        @return Tuple (line edits or None, ignored_sensor_names: list)
+        """
+        try:
+            sensori, scartati = YAMLHandler.build_sensor_list(canvas)
+            return YAMLHandler.build_section_edits(current_yaml, {'sensor': sensori}), scartati
+        except Exception:
+            return None, []
+
+    @staticmethod
+    def patch_module_sections(current_yaml: str, modules_dict: dict, modules_schema_path: str) -> list | None:
+        """
+        @brief Incremental version of generate_yaml_with_modules().
+
+        @return List of line edits, or None if a full regeneration is needed.
+        """
+        try:
+            supported_modules = CatalogRegistry.modules_by_yaml_key(modules_schema_path)
+            removals = [mod for mod in supported_modules if mod not in modules_dict]
+            return YAMLHandler.build_section_edits(current_yaml, modules_dict, removals)
+        except Exception:
+            return None
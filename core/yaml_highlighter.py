@@ -10,15 +10,22 @@
 Highlights keys, strings, numbers, booleans, null, lists, comments, and optional indentation  
 using VS Code-like color scheme (for dark themes).
 
-Built on top of QSyntaxHighlighter and regular expressions.
+Built on top of QSyntaxHighlighter and the single-pass tokenizer of yaml_tokenizer.py
+(block scalars and multi-line strings are tracked through the block state).
+
+Large documents (above the `highlight_deferred_lines` setting) are highlighted
+in deferred mode: the visible blocks first, the rest in idle-time slices.
 
 @version \ref PROJECT_NUMBER
 @date July 2025
 @license GNU Affero General Public License v3.0 (AGPLv3)
 """
 
+import time
 from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
-import re
+from PyQt6.QtCore import QTimer
+from core.yaml_tokenizer import tokenize_yaml_line
+from core.settings_db import get_setting
 
 class YamlHighlighter(QSyntaxHighlighter):
     """
@@ -32,13 +39,33 @@ class YamlHighlighter(QSyntaxHighlighter):
     - Null values
     - Lists
     - Comments
+    - Tags, anchors and aliases
+    - Block scalars and multi-line strings
     - Indentation (optional)
 
-    Uses QSyntaxHighlighter and regular expressions to parse each line of text.
+    Each line is scanned once by tokenize_yaml_line(); every character is formatted at most once.
+
+    In deferred mode only the block state is computed for the blocks that are not
+    ready yet; the formats are applied to the visible blocks (plus a margin) right
+    away and to the others by a QTimer, a few milliseconds at a time.
     """
+    DEFAULT_DEFERRED_LINES = 2000
+    VIEWPORT_MARGIN = 50  # blocchi evidenziati subito sopra/sotto la parte visibile
+    SLICE_MS = 8          # durata massima di ogni passata in idle
+
     def __init__(self, document):
         super().__init__(document)
 
+        self.editor = None
+        self.deferred = False
+        self._next_block = 0          # i blocchi precedenti sono già evidenziati
+        self._visible_range = (0, -1)
+        self.large_document_lines = self.configured_deferred_lines()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._highlight_slice)
+
         # Formati base
         self.key_format = QTextCharFormat()
         self.key_format.setForeground(QColor("#569CD6"))  # blu chiavi
@@ -64,31 +91,122 @@ class YamlHighlighter(QSyntaxHighlighter):
         self.indent_format = QTextCharFormat()
         self.indent_format.setForeground(QColor("#404040"))  # grigio indentazione
 
-        # Regole di evidenziazione (ordine conta!)
-        self.rules = [
-            (re.compile(r'^\s*[\w\-\.]+:'), self.key_format),  # chiavi
-            (re.compile(r':\s*".*?"'), self.string_format),
-            (re.compile(r":\s*\'.*?\'"), self.string_format),
-            (re.compile(r":\s*\d+"), self.number_format),
-            (re.compile(r":\s*(true|false)\b", re.IGNORECASE), self.boolean_format),
-            (re.compile(r":\s*null\b", re.IGNORECASE), self.null_format),
-            (re.compile(r'^\s*-\s.*'), self.list_format),  # liste
-            (re.compile(r'#.*$'), self.comment_format)
-        ]
+        self.tag_format = QTextCharFormat()
+        self.tag_format.setForeground(QColor("#C586C0"))  # viola tag (!lambda, !secret)
+
+        # Tipo di token → formato
+        self.formats = {
+            "indent": self.indent_format,
+            "key": self.key_format,
+            "string": self.string_format,
+            "number": self.number_format,
+            "boolean": self.boolean_format,
+            "null": self.null_format,
+            "list": self.list_format,
+            "comment": self.comment_format,
+            "tag": self.tag_format,
+        }
+
+    @classmethod
+    def configured_deferred_lines(cls) -> int:
+        """
+        @brief Reads the `highlight_deferred_lines` setting (0 = never defer).
+        """
+        try:
+            value = get_setting("highlight_deferred_lines")
+            return int(value) if value is not None else cls.DEFAULT_DEFERRED_LINES
+        except Exception:
+            return cls.DEFAULT_DEFERRED_LINES
+
+    def set_editor(self, editor):
+        """
+        @brief Links the editor whose viewport drives the deferred mode.
+
+        @param editor QPlainTextEdit showing the highlighted document.
+        """
+        self.editor = editor
+        editor.verticalScrollBar().valueChanged.connect(self.highlight_visible)
+
+    def is_large(self, text: str) -> bool:
+        return self.large_document_lines > 0 and text.count("\n") + 1 >= self.large_document_lines
+
+    def begin_deferred(self):
+        """
+        @brief Enables deferred mode; call it just before loading a large text.
+        """
+        self._timer.stop()
+        self.deferred = True
+        self._next_block = 0
+        self._visible_range = (0, -1)
+
+    def cancel_deferred(self):
+        """
+        @brief Disables deferred mode (the next highlighting passes are complete).
+        """
+        self._timer.stop()
+        self.deferred = False
+
+    def start_deferred(self):
+        """
+        @brief Highlights the visible blocks and schedules the rest in idle time.
+        """
+        if not self.deferred:
+            return
+        self.highlight_visible()
+        self._timer.start()
+
+    def highlight_visible(self, *args):
+        """
+        @brief Immediately highlights the blocks in the viewport (plus VIEWPORT_MARGIN).
+        """
+        if not self.deferred or self.editor is None:
+            return
+        document = self.document()
+        first = self.editor.firstVisibleBlock().blockNumber()
+        line_height = max(1, self.editor.fontMetrics().height())
+        visible = self.editor.viewport().height() // line_height + 1
+        start = max(0, first - self.VIEWPORT_MARGIN)
+        end = first + visible + self.VIEWPORT_MARGIN
+        self._visible_range = (start, end)
+
+        block = document.findBlockByNumber(start)
+        while block.isValid() and block.blockNumber() <= end:
+            if block.blockNumber() >= self._next_block:
+                self.rehighlightBlock(block)
+            block = block.next()
+
+    def _highlight_slice(self):
+        # Evidenzia blocchi in ordine finché non scade il tempo della passata
+        deadline = time.perf_counter() + self.SLICE_MS / 1000
+        block = self.document().findBlockByNumber(self._next_block)
+        start, end = self._visible_range
+        while block.isValid() and time.perf_counter() < deadline:
+            number = block.blockNumber()
+            self._next_block = number + 1
+            if not start <= number <= end:
+                self.rehighlightBlock(block)
+            block = block.next()
+        if not block.isValid():
+            self.cancel_deferred()
+
+    def _is_ready(self, block_number: int) -> bool:
+        start, end = self._visible_range
+        return block_number < self._next_block or start <= block_number <= end
 
     def highlightBlock(self, text):
         """
-        @brief Called by Qt for each block of text. Applies highlighting rules.
+        @brief Called by Qt for each block of text. Applies the tokens of the line.
+
+        The block state carries open block scalars / quoted strings to the next line.
+        In deferred mode, blocks not highlighted yet only get their state.
 
         @param text The line of text being processed.
         """
-        # Evidenzia indentazione (opzionale, solo spazi iniziali)
-        match_indent = re.match(r'^(\s+)', text)
-        if match_indent:
-            start, end = match_indent.span(1)
-            self.setFormat(start, end - start, self.indent_format)
-
-        for pattern, fmt in self.rules:
-            for match in pattern.finditer(text):
-                start, end = match.span()
-                self.setFormat(start, end - start, fmt)
+        tokens, state = tokenize_yaml_line(text, self.previousBlockState())
+        if self.deferred and not self._is_ready(self.currentBlock().blockNumber()):
+            self.setCurrentBlockState(state)
+            return
+        formats = self.formats
+        for start, length, kind in tokens:
+            self.setFormat(start, length, formats[kind])
+        self.setCurrentBlockState(state)
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+@file yaml_tokenizer.py
+@brief Single-pass YAML line tokenizer used by the syntax highlighter.
+
+@defgroup core Core Modules
+@ingroup main
+@brief Core logic: YAML handling, logging, settings, flashing, etc.
+
+tokenize_yaml_line() scans a line once, left to right, and returns
+non-overlapping (start, length, kind) tokens plus the state to carry to the
+next line. The state keeps track of block scalars (`key: |`, `!lambda |-`)
+and of quoted strings spanning several lines.
+
+The module has no Qt dependency, so it can be benchmarked on its own:
+
+    python -m core.yaml_tokenizer [file.yaml]
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import re, sys, time
+
+# Stato tra le righe: -1 = normale, altrimenti tipo * STATE_FACTOR + indentazione del genitore
+STATE_NORMAL = -1
+STATE_BLOCK_SCALAR = 1
+STATE_DOUBLE_QUOTED = 2
+STATE_SINGLE_QUOTED = 3
+STATE_FACTOR = 10000
+
+# Tipi di token (chiavi dei formati del highlighter)
+INDENT, KEY, STRING, NUMBER, BOOLEAN, NULL, LIST, COMMENT, TAG = (
+    "indent", "key", "string", "number", "boolean", "null", "list", "comment", "tag"
+)
+
+_KEY_RE = re.compile(r"""(?:[\w\-\.\/]+|"[^"]*"|'[^']*')[ \t]*:(?=\s|$)""")
+_TAG_RE = re.compile(r"[!&*]\S*")
+_BLOCK_HEADER_RE = re.compile(r"[|>][-+0-9]*(?=\s|$)")
+_NUMBER_RE = re.compile(r"[-+]?(?:0x[0-9a-fA-F]+|\d[\d_]*(?:\.\d+)?(?:[eE][-+]?\d+)?|\.\d+)")
+_BOOLEANS = {"true", "false"}
+_NULLS = {"null", "~"}
+
+
+def _encode(kind: int, indent: int) -> int:
+    return kind * STATE_FACTOR + indent
+
+
+def _decode(state: int):
+    if state is None or state < STATE_FACTOR:
+        return STATE_NORMAL, 0
+    return state // STATE_FACTOR, state % STATE_FACTOR
+
+
+def _find_closing_quote(text: str, pos: int, quote: str) -> int:
+    """
+    @brief Returns the index of the quote closing a string that starts before `pos`, or -1.
+    """
+    n = len(text)
+    while pos < n:
+        c = text[pos]
+        if quote == '"' and c == "\\":
+            pos += 2
+            continue
+        if c == quote:
+            if quote == "'" and pos + 1 < n and text[pos + 1] == "'":
+                pos += 2  # '' è un apice escapato
+                continue
+            return pos
+        pos += 1
+    return -1
+
+
+def _comment_start(text: str, pos: int) -> int:
+    """
+    @brief Returns the index of a `#` comment at or after `pos` (preceded by whitespace), or -1.
+    """
+    while True:
+        idx = text.find("#", pos)
+        if idx < 0:
+            return -1
+        if idx == 0 or text[idx - 1] in " \t":
+            return idx
+        pos = idx + 1
+
+
+def tokenize_yaml_line(text: str, state: int = STATE_NORMAL):
+    """
+    @brief Tokenizes one line of YAML in a single pass.
+
+    @param text Line content (without newline).
+    @param state State returned for the previous line (-1 for the first line).
+    @return Tuple (tokens, new_state) where tokens is a list of (start, length, kind).
+    """
+    tokens = []
+    n = len(text)
+    kind, parent_indent = _decode(state)
+
+    stripped = text.lstrip(" \t")
+    lead = n - len(stripped)
+
+    # --- Continuazione di costrutti multi-riga ---
+    if kind == STATE_BLOCK_SCALAR:
+        if not stripped:
+            return tokens, state  # le righe vuote non chiudono il blocco
+        if lead > parent_indent:
+            tokens.append((0, lead, INDENT))
+            tokens.append((lead, n - lead, STRING))
+            return tokens, state
+        kind = STATE_NORMAL  # blocco terminato: la riga è normale
+
+    pos = 0
+    new_state = STATE_NORMAL
+
+    if kind in (STATE_DOUBLE_QUOTED, STATE_SINGLE_QUOTED):
+        quote = '"' if kind == STATE_DOUBLE_QUOTED else "'"
+        end = _find_closing_quote(text, 0, quote)
+        if end < 0:
+            if n:
+                tokens.append((0, n, STRING))
+            return tokens, state
+        tokens.append((0, end + 1, STRING))
+        pos = end + 1
+        idx = _comment_start(text, pos)
+        if idx >= 0:
+            tokens.append((idx, n - idx, COMMENT))
+        return tokens, new_state
+
+    # --- Riga normale ---
+    if lead:
+        tokens.append((0, lead, INDENT))
+    pos = lead
+    line_indent = lead
+
+    if pos >= n:
+        return tokens, new_state
+    if text[pos] == "#":
+        tokens.append((pos, n - pos, COMMENT))
+        return tokens, new_state
+
+    # Marcatori di lista ("- ", anche annidati "- - ")
+    in_list = False
+    while pos < n and text[pos] == "-" and (pos + 1 == n or text[pos + 1] in " \t"):
+        tokens.append((pos, 1, LIST))
+        in_list = True
+        pos += 1
+        while pos < n and text[pos] in " \t":
+            pos += 1
+
+    # Chiave
+    has_key = False
+    match = _KEY_RE.match(text, pos)
+    if match:
+        tokens.append((pos, match.end() - pos, KEY))
+        has_key = True
+        pos = match.end()
+        while pos < n and text[pos] in " \t":
+            pos += 1
+
+    # Tag, ancore e alias (!lambda, !secret, &anchor, *alias)
+    while pos < n and text[pos] in "!&*":
+        match = _TAG_RE.match(text, pos)
+        tokens.append((pos, match.end() - pos, TAG))
+        pos = match.end()
+        while pos < n and text[pos] in " \t":
+            pos += 1
+
+    if pos >= n:
+        return tokens, new_state
+
+    c = text[pos]
+    if c == "#":
+        tokens.append((pos, n - pos, COMMENT))
+        return tokens, new_state
+
+    # Block scalar: le righe seguenti più indentate sono testo
+    match = _BLOCK_HEADER_RE.match(text, pos)
+    if match:
+        tokens.append((pos, match.end() - pos, STRING))
+        idx = _comment_start(text, match.end())
+        if idx >= 0:
+            tokens.append((idx, n - idx, COMMENT))
+        return tokens, _encode(STATE_BLOCK_SCALAR, line_indent)
+
+    # Stringhe tra apici (anche su più righe)
+    if c in "\"'":
+        end = _find_closing_quote(text, pos + 1, c)
+        if end < 0:
+            tokens.append((pos, n - pos, STRING))
+            kind = STATE_DOUBLE_QUOTED if c == '"' else STATE_SINGLE_QUOTED
+            return tokens, _encode(kind, line_indent)
+        tokens.append((pos, end + 1 - pos, STRING))
+        idx = _comment_start(text, end + 1)
+        if idx >= 0:
+            tokens.append((idx, n - idx, COMMENT))
+        return tokens, new_state
+
+    # Scalare semplice (fino a un eventuale commento)
+    idx = _comment_start(text, pos)
+    end = idx if idx >= 0 else n
+    value = text[pos:end].rstrip()
+    lowered = value.lower()
+    if lowered in _BOOLEANS:
+        tokens.append((pos, len(value), BOOLEAN))
+    elif lowered in _NULLS:
+        tokens.append((pos, len(value), NULL))
+    else:
+        match = _NUMBER_RE.match(value)
+        if match:
+            tokens.append((pos, match.end(), NUMBER))
+        elif in_list and not has_key and value:
+            tokens.append((pos, len(value), LIST))
+    if idx >= 0:
+        tokens.append((idx, n - idx, COMMENT))
+    return tokens, new_state
+
+
+def tokenize_yaml(text: str) -> list:
+    """
+    @brief Tokenizes a whole document, carrying the state between lines.
+
+    @return List with the tokens of each line.
+    """
+    state = STATE_NORMAL
+    result = []
+    for line in text.split("\n"):
+        tokens, state = tokenize_yaml_line(line, state)
+        result.append(tokens)
+    return result
+
+
+# -----------------------------------------------
+# |                  Benchmark                  |
+# -----------------------------------------------
+# Regole del highlighter precedente (8 passate regex per riga), solo per confronto
+_LEGACY_RULES = [
+    re.compile(r'^\s*[\w\-\.]+:'),
+    re.compile(r':\s*".*?"'),
+    re.compile(r":\s*\'.*?\'"),
+    re.compile(r":\s*\d+"),
+    re.compile(r":\s*(true|false)\b", re.IGNORECASE),
+    re.compile(r":\s*null\b", re.IGNORECASE),
+    re.compile(r'^\s*-\s.*'),
+    re.compile(r'#.*$'),
+]
+_LEGACY_INDENT = re.compile(r'^(\s+)')
+
+
+def _legacy_line(text: str):
+    spans = []
+    match = _LEGACY_INDENT.match(text)
+    if match:
+        spans.append(match.span(1))
+    for pattern in _LEGACY_RULES:
+        for match in pattern.finditer(text):
+            spans.append(match.span())
+    return spans
+
+
+def _sample_document(sensors: int = 1000) -> str:
+    parts = [
+        "esphome:\n  name: bench  # dispositivo di prova\n  friendly_name: \"Bench\"\n",
+        "wifi:\n  ssid: !secret wifi_ssid\n  password: 'secret'\n  fast_connect: true\n",
+        "logger:\n  level: DEBUG\n\nsensor:\n",
+    ]
+    for i in range(sensors):
+        parts.append(
+            f"  - platform: adc\n    pin: {i % 40}\n    name: \"Sensore {i}\"\n"
+            f"    update_interval: 60s\n    filters:\n      - lambda: |-\n"
+            f"          return x * {i}.5;  // scala\n"
+        )
+    return "".join(parts)
+
+
+def benchmark(text: str = None, repeat: int = 5) -> dict:
+    """
+    @brief Measures the per-line cost of the tokenizer against the previous regex rules.
+
+    @param text YAML document to use (a synthetic one if None).
+    @param repeat Number of runs; the best one is reported.
+    @return Dict with line count and microseconds per line for both methods.
+    """
+    text = text if text is not None else _sample_document()
+    lines = text.split("\n")
+
+    def best(fn):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def run_tokenizer():
+        state = STATE_NORMAL
+        for line in lines:
+            _, state = tokenize_yaml_line(line, state)
+
+    def run_legacy():
+        for line in lines:
+            _legacy_line(line)
+
+    new = best(run_tokenizer)
+    old = best(run_legacy)
+    return {
+        "lines": len(lines),
+        "tokenizer_us_per_line": new / len(lines) * 1e6,
+        "legacy_us_per_line": old / len(lines) * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    source = None
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "r", encoding="utf-8") as f:
+            source = f.read()
+    result = benchmark(source)
+    print(f"Righe: {result['lines']}")
+    print(f"Tokenizer a passata singola: {result['tokenizer_us_per_line']:.2f} µs/riga")
+    print(f"Regole regex precedenti:     {result['legacy_us_per_line']:.2f} µs/riga")
@@ -22,7 +22,9 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import Qt
 from gui.color_pantone import Pantone
-import os, json
+import os
+from core.catalog_registry import CatalogRegistry
+from core.sensor_catalog import SensorCatalog
 from core.log_handler import GeneralLogHandler
 from core.translator import Translator
 
@@ -68,8 +70,7 @@ class SensorSelectionDialog(QDialog):
 
     def load_sensors(self, path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f).get("sensors", [])
+            return SensorCatalog.sensors(path)
         except Exception as e:
             self.logger.log(Translator.tr("log_failed_load_sensors").format(error=str(e)), "error")
             return []
@@ -86,14 +87,7 @@ class SensorSelectionDialog(QDialog):
 
     def detect_connection_type(self, sensor):
         # Determina la connessione in base ai parametri
-        keys = [p["key"] for p in sensor.get("params", [])]
-        if any("i2c" in k.lower() for k in keys):
-            return "I2C"
-        elif "analog" in sensor.get("label", "").lower():
-            return "Analogico"
-        elif "gpio" in sensor.get("platform", "").lower():
-            return "Digitale"
-        return "Sconosciuto"
+        return SensorCatalog.detect_connection_type(sensor)
 
     def get_icon_path(self, platform):
         # Supponiamo di avere le icone in assets/icons/{platform}.png
@@ -158,8 +152,7 @@ class ActionSelectionDialog(QDialog):
 
     def load_actions(self, path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f).get("actions", [])
+            return CatalogRegistry.catalog("actions", path)
         except Exception as e:
             self.logger.log(Translator.tr("log_failed_load_sensors").format(error=str(e)), "error")
             return []
@@ -235,8 +228,7 @@ class TriggerSelectionDialog(QDialog):
 
     def load_triggers(self, path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f).get("triggers", [])
+            return CatalogRegistry.catalog("triggers", path)
         except Exception as e:
             self.logger.log(Translator.tr("log_failed_load_sensors").format(error=str(e)), "error")
             return []
@@ -312,8 +304,7 @@ class ConditionSelectionDialog(QDialog):
 
     def load_conditions(self, path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f).get("conditions", [])
+            return CatalogRegistry.catalog("conditions", path)
         except Exception as e:
             self.logger.log(Translator.tr("log_failed_load_sensors").format(error=str(e)), "error")
             return []
@@ -389,8 +380,7 @@ class TimerSelectionDialog(QDialog):
 
     def load_timers(self, path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f).get("timers", [])
+            return CatalogRegistry.catalog("timers", path)
         except Exception as e:
             self.logger.log(Translator.tr("log_failed_load_sensors").format(error=str(e)), "error")
             return []
@@ -467,8 +457,7 @@ class ScriptSelectionDialog(QDialog):
 
     def load_scripts(self, path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f).get("scripts", [])
+            return CatalogRegistry.catalog("scripts", path)
         except Exception as e:
             self.logger.log(Translator.tr("log_failed_load_sensors").format(error=str(e)), "error")
             return []
@@ -21,10 +21,11 @@ import os, json, shutil
 from config.GUIconfig import conf, AppInfo, UIDimensions, GlobalPaths
 from pathlib import Path
 from PyQt6.QtWidgets import *
-from PyQt6.QtCore import Qt, QUrl, pyqtSlot
+from PyQt6.QtCore import Qt, QUrl, QThread, pyqtSlot
 from PyQt6.QtGui import QPalette, QColor, QIcon
 from core.yaml_highlighter import YamlHighlighter
 from core.yaml_handler import YAMLHandler
+from core.yaml_document import YamlDocument
 from gui.yaml_editor import YamlCodeEditor
 from gui.sensor_canvas import SensorCanvas
 from gui.sensor_block_item import SensorBlockItem
@@ -38,11 +39,14 @@ from gui.tab_modules import TabModules
 from gui.color_pantone import Pantone
 from core.translator import Translator
 from core.project_handler import ProjectHandler
+from core.snapshot_store import SnapshotStore, SnapshotWorker
 from core.settings_db import add_recent_file, get_setting
 from core.log_handler import GeneralLogHandler
-from gui.new_project_dialog import NewProjectDialog
+from core.lazy_import import LazyImport
 from core.new_project_handler import create_new_project
 
+NewProjectDialog = LazyImport("gui.new_project_dialog", "NewProjectDialog")
+
 class MainWindow(QMainWindow):
     """
     @brief Main application window managing the layout and core UI components.
@@ -74,6 +78,7 @@ class MainWindow(QMainWindow):
 
         self.last_save_path = None
         self.project_dir = None
+        self._snapshot_job = None  # (QThread, SnapshotWorker) in corso
 
         dark_palette = QPalette()
         dark_palette.setColor(QPalette.ColorRole.Window, QColor("#23272e"))
@@ -128,6 +133,7 @@ class MainWindow(QMainWindow):
         # YAML Editor
         self.yaml_editor = YamlCodeEditor()
         self.highlighter = YamlHighlighter(self.yaml_editor.document())
+        self.yaml_editor.set_highlighter(self.highlighter)
         self.yaml_editor.setFixedHeight(500)
         self.yaml_editor.setPlaceholderText(Translator.tr("yaml_placeholder"))
         self.yaml_editor.setStyleSheet("""
@@ -166,6 +172,7 @@ class MainWindow(QMainWindow):
 
         self.logger = LOGHandler(self.console_output)
         self.compiler = CompileManager(self.logger.log)
+        self.compiler.log_batch_callback = self.logger.log_batch
         self.compiler.window = self
         self.logger.log(Translator.tr("console_started"), "info")  
 
@@ -294,14 +301,17 @@ class MainWindow(QMainWindow):
             return
 
         # 💡 PATCH CRUCIALE: forza aggiornamento come in importa_yaml()
-        GeneralLogHandler.debug("Avvio aggiornamento tab_settings")
-        self.tab_settings.carica_dati_da_yaml(content)
+        # Il documento viene parsato una sola volta e condiviso dai tre tab
+        doc = YamlDocument.get(content)
+
+        GeneralLogHandler().debug("Avvio aggiornamento tab_settings")
+        self.tab_settings.carica_dati_da_yaml(doc)
 
-        GeneralLogHandler.debug("Avvio aggiornamento tab_sensori")
-        self.tab_sensori.aggiorna_blocchi_da_yaml(content)
+        GeneralLogHandler().debug("Avvio aggiornamento tab_sensori")
+        self.tab_sensori.aggiorna_blocchi_da_yaml(doc)
 
-        GeneralLogHandler.debug("Avvio aggiornamento tab_modules")
-        self.tab_modules.carica_dati_da_yaml(content)
+        GeneralLogHandler().debug("Avvio aggiornamento tab_modules")
+        self.tab_modules.carica_dati_da_yaml(doc)
 
 
         self.logger.log(Translator.tr("project_opened").format(path=yaml_path), "success")
@@ -388,9 +398,10 @@ class MainWindow(QMainWindow):
                 content = f.read()
                 self.yaml_editor.setPlainText(content)
             # Puoi sincronizzare anche qui:
-            self.tab_settings.carica_dati_da_yaml(content)
-            self.tab_sensori.aggiorna_blocchi_da_yaml(content)
-            self.tab_modules.carica_dati_da_yaml(content)
+            doc = YamlDocument.get(content)
+            self.tab_settings.carica_dati_da_yaml(doc)
+            self.tab_sensori.aggiorna_blocchi_da_yaml(doc)
+            self.tab_modules.carica_dati_da_yaml(doc)
             self.logger.log(Translator.tr("yaml_imported").format(path=filename), "success")
             add_recent_file(filename)
             self.menu_bar._update_recent_files_menu()
@@ -444,6 +455,125 @@ class MainWindow(QMainWindow):
             self.project_dir, QFileDialog.getSaveFileName, self.logger.log
         )
 
+    def _snapshot_target(self):
+        """
+        @brief Returns the project folder to snapshot, or None (with a warning) if snapshots are not possible.
+        """
+        if not self.project_dir:
+            self.logger.log(Translator.tr("no_project_to_snapshot"), "warning")
+            return None
+        if self._snapshot_job is not None:
+            self.logger.log(Translator.tr("snapshot_busy"), "warning")
+            return None
+        if not SnapshotStore.is_snapshot_allowed(self.project_dir):
+            self.logger.log(Translator.tr("snapshot_not_allowed").format(path=self.project_dir), "warning")
+            return None
+        return self.project_dir
+
+    def _start_snapshot_worker(self, worker, on_finished):
+        """
+        @brief Runs a SnapshotWorker on its own QThread, like the import/export workers.
+
+        @param on_finished Callback receiving the result dict (errors are logged here).
+        """
+        thread = QThread()
+        worker.moveToThread(thread)
+        self._snapshot_job = (thread, worker)
+
+        def cleanup():
+            thread.quit()
+            thread.wait()
+            worker.deleteLater()
+            thread.deleteLater()
+            self._snapshot_job = None
+
+        def on_done(result):
+            cleanup()
+            on_finished(result)
+
+        def on_failed(error):
+            cleanup()
+            self.logger.log(Translator.tr("snapshot_error").format(error=error), "error")
+
+        worker.finished.connect(on_done)
+        worker.failed.connect(on_failed)
+        thread.started.connect(worker.run)
+        thread.start()
+
+    def snapshot_project(self):
+        """
+        @brief Takes a deduplicated snapshot of the current project folder.
+
+        Asks for an optional label; only the files changed since the previous
+        snapshot take new space in the store. Hashing runs on a worker thread.
+        """
+        project_dir = self._snapshot_target()
+        if not project_dir:
+            return
+        label, ok = QInputDialog.getText(self, Translator.tr("snapshot_project"), Translator.tr("snapshot_label_prompt"))
+        if not ok:
+            return
+
+        def on_created(result):
+            self.logger.log(Translator.tr("snapshot_created").format(
+                files=result["files"], new=result["new_objects"], kb=result["new_bytes"] // 1024), "success")
+
+        self._start_snapshot_worker(SnapshotWorker("create", project_dir, label=label.strip()), on_created)
+
+    def restore_snapshot(self):
+        """
+        @brief Restores the current project folder from one of its snapshots.
+
+        The restore is planned on a worker thread, the user confirms the number of
+        files restored and removed, then the current state is snapshotted, the
+        snapshot restored and the project reopened.
+        """
+        project_dir = self._snapshot_target()
+        if not project_dir:
+            return
+        snapshots = SnapshotStore().list_snapshots(project_dir)
+        if not snapshots:
+            self.logger.log(Translator.tr("no_snapshots"), "warning")
+            return
+        labels = [f"{s['created']}  {s['label']}".rstrip() for s in snapshots]
+        choice, ok = QInputDialog.getItem(
+            self, Translator.tr("restore_snapshot"), Translator.tr("restore_snapshot_prompt"), labels, 0, False
+        )
+        if not ok:
+            return
+        snapshot = snapshots[labels.index(choice)]
+
+        def on_restored(result):
+            self.logger.log(Translator.tr("snapshot_restored").format(
+                created=snapshot["created"], restored=result["restored"], removed=result["removed"]), "success")
+            if self.last_save_path and os.path.exists(self.last_save_path):
+                self._reset_tabs()
+                self.open_project(self.last_save_path)
+
+        def on_planned(plan):
+            if not plan["restore"] and not plan["remove"]:
+                self.logger.log(Translator.tr("snapshot_nothing_to_restore"), "info")
+                return
+            # Conferma esplicita: il ripristino sovrascrive e cancella file
+            shown = plan["remove"][:10] + (["…"] if len(plan["remove"]) > 10 else [])
+            reply = QMessageBox.question(
+                self,
+                Translator.tr("restore_snapshot_confirm_title"),
+                Translator.tr("restore_snapshot_confirm").format(
+                    created=snapshot["created"], restore=len(plan["restore"]), remove=len(plan["remove"]),
+                    files="\n".join(shown) or "-"),
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+            self._start_snapshot_worker(
+                SnapshotWorker("restore", project_dir, snapshot_id=snapshot["id"], allowed_removals=plan["remove"]),
+                on_restored
+            )
+
+        self._start_snapshot_worker(SnapshotWorker("plan", project_dir, snapshot_id=snapshot["id"]), on_planned)
+
     def import_project(self):
         """
         @brief Starts the import procedure for a project from a ZIP archive.
@@ -23,9 +23,12 @@ from core.translator import Translator
 from gui.color_pantone import Pantone
 from core.settings_db import get_recent_files
 from config.GUIconfig import conf
-from gui.project_gallery_window import ProjectGalleryWindow
-from gui.user_project_manager import UserProjectManagerWindow
-from gui.setting_menu import SettingsDialog
+from core.lazy_import import LazyImport
+
+# Finestre aperte su richiesta: importate al primo utilizzo
+ProjectGalleryWindow = LazyImport("gui.project_gallery_window", "ProjectGalleryWindow")
+UserProjectManagerWindow = LazyImport("gui.user_project_manager", "UserProjectManagerWindow")
+SettingsDialog = LazyImport("gui.setting_menu", "SettingsDialog")
 
 
 class MainMenuBar(QMenuBar):
@@ -81,6 +84,14 @@ class MainMenuBar(QMenuBar):
         self.export_project_action.triggered.connect(parent.export_project)
         self.file_menu.addAction(self.export_project_action)
 
+        self.snapshot_action = QAction("📸 " + Translator.tr("snapshot_project"), self)
+        self.snapshot_action.triggered.connect(parent.snapshot_project)
+        self.file_menu.addAction(self.snapshot_action)
+
+        self.restore_snapshot_action = QAction("⏪ " + Translator.tr("restore_snapshot"), self)
+        self.restore_snapshot_action.triggered.connect(parent.restore_snapshot)
+        self.file_menu.addAction(self.restore_snapshot_action)
+
         self.file_menu.addSeparator()
 
         self.header_action_yaml = QWidgetAction(self)
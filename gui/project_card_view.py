@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+@file project_card_view.py
+@brief Virtualized list of project cards (model/view) used by the project galleries.
+
+@defgroup gui GUI Modules
+@ingroup main
+@brief GUI elements: windows, dialogs, blocks, and widgets.
+
+Implements:
+- ProjectCardModel: list model holding the project metadata dicts
+- ProjectCardDelegate: paints a card (fields + action buttons) and handles button clicks
+- ProjectCardView: QListView configured with uniform item sizes, as a list or as a grid
+
+No widget is created per project: only the visible cards are painted, by a
+single delegate, so switching category just resets the model.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPen, QPainter
+
+ProjectRole = Qt.ItemDataRole.UserRole + 1
+
+
+class ProjectCardModel(QAbstractListModel):
+    """
+    @brief List model exposing one project metadata dict per row.
+
+    The dict is returned for ProjectRole, the project name for DisplayRole.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._projects = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._projects)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._projects):
+            return None
+        project = self._projects[index.row()]
+        if role == ProjectRole:
+            return project
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return project.get("name", "-")
+        return None
+
+    def set_projects(self, projects: list):
+        """
+        @brief Replaces the content of the model (one reset, no per-row work).
+        """
+        self.beginResetModel()
+        self._projects = list(projects)
+        self.endResetModel()
+
+    def append_project(self, project: dict):
+        """
+        @brief Appends a single project at the end of the model.
+        """
+        row = len(self._projects)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._projects.append(project)
+        self.endInsertRows()
+
+    def project(self, row: int) -> dict:
+        return self._projects[row]
+
+
+class ProjectCardDelegate(QStyledItemDelegate):
+    """
+    @brief Paints a project card and turns clicks on its buttons into signals.
+
+    Cards are laid out either with the fields side by side and the buttons on the
+    right (Qt.Orientation.Horizontal), or with fields and buttons in two stacked
+    columns (Qt.Orientation.Vertical).
+
+    @signal action_triggered(action: str, project: dict): Emitted when a card button is clicked.
+    """
+    action_triggered = pyqtSignal(str, dict)
+
+    MARGIN = 4          # spazio tra le card
+    PADDING = 8         # margine interno della card
+    BUTTON_HEIGHT = 32
+    BUTTON_SPACING = 8
+
+    def __init__(self, fields, buttons, card_size: QSize, orientation=Qt.Orientation.Horizontal,
+                 button_width: int = 150, button_color: str = "#6A9955", button_hover: str = "#4e7d44",
+                 parent=None):
+        """
+        @param fields List of (key, label) pairs shown on the card.
+        @param buttons List of (action, text) pairs, one button each.
+        @param card_size Size of a card (including the outer margin).
+        @param orientation Layout of the fields (see class description).
+        @param button_width Width of the buttons column.
+        @param button_color Background of the buttons.
+        @param button_hover Background of the hovered button.
+        """
+        super().__init__(parent)
+        self.fields = fields
+        self.buttons = buttons
+        self.card_size = card_size
+        self.orientation = orientation
+        self.button_width = button_width
+        self.button_color = QColor(button_color)
+        self.button_hover = QColor(button_hover)
+        self._hover = None  # (riga, azione) del pulsante sotto il mouse
+        self._pressed = None
+
+        self.label_font = QFont()
+        self.label_font.setPointSize(10)
+        self.value_font = QFont()
+        self.value_font.setPointSize(10)
+        self.button_font = QFont()
+        self.button_font.setPointSize(11)
+        self.button_font.setBold(True)
+
+    def sizeHint(self, option, index):
+        return self.card_size
+
+    # -----------------------------------------------
+    # |                   Layout                    |
+    # -----------------------------------------------
+    def _layout(self, rect: QRect):
+        """
+        @brief Computes the geometry of a card.
+
+        @return Tuple (card rect, [(label rect, value rect)], [button rect]).
+        """
+        card = rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        inner = card.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+
+        # Colonna pulsanti a destra, centrata verticalmente
+        total = len(self.buttons) * self.BUTTON_HEIGHT + max(len(self.buttons) - 1, 0) * self.BUTTON_SPACING
+        bx = inner.right() - self.button_width + 1
+        by = inner.top() + max((inner.height() - total) // 2, 0)
+        button_rects = [
+            QRect(bx, by + i * (self.BUTTON_HEIGHT + self.BUTTON_SPACING), self.button_width, self.BUTTON_HEIGHT)
+            for i in range(len(self.buttons))
+        ]
+
+        area = QRect(inner.left(), inner.top(), inner.width() - self.button_width - self.PADDING, inner.height())
+        n = max(len(self.fields), 1)
+        field_rects = []
+        if self.orientation == Qt.Orientation.Horizontal:
+            width = area.width() // n
+            half = area.height() // 2
+            for i in range(len(self.fields)):
+                x = area.left() + i * width
+                field_rects.append((QRect(x, area.top(), width, half),
+                                    QRect(x, area.top() + half, width, area.height() - half)))
+        else:
+            height = area.height() // n
+            half = height // 2
+            for i in range(len(self.fields)):
+                y = area.top() + i * height
+                field_rects.append((QRect(area.left(), y, area.width(), half),
+                                    QRect(area.left(), y + half, area.width(), height - half)))
+        return card, field_rects, button_rects
+
+    def _button_at(self, rect: QRect, pos):
+        _, _, button_rects = self._layout(rect)
+        for (action, _), button_rect in zip(self.buttons, button_rects):
+            if button_rect.contains(pos):
+                return action
+        return None
+
+    # -----------------------------------------------
+    # |                   Disegno                   |
+    # -----------------------------------------------
+    def paint(self, painter, option, index):
+        project = index.data(ProjectRole) or {}
+        card, field_rects, button_rects = self._layout(option.rect)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setClipRect(option.rect)
+
+        painter.setPen(QPen(QColor("#555"), 1))
+        painter.setBrush(QColor("#2e2e2e"))
+        painter.drawRoundedRect(card, 6, 6)
+
+        align = Qt.AlignmentFlag.AlignCenter.value | Qt.TextFlag.TextWordWrap.value
+        for (key, label), (label_rect, value_rect) in zip(self.fields, field_rects):
+            painter.setFont(self.label_font)
+            painter.setPen(QColor("#aaa"))
+            painter.drawText(label_rect, align, f"{label}:")
+            painter.setFont(self.value_font)
+            painter.setPen(QColor("#fff"))
+            painter.drawText(value_rect, align, str(project.get(key, "-")))
+
+        painter.setFont(self.button_font)
+        for (action, text), button_rect in zip(self.buttons, button_rects):
+            hovered = self._hover == (index.row(), action)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self.button_hover if hovered else self.button_color)
+            painter.drawRoundedRect(button_rect, 8, 8)
+            painter.setPen(QColor("white"))
+            painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, text)
+
+        painter.restore()
+
+    # -----------------------------------------------
+    # |                   Eventi                    |
+    # -----------------------------------------------
+    def editorEvent(self, event, model, option, index):
+        etype = event.type()
+        if etype not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            return False
+        action = self._button_at(option.rect, event.position().toPoint())
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+        if etype == QEvent.Type.MouseButtonPress:
+            self._pressed = (index.row(), action) if action else None
+            return action is not None
+
+        pressed, self._pressed = self._pressed, None
+        if action and pressed == (index.row(), action):
+            self.action_triggered.emit(action, index.data(ProjectRole))
+            return True
+        return False
+
+    def update_hover(self, view, index, pos):
+        """
+        @brief Tracks the button under the mouse and repaints the cards whose state changed.
+        """
+        action = self._button_at(view.visualRect(index), pos) if index.isValid() else None
+        hover = (index.row(), action) if action else None
+        if hover != self._hover:
+            self._hover = hover
+            view.viewport().update()
+
+    def clear_hover(self, view=None):
+        if self._hover is not None:
+            self._hover = None
+            if view is not None:
+                view.viewport().update()
+
+
+class ProjectCardView(QListView):
+    """
+    @brief QListView showing project cards through a ProjectCardDelegate.
+
+    With `grid=True` the cards wrap in rows (icon mode), otherwise they are
+    stacked vertically and stretched to the width of the view.
+
+    @signal action_triggered(action: str, project: dict): Re-emitted from the delegate.
+    """
+    action_triggered = pyqtSignal(str, dict)
+
+    def __init__(self, fields, buttons, card_size: QSize, grid: bool = False, parent=None, **delegate_options):
+        super().__init__(parent)
+        self.card_model = ProjectCardModel(self)
+        self.delegate = ProjectCardDelegate(fields, buttons, card_size, parent=self, **delegate_options)
+        self.delegate.action_triggered.connect(self.action_triggered)
+        self.setModel(self.card_model)
+        self.setItemDelegate(self.delegate)
+
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setStyleSheet("QListView { border: none; background: transparent; }")
+
+        if grid:
+            self.setViewMode(QListView.ViewMode.IconMode)
+            self.setFlow(QListView.Flow.LeftToRight)
+            self.setWrapping(True)
+            self.setMovement(QListView.Movement.Static)
+            self.setGridSize(card_size)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+
+    def set_projects(self, projects: list, keep_position: bool = False):
+        """
+        @brief Shows the given projects.
+
+        @param keep_position Keep the scroll position (live updates) instead of going back to the top.
+        """
+        position = self.verticalScrollBar().value()
+        self.delegate.clear_hover()
+        self.card_model.set_projects(projects)
+        if keep_position:
+            self.doItemsLayout()
+            self.verticalScrollBar().setValue(position)
+        else:
+            self.scrollToTop()
+
+    def append_project(self, project: dict):
+        self.card_model.append_project(project)
+
+    def mouseMoveEvent(self, event):
+        pos = event.position().toPoint()
+        self.delegate.update_hover(self, self.indexAt(pos), pos)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.delegate.clear_hover(self)
+        super().leaveEvent(event)
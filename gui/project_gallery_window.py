@@ -9,6 +9,12 @@
 
 Loads project metadata from GitHub, groups projects by category,
 and displays project cards with metadata and actions such as download and description.
+Cards are painted by a ProjectCardView (model/view), so switching category
+does not create any widget.
+
+The window opens immediately: metadata is downloaded by a MetadataFetchWorker
+on a QThread and the cards appear as each project arrives. Closing the window
+cancels the pending downloads.
 
 Provides interactive UI with category selection and styled message dialogs.
 
@@ -19,14 +25,15 @@ Provides interactive UI with category selection and styled message dialogs.
 
 import os, sys
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QScrollArea, QSizePolicy, QListWidget, QLineEdit, QApplication, QListWidgetItem, QMessageBox
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+    QSizePolicy, QListWidget, QLineEdit, QApplication, QListWidgetItem, QMessageBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, QSize
 from PyQt6.QtGui import QIcon
 from gui.color_pantone import Pantone
 from core.translator import Translator
-from core.github_handler import GitHubHandler
+from core.github_handler import GitHubHandler, MetadataFetchWorker
+from gui.project_card_view import ProjectCardView
 from config.GUIconfig import conf
 from core.log_handler import GeneralLogHandler
 from core.translator import Translator
@@ -45,10 +52,11 @@ class ProjectGalleryWindow(QMainWindow):
     """
     def __init__(self):
         """
-        @brief Initializes the gallery window, sets up UI components and loads project data.
+        @brief Initializes the gallery window, sets up UI components and starts loading project data.
 
-        Checks for network availability and shows a warning dialog if no projects are retrieved.
-        Initializes category list and scrollable project display area.
+        Project metadata is fetched in the background (see start_loading); a warning
+        dialog is shown when no project could be retrieved.
+        Initializes category list and the project card view.
         """
         super().__init__()
         self.setWindowTitle(Translator.tr("community_projects_title"))
@@ -62,25 +70,14 @@ class ProjectGalleryWindow(QMainWindow):
             "Actuators & I/O", "Communication", "Automation Logic", "Other / Misc"
         ]
 
-        self.project_data = GitHubHandler.fetch_project_metadata_list()
-        if not self.project_data:
-            msg = QMessageBox(self)
-            msg.setIcon(QMessageBox.Icon.Warning)
-            msg.setWindowTitle(Translator.tr("network_error_title"))
-            if self.logger:
-                self.logger.log(Translator.tr("log_no_projects_downloaded"), "warning")
-            msg.setStyleSheet(Pantone.QMESSAGE_BOX)
-
-            # 🔥 forza il colore bianco del testo QLabel interno
-            for child in msg.children():
-                if isinstance(child, QLabel):
-                    child.setStyleSheet("color: white; font-size: 11pt;")
-
-            msg.exec()
-
-
-
+        self.project_data = []
         self.category_to_cards = self.build_category_index()
+        self.current_category = None
+
+        # Stato del caricamento in background
+        self._fetch_thread = None
+        self._fetch_worker = None
+        self._load_complete = False
 
         # Layout principale
         central_widget = QWidget()
@@ -111,20 +108,138 @@ class ProjectGalleryWindow(QMainWindow):
         main_layout.addWidget(self.category_list)
 
 
-        # Scroll area a destra
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("border: none;")
+        # Colonna destra: stato del caricamento + card dei progetti
+        right_layout = QVBoxLayout()
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #aaa; font-size: 10pt; padding: 4px;")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        right_layout.addWidget(self.status_label)
+
+        self.card_view = ProjectCardView(
+            fields=[
+                ("name", Translator.tr("label_name")),
+                ("version", Translator.tr("label_version")),
+                ("author", Translator.tr("label_author")),
+                ("update", Translator.tr("label_update"))
+            ],
+            buttons=[
+                ("download", "➕ " + Translator.tr("download")),
+                ("description", "➕ " + Translator.tr("descrizione"))
+            ],
+            card_size=QSize(760, 108),
+            button_width=170
+        )
+        self.card_view.action_triggered.connect(self.on_card_action)
+        right_layout.addWidget(self.card_view)
+        main_layout.addLayout(right_layout)
+
+        self.category_list.setCurrentRow(0)  # carica la prima categoria
+        self.start_loading()
+
+    # -----------------------------------------------
+    # |          Caricamento in background          |
+    # -----------------------------------------------
+    def start_loading(self):
+        """
+        @brief Starts downloading the project metadata on a worker thread.
 
-        self.scroll_content = QWidget()
-        self.scroll_layout = QVBoxLayout()
-        self.scroll_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.scroll_content.setLayout(self.scroll_layout)
+        Previously loaded data is discarded; cards are added as results arrive.
+        """
+        if self._fetch_thread is not None:
+            return
+        self.project_data = []
+        self.category_to_cards = self.build_category_index()
+        self._load_complete = False
+        self.load_category_cards(self.current_category)
+        self.status_label.setText(Translator.tr("gallery_loading"))
+        self.status_label.show()
+
+        worker = MetadataFetchWorker()
+        thread = QThread()
+        worker.moveToThread(thread)
+        worker.project_loaded.connect(self.on_project_loaded)
+        worker.finished.connect(self.on_loading_finished)
+        thread.started.connect(worker.run)
+        self._fetch_worker, self._fetch_thread = worker, thread
+        thread.start()
+
+    def cancel_loading(self):
+        """
+        @brief Cancels the running download, if any (results still in flight are ignored).
+        """
+        if self._fetch_worker is not None:
+            self._fetch_worker.cancel()
 
-        self.scroll_area.setWidget(self.scroll_content)
-        main_layout.addWidget(self.scroll_area)
+    def on_project_loaded(self, project: dict):
+        """
+        @brief Adds one downloaded project to the index and, if visible, to the current page.
+        """
+        if self._fetch_worker is None or self._fetch_worker.is_cancelled():
+            return
+        self.project_data.append(project)
+        cat = project.get("category", "Other / Misc")
+        self.category_to_cards.setdefault(cat, []).append(project)
+        if cat == self.current_category:
+            self.card_view.append_project(project)
+        self.status_label.setText(Translator.tr("gallery_loading_count").format(count=len(self.project_data)))
+
+    def on_loading_finished(self, count: int):
+        """
+        @brief Releases the worker thread and reports an empty result.
 
-        self.category_list.setCurrentRow(0)  # carica la prima categoria
+        If the load was cancelled but the window has been reopened meanwhile,
+        the download starts again (showEvent could not start it while the old
+        thread was still running).
+        """
+        worker, thread = self._fetch_worker, self._fetch_thread
+        self._fetch_worker = self._fetch_thread = None
+        cancelled = worker.is_cancelled()
+        thread.quit()
+        thread.wait()
+        worker.deleteLater()
+        thread.deleteLater()
+
+        self.status_label.hide()
+        if cancelled:
+            if self.isVisible():
+                self.start_loading()
+            return
+        self._load_complete = True
+        if not self.project_data:
+            self.show_no_projects_warning()
+
+    def show_no_projects_warning(self):
+        """
+        @brief Shows the warning dialog displayed when no project could be downloaded.
+        """
+        msg = QMessageBox(self)
+        msg.setIcon(QMessageBox.Icon.Warning)
+        msg.setWindowTitle(Translator.tr("network_error_title"))
+        if self.logger:
+            self.logger.log(Translator.tr("log_no_projects_downloaded"), "warning")
+        msg.setStyleSheet(Pantone.QMESSAGE_BOX)
+
+        # 🔥 forza il colore bianco del testo QLabel interno
+        for child in msg.children():
+            if isinstance(child, QLabel):
+                child.setStyleSheet("color: white; font-size: 11pt;")
+
+        msg.exec()
+
+    def showEvent(self, event):
+        """
+        @brief Restarts the download when the window is reopened after an interrupted load.
+        """
+        super().showEvent(event)
+        if not self._load_complete and self._fetch_thread is None:
+            self.start_loading()
+
+    def closeEvent(self, event):
+        """
+        @brief Cancels the pending downloads when the window is closed.
+        """
+        self.cancel_loading()
+        super().closeEvent(event)
 
     def build_category_index(self):
         """
@@ -140,9 +255,9 @@ class ProjectGalleryWindow(QMainWindow):
 
     def load_category_cards(self, category_name):
         """
-        @brief Loads project cards for the selected category into the scroll area.
+        @brief Shows the project cards of the selected category.
 
-        Clears existing cards and adds new widgets for each project in the category.
+        Only the model of the card view is replaced: cards are painted on demand.
         """
         emoji_to_category = {
             "🏠 Home Monitoring": "Home Monitoring",
@@ -154,81 +269,20 @@ class ProjectGalleryWindow(QMainWindow):
             "🧪 Other / Misc": "Other / Misc",
         }
         category_name = emoji_to_category.get(category_name, category_name)
-        while self.scroll_layout.count():
-            item = self.scroll_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        for project in self.category_to_cards.get(category_name, []):
-            self.add_project_card(project)
+        self.current_category = category_name
+        self.card_view.set_projects(self.category_to_cards.get(category_name, []))
 
-    def add_project_card(self, fields):
+    def on_card_action(self, action: str, fields: dict):
         """
-        @brief Creates and adds a UI card widget displaying project metadata and action buttons.
+        @brief Dispatches a click on a card button.
 
-        @param fields Dictionary of project metadata fields (name, version, author, update).
+        @param action "download" or "description".
+        @param fields Metadata of the project of the card.
         """
-        card = QWidget()
-        card.setFixedHeight(100)
-        card.setStyleSheet("""
-            background-color: #2e2e2e;
-            border: 1px solid #555;
-            border-radius: 6px;
-        """)
-
-        card_layout = QHBoxLayout()
-        card_layout.setContentsMargins(8, 8, 8, 8)
-        card_layout.setSpacing(4)
-
-        # Campi visibili
-        for key, label_text in [
-            ("name", Translator.tr("label_name")),
-            ("version", Translator.tr("label_version")),
-            ("author", Translator.tr("label_author")),
-            ("update", Translator.tr("label_update"))
-        ]:
-            value_text = fields.get(key, "-")
-
-            row = QVBoxLayout()
-            row.setSpacing(4)
-
-            label = QLabel(f"{label_text}:")
-            label.setStyleSheet("color: #aaa; font-size: 10pt; padding: 0px;")
-            label.setFixedSize(150, 35)
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            value = QLabel(value_text)
-            value.setStyleSheet("color: #fff; font-size: 10pt; padding: 0px;")
-            value.setWordWrap(True)
-            value.setFixedSize(150, 35)
-            value.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            row.addWidget(label)
-            row.addWidget(value)
-            card_layout.addLayout(row)
-            card_layout.addStretch()
-
-        # Pulsanti
-        btn = QWidget()
-        btn_layout = QVBoxLayout()
-
-        download_btn = QPushButton("➕ " + Translator.tr("download"))
-        download_btn.setStyleSheet(Pantone.COMMON_BUTTON_STYLE)
-        download_btn.clicked.connect(lambda: self.download_project(fields))
-
-        open_card_btn = QPushButton("➕ " + Translator.tr("descrizione"))
-        open_card_btn.setStyleSheet(Pantone.COMMON_BUTTON_STYLE)
-        open_card_btn.clicked.connect(lambda _, f=fields: self.mostra_descrizione_progetto(f))
-
-
-        btn_layout.addWidget(download_btn)
-        btn_layout.addWidget(open_card_btn)
-        btn.setLayout(btn_layout)
-        card_layout.addWidget(btn)
-
-        card.setLayout(card_layout)
-        self.scroll_layout.addWidget(card)
+        if action == "download":
+            self.download_project(fields)
+        elif action == "description":
+            self.mostra_descrizione_progetto(fields)
 
     def download_project(self, fields):
         """
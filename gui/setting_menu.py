@@ -26,7 +26,7 @@ Includes apply and cancel buttons and manages saving settings to the database.
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
     QStackedWidget, QWidget, QLabel, QComboBox, QCheckBox, QPushButton,
-    QFileDialog, QLineEdit, QSpacerItem, QSizePolicy, QFrame
+    QFileDialog, QLineEdit, QSpacerItem, QSizePolicy, QFrame, QSpinBox
 )
 from PyQt6.QtCore import Qt
 from core.save_settings import save_settings, set_setting
@@ -39,7 +39,10 @@ from PyQt6.QtGui import QPixmap, QIcon
 from config.GUIconfig import GlobalPaths, conf
 import os
 import webbrowser
-from core.log_handler import GeneralLogHandler as logger
+from core.log_handler import GeneralLogHandler as logger, ConsoleSink
+from core.yaml_highlighter import YamlHighlighter
+from core.project_handler import ExportWorker
+from core.esphome_env import EsphomeEnvironment
 from PyQt6.QtGui import QDesktopServices
 from PyQt6.QtCore import QUrl
 
@@ -304,14 +307,67 @@ class SettingsDialog(QDialog):
 
         self.force_refresh_btn = QPushButton(Translator.tr("settings_force_refresh"))
         layout.addWidget(self.force_refresh_btn)
+
+        self.compile_cache_checkbox = QCheckBox(Translator.tr("settings_compile_cache"))
+        self.compile_cache_checkbox.setChecked(get_setting("compile_cache") != "0")
+        layout.addWidget(self.compile_cache_checkbox)
+
+        self.clear_compile_cache_btn = QPushButton(Translator.tr("settings_clear_compile_cache"))
+        self.clear_compile_cache_btn.clicked.connect(self.clear_compile_cache)
+        layout.addWidget(self.clear_compile_cache_btn)
+
+        self.community_offline_checkbox = QCheckBox(Translator.tr("settings_community_offline"))
+        self.community_offline_checkbox.setChecked(get_setting("community_offline") == "1")
+        layout.addWidget(self.community_offline_checkbox)
+
+        # Limite di righe mantenute nella console (0 = illimitato)
+        console_row = QHBoxLayout()
+        self.console_lines_label = QLabel(Translator.tr("settings_console_max_lines"))
+        self.console_lines_spin = QSpinBox()
+        self.console_lines_spin.setRange(0, 1000000)
+        self.console_lines_spin.setSingleStep(1000)
+        self.console_lines_spin.setValue(ConsoleSink.configured_max_lines())
+        console_row.addWidget(self.console_lines_label)
+        console_row.addWidget(self.console_lines_spin)
+        layout.addLayout(console_row)
+
+        # Soglia oltre la quale l'evidenziazione YAML è differita (0 = mai)
+        highlight_row = QHBoxLayout()
+        self.highlight_lines_label = QLabel(Translator.tr("settings_highlight_deferred_lines"))
+        self.highlight_lines_spin = QSpinBox()
+        self.highlight_lines_spin.setRange(0, 1000000)
+        self.highlight_lines_spin.setSingleStep(500)
+        self.highlight_lines_spin.setValue(YamlHighlighter.configured_deferred_lines())
+        highlight_row.addWidget(self.highlight_lines_label)
+        highlight_row.addWidget(self.highlight_lines_spin)
+        layout.addLayout(highlight_row)
+
+        # Cartelle/file esclusi dall'esportazione dei progetti (pattern separati da virgola)
+        self.export_ignore_label = QLabel(Translator.tr("settings_export_ignore"))
+        self.export_ignore_input = QLineEdit(", ".join(ExportWorker.ignore_patterns()))
+        self.export_ignore_input.setStyleSheet(Pantone.LINEEDIT_STYLE)
+        layout.addWidget(self.export_ignore_label)
+        layout.addWidget(self.export_ignore_input)
         layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 
         self.debug_checkbox.setStyleSheet(Pantone.CHECKBOX_STYLE)
         self.logfile_checkbox.setStyleSheet(Pantone.CHECKBOX_STYLE)
+        self.compile_cache_checkbox.setStyleSheet(Pantone.CHECKBOX_STYLE)
+        self.community_offline_checkbox.setStyleSheet(Pantone.CHECKBOX_STYLE)
         self.force_refresh_btn.setStyleSheet(Pantone.BUTTON_STYLE)
+        self.clear_compile_cache_btn.setStyleSheet(Pantone.BUTTON_STYLE)
 
         return page
 
+    def clear_compile_cache(self):
+        """
+        @brief Deletes every firmware stored in the compile cache.
+        """
+        from core.compile_cache import CompileCache
+        CompileCache().clear()
+        if self.logger:
+            self.logger.log(Translator.tr("compile_cache_cleared"), "info")
+
     def browse_project_folder(self):
         """
         @brief Opens a folder selection dialog to change the default project folder path.
@@ -359,6 +415,12 @@ class SettingsDialog(QDialog):
         self.debug_checkbox.setText(Translator.tr("settings_enable_devlog"))
         self.logfile_checkbox.setText(Translator.tr("settings_save_debug_log"))
         self.force_refresh_btn.setText(Translator.tr("settings_force_refresh"))
+        self.compile_cache_checkbox.setText(Translator.tr("settings_compile_cache"))
+        self.clear_compile_cache_btn.setText(Translator.tr("settings_clear_compile_cache"))
+        self.community_offline_checkbox.setText(Translator.tr("settings_community_offline"))
+        self.console_lines_label.setText(Translator.tr("settings_console_max_lines"))
+        self.highlight_lines_label.setText(Translator.tr("settings_highlight_deferred_lines"))
+        self.export_ignore_label.setText(Translator.tr("settings_export_ignore"))
 
     def check_updates_now(self):
         """
@@ -397,20 +459,23 @@ class SettingsDialog(QDialog):
         layout.addWidget(label_title)
 
         # Recupero informazioni
-        import subprocess, shutil, sys, urllib.request
-
-        # Versione ESPHome
-        try:
-            result = subprocess.run(["esphome", "version"], capture_output=True, text=True)
-            version = result.stdout.strip()
-        except Exception as e:
-            version = Translator.tr("esphome_version_error").format(error=str(e))
+        import sys, urllib.request
+
+        # Versione ESPHome e percorso eseguibile: solo il probe memorizzato, mai `esphome version`
+        # sul thread della GUI (se è scaduto viene rifatto in background)
+        env = EsphomeEnvironment.stored()
+        esphome_path = env["executable"] if env else EsphomeEnvironment.executable()
+        if env and env["version"]:
+            version = env["version"]
+        elif env is None and esphome_path:
+            version = Translator.tr("esphome_version_detecting")
+        else:
+            version = Translator.tr("esphome_not_found")
 
         label_version = QLabel(f"🔢 {version}")
         layout.addWidget(label_version)
 
         # Percorso eseguibile
-        esphome_path = shutil.which("esphome")
         if esphome_path:
             label_path = QLabel(f"📁 {Translator.tr('esphome_path')}: {esphome_path}")
             label_path.setWordWrap(True)
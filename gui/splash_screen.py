@@ -16,16 +16,19 @@ it halts the process and notifies the user of the error.
 @license: GNU Affero General Public License v3.0 (AGPLv3)
 """
 
-import os, sys, traceback, json, webbrowser, shutil, platform, socket, urllib.request
+import os, sys, time, json, webbrowser, platform, socket, urllib.request
 from pathlib import Path
 from PyQt6.QtWidgets import QLabel, QProgressBar, QApplication, QMessageBox, QSplashScreen
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt, QTimer, QSize
 from core.translator import Translator
-from core.settings_db import get_setting, set_setting
+from core.settings_db import get_setting, set_settings
 from config.GUIconfig import conf, AppInfo, GlobalPaths, get_platform_config
 from core.log_handler import GeneralLogHandler
 from core.custom_dialog_box import CustomDialogBox
+from core.startup_scheduler import StartupScheduler, StartupTask
+from core.esphome_env import EsphomeEnvironment
+from core.startup_profiler import StartupProfiler
 
 class SplashScreen(QSplashScreen):
     """
@@ -97,39 +100,56 @@ custom style, progress bar, informational labels and initialization steps.
         # Global style
         self.setStyleSheet("QSplashScreen { background-color: black; color: white; }")
 
-        # Progress counter
-        self.counter = 0
-
-        # Defines the sequential steps for initialization procedure
-        self.init_steps = [
-            (self.maybe_check_updates_step, self.maybe_check_online_version),
-            (Translator.tr("splash_check_db"), self.check_or_create_user_config),
-            (Translator.tr("splash_check_python"), self.check_python_version),
-            (Translator.tr("splash_check_critical_libs"), self.check_critical_libraries),
-            (Translator.tr("splash_check_base_project"), self.check_base_project_template),
-            (Translator.tr("splash_check_working_folders"), self.check_working_folders),
-            (Translator.tr("splash_check_community_folder"), self.check_community_folder),
-            (Translator.tr("splash_start_completed"), lambda: None)
-        ]
-        self.current_step = 0
-
-    def advance(self):
+        # Task di avvio: eseguiti in parallelo secondo le dipendenze
+        self.scheduler = StartupScheduler(self)
+        self.scheduler.task_started.connect(self.on_task_started)
+        self.scheduler.task_finished.connect(self.on_task_finished)
+        self.scheduler.progress.connect(self.on_progress)
+        self.scheduler.critical_done.connect(self.on_critical_done)
+        self.scheduler.failed.connect(self.on_startup_failed)
+        self.on_complete_callback = None
+        self.build_startup_tasks()
+
+    def build_startup_tasks(self):
         """
-        Advances the splash screen progress bar based on the number of steps. 
-        Also updates the log with the current progress value.
+        Registers the initialization steps in the startup scheduler.
+
+        Independent checks run concurrently on worker threads; the dialogs they may
+        need (missing folders, ESPHome not found, new version) are shown on the GUI thread.
+        The update check is not critical: the splash closes without waiting for it.
         """
-        self.counter += int(100 / len(self.init_steps)) # Computes percentage increment based on total steps
-        self.progress.setValue(min(self.counter, 100))
-        self.logger.debug(f"Avanzamento barra splash al {self.counter}%")
+        tasks = [
+            StartupTask("user_db", self.check_or_create_user_config,
+                        Translator.tr("splash_check_db"), budget_s=5),
+            StartupTask("python", self.check_python_version,
+                        Translator.tr("splash_check_python"), budget_s=5),
+            StartupTask("template", self.check_base_project_template,
+                        Translator.tr("splash_check_base_project"), budget_s=5),
+            StartupTask("community_folder", self.check_community_folder,
+                        Translator.tr("splash_check_community_folder"), budget_s=10),
+            # La cartella community fa parte delle cartelle controllate: va creata prima
+            StartupTask("working_folders", self.scan_working_folders,
+                        Translator.tr("splash_check_working_folders"), deps=("community_folder",),
+                        budget_s=15, on_result=self.confirm_working_folders),
+            StartupTask("libraries", self.find_critical_libraries,
+                        Translator.tr("splash_check_critical_libs"), deps=("user_db",),
+                        budget_s=30, on_result=self.confirm_critical_libraries),
+            StartupTask("updates", self.maybe_fetch_online_version,
+                        self.maybe_check_updates_step, deps=("user_db",), critical=False,
+                        budget_s=8, on_result=self.show_update_result),
+        ]
+        for task in tasks:
+            self.scheduler.add_task(task)
 
     def start_initialization(self, on_complete_callback):
         """
         Starts the splash screen initialization sequence, including OS detection
         and saving the information to the database. The procedure is asynchronous and ends with a callback.
 
-        @param on_complete_callback: Function to be called upon completion of the initialization.
+        @param on_complete_callback: Function to be called once every critical step has completed.
         """
         self.logger.info("Avvio sequenza inizializzazione splash screen.")
+        self.started_at = time.perf_counter()
 
         # Rilevamento dettagli OS
         self.os_platform = platform.system()     # Detects and logs operating system information
@@ -140,41 +160,61 @@ custom style, progress bar, informational labels and initialization steps.
         self.logger.info(f"Sistema operativo rilevato: {self.os_platform} {os_release} (build: {os_version})")
 
         # Salvataggio nel DB
-        set_setting("os_platform", self.os_platform.lower())
-        set_setting("os_version", os_version.lower())
-        set_setting("os_build", os_release.lower())
+        set_settings({
+            "os_platform": self.os_platform.lower(),
+            "os_version": os_version.lower(),
+            "os_build": os_release.lower()
+        })
 
         self.on_complete_callback = on_complete_callback
-        QTimer.singleShot(500, self.perform_next_step)
+        StartupProfiler.begin("splash_checks")
+        self.scheduler.start()
 
-    def perform_next_step(self):
+    def on_task_started(self, name: str):
         """
-        Performs the next step of the initialization sequence. 
-        Updates the visual status, handles blocking errors and calls the final callback on completion.
+        Shows the message of the most recently started step.
         """
-        self.logger.debug(f"Esecuzione step splash n. {self.current_step + 1} / {len(self.init_steps)}")
-        if self.current_step < len(self.init_steps):     # If more steps are present, execute the next one
-            message, func = self.init_steps[self.current_step]
-            self.status_label.setText(str(message()) if callable(message) else str(message))
-            QApplication.processEvents()
-            try:
-                func()
-                self.logger.debug(f"Step {self.current_step + 1} completato con successo.")
-            except Exception:
-                err_msg = traceback.format_exc()
-                self.logger.log_exception("Errore durante lo step di inizializzazione splash")
-                self.logger.error(f"Errore bloccante nello step n. {self.current_step + 1}")
-                self.status_label.setText("❌ " + Translator.tr("splash_error_generic"))
-                QMessageBox.critical(self, Translator.tr("splash_init_error"), f"{Translator.tr('splash_error_generic')}\n\n{err_msg}")     # Executes the current step and handles any exceptions
-                QTimer.singleShot(2000, QApplication.quit)
-                return
-            self.advance()
-            self.current_step += 1
-            QTimer.singleShot(500, self.perform_next_step)     # Starts the first step of the sequence after a short delay
-        else:
-            self.close()     # All steps completed: closes splash and calls the completion function
-            if self.on_complete_callback:
-                self.on_complete_callback()
+        self.status_label.setText(self.scheduler.tasks[name].text())
+
+    def on_task_finished(self, name: str, state: str, elapsed: float):
+        """
+        Records the duration of a step in the startup profile (when enabled).
+        """
+        task = self.scheduler.tasks[name]
+        StartupProfiler.add_phase(f"splash: {name} ({state})", task.started, task.started + elapsed)
+
+    def on_progress(self, completed: int, total: int):
+        """
+        Updates the progress bar with the number of completed steps.
+        """
+        self.progress.setValue(int(completed * 100 / total) if total else 100)
+        running = self.scheduler.running()
+        if running:
+            self.status_label.setText(running[-1].text())
+        self.logger.debug(f"Avanzamento splash: {completed}/{total} step completati")
+
+    def on_critical_done(self):
+        """
+        Closes the splash and calls the completion callback as soon as every critical step succeeded.
+        Optional steps still running (update check) continue in background.
+        """
+        self.logger.info(f"Inizializzazione completata in {time.perf_counter() - self.started_at:.2f} s")
+        StartupProfiler.end("splash_checks")
+        self.progress.setValue(100)
+        self.status_label.setText(Translator.tr("splash_start_completed"))
+        self.close()
+        if self.on_complete_callback:
+            self.on_complete_callback()
+
+    def on_startup_failed(self, name: str, error: str):
+        """
+        Handles a blocking error in a critical step: notifies the user and quits the application.
+        """
+        self.logger.error(f"Errore bloccante nello step di avvio '{name}'")
+        self.status_label.setText("❌ " + Translator.tr("splash_error_generic"))
+        QMessageBox.critical(self, Translator.tr("splash_init_error"),
+                             f"{Translator.tr('splash_error_generic').format(error=name)}\n\n{error}")
+        QTimer.singleShot(2000, QApplication.quit)
 
     def check_python_version(self):
         """
@@ -206,9 +246,23 @@ custom style, progress bar, informational labels and initialization steps.
             self.logger.info(f"Template base presente: {template_path}")
             self.logger.info("Controllo file template di progetto completato con successo.")
 
-    def check_working_folders(self):
+    def scan_working_folders(self):
+        """
+        Checks the working folders without any dialog (safe on a worker thread).
+
+        @return Tuple (dict of the failing resources, platform_id).
+        """
         checklist, platform_id = self.prepare_paths_checklist()
-        self.check_resources_accessibility(checklist, platform_id)
+        failing = {label: path for label, path in checklist.items() if not self.resource_accessible(path)}
+        return failing, platform_id
+
+    def confirm_working_folders(self, result):
+        """
+        Asks the user to fix the resources found missing or not writable by scan_working_folders().
+        """
+        failing, platform_id = result
+        if failing:
+            self.check_resources_accessibility(failing, platform_id)
 
     def check_online_version(self):
         """
@@ -216,20 +270,32 @@ custom style, progress bar, informational labels and initialization steps.
         If available, displays a message with changelog and link to the release page.
         Check is only performed if an internet connection is available.
         """
+        try:
+            result = self.fetch_online_version()
+        except Exception:
+            self.status_label.setText(Translator.tr("version_check_failed"))
+            raise
+        self.show_update_result(result)
+
+    def fetch_online_version(self):
+        """
+        Downloads the version data published on GitHub (network only, safe on a worker thread).
+
+        @return Dict with "latest_version" and "changelog", or None if there is no internet connection.
+        """
         self.logger.info("Avvio controllo aggiornamenti da GitHub...")
 
         # Verifica connessione Internet
         def is_online():     # Checks if an internet connection is available
             try:
-                socket.create_connection(("8.8.8.8", 53), timeout=2)
+                socket.create_connection(("8.8.8.8", 53), timeout=2).close()
                 return True
             except OSError:
                 return False
 
         if not is_online():
             self.logger.warning("Connessione Internet non disponibile. Salto controllo aggiornamenti.")
-            self.status_label.setText(Translator.tr("version_check_failed"))
-            return
+            return None
 
         try:
             req = urllib.request.Request(     # HTTP request to fetch update data from GitHub
@@ -240,48 +306,60 @@ custom style, progress bar, informational labels and initialization steps.
                 }
             )
             with urllib.request.urlopen(req, timeout=5) as response:
-                data = json.loads(response.read().decode("utf-8"))
-                latest = data.get("latest_version")
-                changelog = data.get("changelog", "")
-
-                current_lang = Translator.get_current_language()
-                changelog_text = changelog.get(current_lang, changelog.get("en", ""))
-
-                if latest and latest != AppInfo.VERSION:     # If remote version is newer, display update dialog
-                    self.logger.info(f"Nuova versione disponibile: {latest} (attuale: {AppInfo.VERSION})")
-                    self.status_label.setText(Translator.tr("update_available"))
-
-                    msg = QMessageBox(self)
-                    msg.setIcon(QMessageBox.Icon.Information)
-                    msg.setWindowTitle(Translator.tr("update_available_title"))
-                    msg.setText(
-                        Translator.tr("update_available_text").format(
-                            latest=latest, current=AppInfo.VERSION
-                        )
-                    )
-                    msg.setInformativeText(
-                        Translator.tr("update_changelog_prompt") + "\n\n" + changelog_text
-                    )
-                    msg.setStandardButtons(
-                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-                    )
-                    msg.setDefaultButton(QMessageBox.StandardButton.Yes)
-
-                    res = msg.exec()
-                    if res == QMessageBox.StandardButton.Yes:
-                        webbrowser.open(AppInfo.RELEASE_URL)
-                        self.logger.info("Pagina GitHub delle release aperta su richiesta dell’utente.")
-                else:
-                    self.status_label.setText(Translator.tr("version_up_to_date"))
-                    self.logger.info("Versione del programma aggiornata.")
-            
-            self.logger.info("Controllo aggiornamenti completato con successo.")
-
+                return json.loads(response.read().decode("utf-8"))
         except Exception:
-            self.status_label.setText(Translator.tr("version_check_failed"))
             self.logger.log_exception("Errore durante il controllo aggiornamenti GitHub")
             raise
 
+    def show_update_result(self, data):
+        """
+        Shows the outcome of fetch_online_version(): the update dialog if the remote version is newer.
+
+        @param data: Dict returned by fetch_online_version(), None if offline, "disabled" if the check is turned off.
+        """
+        if data == "disabled":
+            return
+        if data is None:
+            self.status_label.setText(Translator.tr("version_check_failed"))
+            return
+
+        latest = data.get("latest_version")
+        changelog = data.get("changelog", "")
+
+        current_lang = Translator.get_current_language()
+        changelog_text = changelog.get(current_lang, changelog.get("en", ""))
+
+        if latest and latest != AppInfo.VERSION:     # If remote version is newer, display update dialog
+            self.logger.info(f"Nuova versione disponibile: {latest} (attuale: {AppInfo.VERSION})")
+            self.status_label.setText(Translator.tr("update_available"))
+
+            # La splash può essere già chiusa: il dialogo non deve dipendere da lei
+            msg = QMessageBox(self if self.isVisible() else None)
+            msg.setIcon(QMessageBox.Icon.Information)
+            msg.setWindowTitle(Translator.tr("update_available_title"))
+            msg.setText(
+                Translator.tr("update_available_text").format(
+                    latest=latest, current=AppInfo.VERSION
+                )
+            )
+            msg.setInformativeText(
+                Translator.tr("update_changelog_prompt") + "\n\n" + changelog_text
+            )
+            msg.setStandardButtons(
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            msg.setDefaultButton(QMessageBox.StandardButton.Yes)
+
+            res = msg.exec()
+            if res == QMessageBox.StandardButton.Yes:
+                webbrowser.open(AppInfo.RELEASE_URL)
+                self.logger.info("Pagina GitHub delle release aperta su richiesta dell’utente.")
+        else:
+            self.status_label.setText(Translator.tr("version_up_to_date"))
+            self.logger.info("Versione del programma aggiornata.")
+
+        self.logger.info("Controllo aggiornamenti completato con successo.")
+
     def check_community_folder(self):
         """
         Verifies the existence of the local community projects folder. 
@@ -293,7 +371,6 @@ custom style, progress bar, informational labels and initialization steps.
             community_path = conf.COMMUNITY_LOCAL_FOLDER     # Path to the folder used for shared community projects
             os.makedirs(community_path, exist_ok=True)
             self.logger.info(f"Cartella community verificata o creata: {community_path}")
-            self.status_label.setText(f"Cartella community: {community_path}")
             self.logger.info("Controllo cartella community completato con successo.")
         except Exception:
             self.logger.log_exception("Errore durante il controllo o la creazione della cartella community")
@@ -309,27 +386,28 @@ custom style, progress bar, informational labels and initialization steps.
         """
         return Translator.tr("splash_check_updates") if get_setting("check_updates") == "1" else Translator.tr("splash_disable_updates")
 
-    def maybe_check_online_version(self):
+    def maybe_fetch_online_version(self):
         """
-        Performs the update check only if the option is enabled in the database.
-        Otherwise, the function is skipped with no effect.
+        Downloads the version data only if the update check is enabled in the database.
+
+        @return: Result of fetch_online_version(), or "disabled".
         """
         if get_setting("check_updates") != "1":     # Checks if update checking is enabled before proceeding
-            return  # salta il controllo se disabilitato
-        self.check_online_version()
+            return "disabled"  # salta il controllo se disabilitato
+        return self.fetch_online_version()
 
-    def check_critical_libraries(self):
+    def find_critical_libraries(self):
         """
-        Checks for the presence of core libraries required by the application.
+        Imports the core libraries and looks for ESPHome, without any dialog (safe on a worker thread).
 
         Verifica se sono presenti:
         - PyQt6
         - ruamel.yaml
         - serial
-        - esphome (modulo o CLI)
+        - esphome (CLI o modulo, tramite EsphomeEnvironment)
 
-        If a library is missing, an exception is raised.
-        If the esphome module is not importable but the CLI is available (PATH, custom or fallback), it is considered valid.
+        @return: Path of the ESPHome executable (or module), None if it was not found.
+        @raises Exception: If one of the core libraries is missing.
         """
         self.logger.info("Avvio controllo librerie critiche...")
         try:
@@ -343,53 +421,40 @@ custom style, progress bar, informational labels and initialization steps.
             self.logger.error(f"Libreria mancante: {e.name}")
             raise Exception(f"Libreria mancante: {e.name}. L'app non può avviarsi.")
 
+        # Probe ESPHome memorizzato nel DB: rivalidato con pochi stat, senza importare esphome
+        env = EsphomeEnvironment.probe()
+        if env is None:
+            return None
+        self.logger.info(f"ESPHome disponibile ({env['kind']}): {env['executable']} - versione {env['version'] or '?'}")
+        return env["executable"]
+
+    def confirm_critical_libraries(self, esphome_location):
+        """
+        Prompts the user to install ESPHome if find_critical_libraries() did not find it.
+
+        @param esphome_location: Value returned by find_critical_libraries().
+        @raises Exception: If ESPHome is not installed.
+        """
+        if esphome_location:
+            return
+
+        self.status_label.setText("⚠️ " + Translator.tr("esphome_not_found_title"))
         try:
-            import esphome  # type: ignore     # Tries to import esphome as a module (optional)
-            self.logger.debug("Libreria esphome disponibile.")
-        except ImportError:
-            self.logger.warning("Modulo esphome non importabile. Verifica della CLI in corso...")
-            if shutil.which("esphome"):     # If the module is unavailable, checks if CLI is in PATH
-                self.logger.info("ESPHome CLI trovata nel PATH.")
-                self.logger.debug("Modulo esphome non importabile, ma CLI rilevata nel PATH → OK")
-                return  # ESPHome CLI sufficiente → termina qui
-            
-            custom_path = get_setting("custom_esphome_path")     # Checks if the user has configured a custom path for the CLI
-            if custom_path and Path(custom_path).exists():
-                self.logger.info(f"ESPHome CLI trovato nel percorso personalizzato: {custom_path}")
-                return
-
-            # Common fallback paths on Windows systems for ESPHome CLI
-            known_paths = [
-                Path.home() / ".esphome" / "esphome_venv" / "Scripts" / "esphome.exe",
-                Path("C:/Program Files/ESPHome/esphome.exe"),
-                Path("C:/Tools/esphome/esphome.exe"),
-                Path("/usr/local/bin/esphome"),
-                Path("/usr/bin/esphome")
-            ]
-
-            for path in known_paths:
-                if path.exists():
-                    self.logger.info(f"ESPHome CLI trovata nel percorso fallback: {path}")
-                    return
-
-            else:
-                self.status_label.setText("⚠️ " + Translator.tr("esphome_not_found_title"))
-                try:
-                    self.logger.warning("ESPHome non rilevato. Prompt per download mostrato all'utente.")
-                    # If all checks fail, prompts user to open the installation page
-                    reply = QMessageBox.question(
-                        self,
-                        Translator.tr("esphome_not_found_title"),
-                        Translator.tr("esphome_not_found_text"),
-                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-                    )
-                    if reply == QMessageBox.StandardButton.Yes:
-                        webbrowser.open("https://esphome.io/guides/installing_esphome.html")
-                        self.logger.info("Aperta la pagina di download di ESPHome.")
-                except Exception:
-                    self.logger.log_exception("Errore durante il prompt per download ESPHome")
-
-                raise Exception("ESPHome non installato e CLI non trovata.")
+            self.logger.warning("ESPHome non rilevato. Prompt per download mostrato all'utente.")
+            # If all checks fail, prompts user to open the installation page
+            reply = QMessageBox.question(
+                self,
+                Translator.tr("esphome_not_found_title"),
+                Translator.tr("esphome_not_found_text"),
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.Yes:
+                webbrowser.open("https://esphome.io/guides/installing_esphome.html")
+                self.logger.info("Aperta la pagina di download di ESPHome.")
+        except Exception:
+            self.logger.log_exception("Errore durante il prompt per download ESPHome")
+
+        raise Exception("ESPHome non installato e CLI non trovata.")
 
     def check_or_create_user_config(self):
         """
@@ -404,7 +469,6 @@ custom style, progress bar, informational labels and initialization steps.
 
         if os.path.exists(conf.USER_DB_PATH):
             self.logger.info(f"File user_config.db trovato in: {conf.USER_DB_PATH}")
-            self.status_label.setText("File user_config.db presente")
             self.logger.info("Controllo user_config.db completato con successo.")
         else:
             self.logger.error("File user_config.db mancante. Avvio impossibile.")
@@ -444,6 +508,33 @@ custom style, progress bar, informational labels and initialization steps.
         return checklist, platform_id
 
 
+    @staticmethod
+    def probe_resource(path: Path):
+        """
+        Verifica che un file o una cartella esista e sia accessibile in lettura/scrittura.
+
+        @return None se la risorsa è accessibile, altrimenti l'eccezione riscontrata.
+        """
+        try:
+            if path.is_dir():
+                test_file = path / ".__perm_test__"
+                with open(test_file, "w", encoding="utf-8") as f:
+                    f.write("perm test")
+                with open(test_file, "r", encoding="utf-8") as f:
+                    content = f.read().strip()
+                os.remove(test_file)
+                if content != "perm test":
+                    raise IOError("Contenuto letto non corrisponde a quello scritto.")
+            elif not os.access(path, os.R_OK | os.W_OK):
+                raise PermissionError("Accesso in lettura/scrittura negato.")
+            return None
+        except Exception as e:
+            return e
+
+    @classmethod
+    def resource_accessible(cls, path: Path) -> bool:
+        return path.exists() and cls.probe_resource(path) is None
+
     def check_resources_accessibility(self, checklist: dict, platform_id: str):
         """
         Cicla sulle risorse da controllare (file/cartelle) e verifica che esistano e siano accessibili (read/write).
@@ -472,48 +563,32 @@ custom style, progress bar, informational labels and initialization steps.
 
             # --- Fase 2: Controllo permessi ---
             while True:
-                try:
-                    if path.is_dir():
-                        test_file = path / ".__perm_test__"
-                        with open(test_file, "w", encoding="utf-8") as f:
-                            f.write("perm test")
-                        with open(test_file, "r", encoding="utf-8") as f:
-                            content = f.read().strip()
-                        os.remove(test_file)
-                        if content != "perm test":
-                            raise IOError("Contenuto letto non corrisponde a quello scritto.")
-                    else:
-                        if not os.access(path, os.R_OK | os.W_OK):
-                            raise PermissionError("Accesso in lettura/scrittura negato.")
-
+                e = self.probe_resource(path)
+                if e is None:
                     self.logger.debug(f"✅ Permessi lettura/scrittura OK per: {path}")
                     break
 
-                except Exception as e:
-                    self.logger.error(f"⛔ Permessi insufficienti su '{label}': {e}")
-
-                    # Suggerimenti OS-specifici
-                    if platform_id == "windows":
-                        instructions = Translator.tr("windows_permission_instructions").format(path=path)
-                    elif platform_id == "darwin":
-                        instructions = Translator.tr("macos_permission_instructions").format(path=path)
-                    else:
-                        instructions = Translator.tr("linux_permission_instructions").format(path=path)
-
-                    message = Translator.tr("permissions_denied_message").format(path=path, instructions=instructions)
-
-                    dlg = CustomDialogBox(
-                        title=Translator.tr("permissions_denied_title"),
-                        message=message,
-                        buttons=["Chiudi", "Riprova"]
-                    )
-                    result = dlg.exec()
+                self.logger.error(f"⛔ Permessi insufficienti su '{label}': {e}")
 
-                    if result == dlg.button_index("Riprova"):
-                        continue
-                    else:
-                        self.logger.error(f"Programma terminato per permessi mancanti su {path}")
-                        sys.exit(1)
+                # Suggerimenti OS-specifici
+                if platform_id == "windows":
+                    instructions = Translator.tr("windows_permission_instructions").format(path=path)
+                elif platform_id == "darwin":
+                    instructions = Translator.tr("macos_permission_instructions").format(path=path)
+                else:
+                    instructions = Translator.tr("linux_permission_instructions").format(path=path)
 
+                message = Translator.tr("permissions_denied_message").format(path=path, instructions=instructions)
 
+                dlg = CustomDialogBox(
+                    title=Translator.tr("permissions_denied_title"),
+                    message=message,
+                    buttons=["Chiudi", "Riprova"]
+                )
+                result = dlg.exec()
 
+                if result == dlg.button_index("Riprova"):
+                    continue
+                else:
+                    self.logger.error(f"Programma terminato per permessi mancanti su {path}")
+                    sys.exit(1)
@@ -19,7 +19,8 @@ Manages command concurrency and updates UI button states accordingly.
 """
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QPushButton, QGroupBox, QHBoxLayout, QLabel, QComboBox, QLineEdit, QFormLayout
+    QWidget, QVBoxLayout, QPushButton, QGroupBox, QHBoxLayout, QLabel, QComboBox, QLineEdit, QFormLayout,
+    QSpinBox, QFileDialog, QListWidget
 )
 from PyQt6.QtCore import Qt, pyqtSlot
 import socket, threading, os
@@ -30,6 +31,8 @@ from core.translator import Translator
 from core.compile_manager import CompileManager
 from pathlib import Path
 from core.log_handler import GeneralLogHandler as logger
+from core.settings_db import set_setting
+from config.GUIconfig import conf
 
 class TabCommand(QWidget):
     """
@@ -58,6 +61,8 @@ class TabCommand(QWidget):
         self.busy = False  # Blocca comandi concorrenti (compile/erase/upload
         self.compiler.upload_finished.connect(self.riabilita_bottoni_qt)
         self.compiler.compile_finished.connect(self.riabilita_bottoni_qt)
+        self.compiler.job_status_changed.connect(self.on_job_status_changed)
+        self.compiler.queue_finished.connect(self.on_queue_finished)
 
         self.setPalette(get_dark_palette())
         self.setAutoFillBackground(True)           
@@ -198,13 +203,49 @@ class TabCommand(QWidget):
         self.compile_btn.setFixedWidth(200)
         self.compile_btn.clicked.connect(self.compila_progetto)
 
+        # Bottone COMPILAZIONE MULTIPLA (coda di job)
+        self.batch_compile_btn = QPushButton("📚 " + Translator.tr("batch_compile"))
+        self.batch_compile_btn.setStyleSheet(Pantone.BUTTON_STYLE_GREEN)
+        self.batch_compile_btn.setFixedWidth(200)
+        self.batch_compile_btn.clicked.connect(self.compila_batch)
+
+        # Numero di compilazioni parallele
+        self.workers_label = QLabel(Translator.tr("compile_workers"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, os.cpu_count() or 1)
+        self.workers_spin.setValue(self.compiler.max_workers)
+        self.workers_spin.setFixedWidth(80)
+        self.workers_spin.valueChanged.connect(self.on_workers_changed)
+
+        # Bottone ANNULLA (coda di compilazione)
+        self.cancel_compile_btn = QPushButton("⛔ " + Translator.tr("compile_cancel"))
+        self.cancel_compile_btn.setStyleSheet(Pantone.BUTTON_STYLE)
+        self.cancel_compile_btn.setFixedWidth(200)
+        self.cancel_compile_btn.setEnabled(False)
+        self.cancel_compile_btn.clicked.connect(self.annulla_compilazione)
+
+        # Stato dei job della coda (visibile solo con più file)
+        self.jobs_list = QListWidget()
+        self.jobs_list.setStyleSheet(Pantone.LISTWIDGET_STYLE)
+        self.jobs_list.setMaximumHeight(180)
+        self.jobs_list.hide()
+        self._job_items = {}  # job_id → QListWidgetItem
 
         # Layout bottoni
         btn_layout = QHBoxLayout()
         btn_layout.setAlignment(Qt.AlignmentFlag.AlignHCenter)
         btn_layout.addWidget(self.compile_btn)
+        btn_layout.addWidget(self.batch_compile_btn)
+        btn_layout.addWidget(self.cancel_compile_btn)
+
+        workers_layout = QHBoxLayout()
+        workers_layout.setAlignment(Qt.AlignmentFlag.AlignHCenter)
+        workers_layout.addWidget(self.workers_label)
+        workers_layout.addWidget(self.workers_spin)
 
         group_layout.addLayout(btn_layout)
+        group_layout.addLayout(workers_layout)
+        group_layout.addWidget(self.jobs_list)
         self.group_compile.setLayout(group_layout)
         layout.addWidget(self.group_compile)
  
@@ -237,6 +278,7 @@ class TabCommand(QWidget):
 
         self.busy = True
         self.compile_btn.setEnabled(False)
+        self.batch_compile_btn.setEnabled(False)
         self.flash_btn.setEnabled(False)
         self.erase_btn.setEnabled(False)
 
@@ -379,6 +421,11 @@ class TabCommand(QWidget):
         # Compilazione
         self.group_compile.setTitle(Translator.tr("firmware_compile"))
         self.compile_btn.setText("🚀 " + Translator.tr("compile"))
+        self.batch_compile_btn.setText("📚 " + Translator.tr("batch_compile"))
+        self.cancel_compile_btn.setText("⛔ " + Translator.tr("compile_cancel"))
+        self.workers_label.setText(Translator.tr("compile_workers"))
+        for job in self.compiler.jobs:
+            self.on_job_status_changed(job.job_id, job.status, -1 if job.exit_code is None else job.exit_code)
         # Placeholder degli edit
         self.ota_ip_edit.setPlaceholderText(Translator.tr("ip_address"))
         self.ota_port_edit.setPlaceholderText(Translator.tr("ota_port"))
@@ -399,13 +446,106 @@ class TabCommand(QWidget):
 
         self.busy = True
         self.compile_btn.setEnabled(False)
+        self.batch_compile_btn.setEnabled(False)
         self.flash_btn.setEnabled(False)
         self.erase_btn.setEnabled(False)
 
         yaml_path = self.window().get_or_create_yaml_path()
         self.compiler.log_callback = self.logger.log
+        self.clear_jobs_list()
         self.compiler.compile_yaml(yaml_path)
 
+    def compila_batch(self):
+        """
+        @brief Compiles several YAML files in parallel through the compiler job queue.
+
+        Asks the user for the files to build; they are queued and compiled
+        using up to the configured number of workers. Every job is listed with
+        its status; the queue can be stopped with the Cancel button, the other
+        buttons stay disabled until the whole queue is finished.
+        """
+        if self.busy:
+            logger.debug("DEBUG: compilazione multipla ignorata perché busy = True")
+            return
+
+        yaml_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            Translator.tr("batch_compile_select"),
+            str(conf.DEFAULT_PROJECT_DIR),
+            "YAML Files (*.yaml *.yml)"
+        )
+        if not yaml_paths:
+            return
+
+        self.logger.log("────────── 📚 COMPILAZIONE MULTIPLA ──────────", "info")
+        self.logger.log(Translator.tr("batch_compile_started").format(n=len(yaml_paths), workers=self.compiler.max_workers), "info")
+
+        self.busy = True
+        self.compile_btn.setEnabled(False)
+        self.batch_compile_btn.setEnabled(False)
+        self.flash_btn.setEnabled(False)
+        self.erase_btn.setEnabled(False)
+
+        self.compiler.log_callback = self.logger.log
+        self.clear_jobs_list()
+        if not self.compiler.enqueue_compile(yaml_paths):
+            self.riabilita_bottoni_qt()
+
+    def clear_jobs_list(self):
+        """
+        @brief Empties the job status list before a new compile queue starts.
+        """
+        self.jobs_list.clear()
+        self._job_items = {}
+        self.jobs_list.hide()
+
+    def on_job_status_changed(self, job_id: int, status: str, exit_code: int):
+        """
+        @brief Shows the status of a compile job in the list and updates the Cancel button.
+
+        @param job_id Id of the CompileJob.
+        @param status New status (pending, running, success, failed, cancelled).
+        @param exit_code Exit code of `esphome compile`, -1 if not available.
+        """
+        job = next((j for j in self.compiler.jobs if j.job_id == job_id), None)
+        if job is not None:
+            item = self._job_items.get(job_id)
+            if item is None:
+                self.jobs_list.addItem("")
+                item = self._job_items[job_id] = self.jobs_list.item(self.jobs_list.count() - 1)
+            item.setText(Translator.tr("compile_job_summary").format(
+                id=job_id, name=job.name, status=Translator.tr(f"compile_status_{status}"),
+                code="-" if exit_code < 0 else exit_code
+            ))
+            self.jobs_list.setVisible(len(self._job_items) > 1)
+        self.cancel_compile_btn.setEnabled(self.compiler.has_active_jobs())
+
+    def annulla_compilazione(self):
+        """
+        @brief Cancels the pending compile jobs and stops the running ones.
+        """
+        if not self.compiler.has_active_jobs():
+            return
+        self.logger.log(Translator.tr("compile_cancel_requested"), "warning")
+        self.cancel_compile_btn.setEnabled(False)
+        self.compiler.cancel_queue()
+
+    def on_queue_finished(self, ok: int, failed: int):
+        """
+        @brief Re-enables the commands once every job of the queue has ended.
+        """
+        self.cancel_compile_btn.setEnabled(False)
+        self.riabilita_bottoni_qt()
+
+    def on_workers_changed(self, value):
+        """
+        @brief Stores the number of parallel compile workers and applies it to the queue.
+
+        @param value New number of workers.
+        """
+        self.compiler.set_max_workers(value)
+        set_setting("compile_workers", str(value))
+
     def erase_flash(self):
         """
         @brief Erases the flash memory of the connected ESP device via esptool.
@@ -429,6 +569,7 @@ class TabCommand(QWidget):
         self.busy = True
         self.flash_btn.setEnabled(False)
         self.compile_btn.setEnabled(False)
+        self.batch_compile_btn.setEnabled(False)
         self.erase_btn.setEnabled(False)
 
         # Callback di fine operazione
@@ -437,6 +578,7 @@ class TabCommand(QWidget):
             self.busy = False
             self.flash_btn.setEnabled(True)
             self.compile_btn.setEnabled(True)
+            self.batch_compile_btn.setEnabled(True)
             self.erase_btn.setEnabled(True)
 
         # Lancia erase
@@ -450,8 +592,12 @@ class TabCommand(QWidget):
         @brief Qt slot that re-enables compile, upload, and erase buttons after operations finish.
 
         Logs successful upload completion message and clears busy flag.
+        While compile jobs are still queued the buttons stay disabled.
         """
+        if self.compiler.has_active_jobs():
+            return
         self.compile_btn.setEnabled(True)
+        self.batch_compile_btn.setEnabled(True)
         self.flash_btn.setEnabled(True)
         self.erase_btn.setEnabled(True)
         if "run" in (self.compiler.command if hasattr(self.compiler, "command") else []):
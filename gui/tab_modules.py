@@ -20,12 +20,13 @@ and synchronizes UI with YAML configuration.
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QFormLayout, QCheckBox, QComboBox, QPushButton, QScrollArea, QSpinBox, QMessageBox
 from PyQt6.QtCore import Qt
-import json
 from .collapsible_section import CollapsibleSection
 from gui.color_pantone import Pantone 
 from core.translator import Translator
 from core.log_handler import GeneralLogHandler as logger
 from core.yaml_handler import YAMLHandler
+from core.yaml_document import YamlDocument
+from core.catalog_registry import CatalogRegistry
 from config.GUIconfig import conf
 
 class TabModules(QWidget):
@@ -57,8 +58,7 @@ class TabModules(QWidget):
         self.sections_map = {}
 
         # 2. Aggiungi le sezioni accordion
-        with open("config/modules_schema.json", encoding="utf-8") as f:
-            modules_schema = json.load(f)
+        modules_schema = CatalogRegistry.modules_schema()
 
         for module_name, module_info in modules_schema.items():
             icon = module_info.get("icon", "")
@@ -155,7 +155,7 @@ class TabModules(QWidget):
         @brief Updates the YAML content in the editor by reading the active module configurations.
 
         Extracts module values from the UI widgets (accordion form),
-        generates a new YAML string using `YAMLHandler`, and replaces the current YAML in the editor.
+        and rewrites only the module sections in the editor (full regeneration as a fallback).
 
         If the operation is successful, a success message is logged.
         On error, appropriate fallback logging is performed using the logger.
@@ -175,12 +175,17 @@ class TabModules(QWidget):
                 self.widget_map,
                 modules_schema_path
             )
-            new_yaml = YAMLHandler.generate_yaml_with_modules(
-                current_yaml,
-                modules_dict,
-                modules_schema_path
-            )
-            editor.setPlainText(new_yaml)
+            # Modifica solo le sezioni dei moduli; se non possibile riscrive tutto
+            edits = YAMLHandler.patch_module_sections(current_yaml, modules_dict, modules_schema_path)
+            if edits is not None and hasattr(editor, "apply_line_edits"):
+                editor.apply_line_edits(edits)
+            else:
+                new_yaml = YAMLHandler.generate_yaml_with_modules(
+                    current_yaml,
+                    modules_dict,
+                    modules_schema_path
+                )
+                editor.setPlainText(new_yaml)
             if self.logger:
                 self.logger.log(Translator.tr("yaml_updated_from_modules"), "success")
 
@@ -207,18 +212,17 @@ class TabModules(QWidget):
 
         If a module is not found in the YAML, its section remains disabled.
 
-        @param yaml_string YAML configuration as a string to be parsed and reflected in the UI.
+        @param yaml_string YAML configuration as a string (or YamlDocument) to be reflected in the UI.
         """
-        modules_schema_path = "config/modules_schema.json"
+        modules_schema_path = conf.MODULE_SCHEMA_PATH
+        # Un solo parsing condiviso con gli altri tab
+        doc = YamlDocument.get(yaml_string)
         modules_data = YAMLHandler.extract_modules_from_yaml(
-            yaml_string,
+            doc,
             modules_schema_path
         )
         # Estrai i moduli PRESENTI nel file yaml (chiavi minuscole, underscore)
-        import ruamel.yaml
-        yaml = ruamel.yaml.YAML()
-        data = yaml.load(yaml_string) or {}
-        yaml_moduli_presenti = set(data.keys())
+        yaml_moduli_presenti = set(doc.data.keys())
 
         for module_name, values in modules_data.items():
             widget_dict = self.widget_map.get(module_name, {})
@@ -22,10 +22,10 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGroupBox, QPushButton, QHBoxL
 from PyQt6.QtCore import Qt
 from gui.sensor_canvas import SensorCanvas
 from core.yaml_handler import YAMLHandler
+from core.yaml_document import YamlDocument
+from core.sensor_catalog import SensorCatalog
 from gui.color_pantone import Pantone
-from ruamel.yaml import YAML
 from core.translator import Translator
-from gui.block_selection_dialog import *
 from gui.sensor_block_item import SensorBlockItem
 from gui.action_block_item import ActionBlockItem
 from gui.trigger_block_item import TriggerBlockItem
@@ -34,6 +34,15 @@ from gui.timer_block_item import TimerBlockItem
 from gui.script_block_item import ScriptBlockItem
 import os
 from config.GUIconfig import GlobalPaths
+from core.lazy_import import LazyImport
+
+# Dialoghi di selezione blocchi: importati alla prima apertura
+SensorSelectionDialog = LazyImport("gui.block_selection_dialog", "SensorSelectionDialog")
+ActionSelectionDialog = LazyImport("gui.block_selection_dialog", "ActionSelectionDialog")
+TriggerSelectionDialog = LazyImport("gui.block_selection_dialog", "TriggerSelectionDialog")
+ConditionSelectionDialog = LazyImport("gui.block_selection_dialog", "ConditionSelectionDialog")
+TimerSelectionDialog = LazyImport("gui.block_selection_dialog", "TimerSelectionDialog")
+ScriptSelectionDialog = LazyImport("gui.block_selection_dialog", "ScriptSelectionDialog")
 
 
 class TabSensori(QWidget):
@@ -153,7 +162,8 @@ class TabSensori(QWidget):
 
         Logs a warning for each block skipped due to incomplete fields.
 
-        @note Uses `YAMLHandler.generate_yaml_sensors_only_with_log()`.
+        @note Uses `YAMLHandler.patch_sensors_section()`, falling back to
+              `YAMLHandler.generate_yaml_sensors_only_with_log()`.
         """
         try:
             main = self.window()
@@ -165,9 +175,13 @@ class TabSensori(QWidget):
 
             # Usa metodo esteso con lista blocchi scartati
             scene = self.sensor_canvas.scene()
-            new_yaml, scartati = YAMLHandler.generate_yaml_sensors_only_with_log(scene, current_yaml)
-
-            editor.setPlainText(new_yaml)
+            # Modifica solo la sezione sensor; se non possibile riscrive tutto
+            edits, scartati = YAMLHandler.patch_sensors_section(scene, current_yaml)
+            if edits is not None and hasattr(editor, "apply_line_edits"):
+                editor.apply_line_edits(edits)
+            else:
+                new_yaml, scartati = YAMLHandler.generate_yaml_sensors_only_with_log(scene, current_yaml)
+                editor.setPlainText(new_yaml)
 
             if self.logger:
                 if scartati:
@@ -207,40 +221,33 @@ class TabSensori(QWidget):
         Clears all existing blocks, then loads sensor definitions from the JSON file
         and instantiates them as visual blocks within the canvas.
 
-        @param yaml_content YAML content as string.
+        @param yaml_content YAML content as string, or its YamlDocument.
         """
         # 1. Svuota tutti i blocchi esistenti
         self.get_sensor_canvas().clear_blocks()
 
-        # 2. Parsea il contenuto YAML
-        yaml = YAML(typ="safe")
-        try:
-            data = yaml.load(yaml_content)
-        except Exception as e:
+        # 2. Parsea il contenuto YAML (parsing condiviso con gli altri tab)
+        doc = YamlDocument.get(yaml_content)
+        if doc.error is not None:
             if hasattr(self, "logger"):
-                self.logger.log(f"{Translator.tr('yaml_parse_error')}: {e}", "error")
+                self.logger.log(f"{Translator.tr('yaml_parse_error')}: {doc.error}", "error")
             return
+        data = doc.plain()
 
         if not data or "sensor" not in data or not isinstance(data["sensor"], list):
             if hasattr(self, "logger"):
                 self.logger.log(Translator.tr("no_sensor_section"), "warning")
             return
 
-        # 3. Carica definizioni da sensors.json
-        json_path = GlobalPaths.SENSORS_JSON_PATH
-        dialog = SensorSelectionDialog(sensors_json_path=json_path)
-        sensor_defs = dialog.sensors
-
-        # 4. Ricrea ogni blocco
+        # 3. Ricrea ogni blocco (definizioni da sensors.json tramite indice, senza dialog)
         for sensor in data["sensor"]:
+            if not isinstance(sensor, dict):
+                continue
             platform = sensor.get("platform", "").lower()
             name = sensor.get("name", Translator.tr("new_sensor"))
 
             # Trova definizione da JSON
-            sensor_def = next(
-                (s for s in sensor_defs if s["platform"] == platform or s["label"] == name),
-                None
-            )
+            sensor_def = SensorCatalog.find(platform, name)
 
             if not sensor_def:
                 continue  # salta sensori non definiti
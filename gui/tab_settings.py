@@ -25,8 +25,8 @@ from PyQt6.QtGui import QPixmap
 from gui.color_pantone import Pantone
 from core.translator import Translator
 from core.yaml_handler import YAMLHandler
+from core.yaml_document import YamlDocument
 from core.log_handler import GeneralLogHandler as logger
-from ruamel.yaml import YAML
 from config.GUIconfig import GlobalPaths
 
 
@@ -299,14 +299,19 @@ class TabSettings(QWidget):
             ssid = self.get_ssid()
             password = self.get_password()
 
-            new_yaml = YAMLHandler.generate_yaml_general_sections(
-                current_yaml=current_yaml,
-                device_name=device_name,
-                board=board_value,
-                ssid=ssid,
-                password=password
-            )
-            editor.setPlainText(new_yaml)
+            # Modifica solo le righe delle sezioni interessate; se non possibile riscrive tutto
+            edits = YAMLHandler.patch_general_sections(current_yaml, device_name, board_value, ssid, password)
+            if edits is not None and hasattr(editor, "apply_line_edits"):
+                editor.apply_line_edits(edits)
+            else:
+                new_yaml = YAMLHandler.generate_yaml_general_sections(
+                    current_yaml=current_yaml,
+                    device_name=device_name,
+                    board=board_value,
+                    ssid=ssid,
+                    password=password
+                )
+                editor.setPlainText(new_yaml)
             if self.logger:
                 self.logger.log(Translator.tr("yaml_updated_general"), "success")
 
@@ -339,15 +344,14 @@ class TabSettings(QWidget):
 
         If the YAML is invalid or fields are missing, defaults are used.
 
-        @param yaml_content YAML content as a string.
+        @param yaml_content YAML content as a string, or its YamlDocument.
         """
-        yaml = YAML(typ="safe")
-        try:
-            data = yaml.load(yaml_content)
-        except Exception as e:
+        doc = YamlDocument.get(yaml_content)
+        if doc.error is not None:
             if hasattr(self, "logger"):
-                self.logger.log(Translator.tr("yaml_parse_error") + f": {e}", "error")
+                self.logger.log(Translator.tr("yaml_parse_error") + f": {doc.error}", "error")
             return
+        data = doc.plain()
 
         # Aggiorna i campi se presenti
         if not data:
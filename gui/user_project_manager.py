@@ -9,6 +9,9 @@
 
 Displays a categorized list of local projects stored in the `user_projects` directory,
 allowing users to open, edit, inspect or delete their own projects.
+Cards are painted by a ProjectCardView (model/view grid) and are updated live
+by the ProjectWatcher when projects change on disk. The search bar queries the
+full-text index of ProjectSearch (names, metadata and YAML of every project).
 
 @version \ref PROJECT_NUMBER
 @date July 2025
@@ -18,18 +21,22 @@ allowing users to open, edit, inspect or delete their own projects.
 import os, sys, json
 from pathlib import Path
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QScrollArea, QListWidget, QMessageBox, QListWidgetItem, QApplication,
-    QInputDialog, QGridLayout, QDialog
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+    QListWidget, QMessageBox, QListWidgetItem, QApplication,
+    QInputDialog, QDialog, QLineEdit
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QSize, QTimer
 from gui.color_pantone import Pantone
 from config.GUIconfig import conf
 from datetime import datetime
 from core.translator import Translator
 from gui.custom_message_dialog import CustomMessageDialog
 from gui.project_edit_dialog import ProjectEditDialog
+from gui.project_card_view import ProjectCardView
 from core.settings_db import get_setting
+from core.project_index import ProjectIndex
+from core.project_watcher import ProjectWatcher
+from core.project_search import ProjectSearch
 
 def format_changelog(changelog: list[dict]) -> str:
     if not changelog:
@@ -63,7 +70,7 @@ class UserProjectManagerWindow(QMainWindow):
 
         Loads language, sets up layout with:
         - Category list on the left
-        - Scrollable project card grid on the right
+        - Search bar and project card grid on the right
         - Footer with close button
 
         @param main_window Optional reference to the main application window (for callbacks).
@@ -125,6 +132,15 @@ class UserProjectManagerWindow(QMainWindow):
 
         self.project_data = self.load_project_metadata()
         self.category_to_cards = self.build_category_index()
+        self.current_category = None
+
+        # Aggiornamenti live dal filesystem
+        self.watcher = ProjectWatcher.instance()
+        self.watcher.projects_changed.connect(self.on_projects_changed)
+        self.watcher.search_index_updated.connect(self.on_search_index_updated)
+        # I file YAML modificati non generano eventi di cartella: l'indice di ricerca si
+        # allinea all'apertura della finestra (in background)
+        self.watcher.update_search_index()
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -147,17 +163,36 @@ class UserProjectManagerWindow(QMainWindow):
         self.category_list.setStyleSheet(Pantone.LISTWIDGET_STYLE)
         content_layout.addWidget(self.category_list)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("border: none;")
-
-        self.scroll_content = QWidget()
-        self.scroll_layout = QGridLayout()
-        self.scroll_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.scroll_content.setLayout(self.scroll_layout)
-
-        self.scroll_area.setWidget(self.scroll_content)
-        content_layout.addWidget(self.scroll_area)
+        self.card_view = ProjectCardView(
+            fields=[(key, key.capitalize()) for key in ["name", "version", "author", "update"]],
+            buttons=[
+                ("open", "📂 " + Translator.tr("project_open")),
+                ("info", "ℹ️ " + Translator.tr("project_info")),
+                ("edit", "✏️ " + Translator.tr("project_edit")),
+                ("delete", "🗑️ " + Translator.tr("project_delete"))
+            ],
+            card_size=QSize(360, 260),
+            grid=True,
+            orientation=Qt.Orientation.Vertical,
+            button_color=Pantone.BTN_UPDATE_BACKGROUND,
+            button_hover="#218838"
+        )
+        self.card_view.action_triggered.connect(self.on_card_action)
+
+        # Ricerca full-text (YAML + info.json di tutti i progetti)
+        self.search_bar = QLineEdit()
+        self.search_bar.setPlaceholderText(Translator.tr("search_user_projects"))
+        self.search_bar.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_bar.textChanged.connect(lambda _: self.search_timer.start())
+
+        right_layout = QVBoxLayout()
+        right_layout.addWidget(self.search_bar)
+        right_layout.addWidget(self.card_view)
+        content_layout.addLayout(right_layout)
         main_layout.addLayout(content_layout)
         self.category_list.setCurrentRow(0)
 
@@ -186,8 +221,10 @@ class UserProjectManagerWindow(QMainWindow):
 
     def load_project_metadata(self):
         """
-        @brief Scans the user projects directory and reads metadata from each `info.json`.
+        @brief Returns the metadata of every user project, read from `info.json`.
 
+        Projects are taken from the persistent ProjectIndex: only the projects
+        whose folder or `info.json` changed since the last scan are read again.
         For each subfolder under each category in `DEFAULT_PROJECT_DIR`, loads:
         - name
         - author
@@ -197,26 +234,8 @@ class UserProjectManagerWindow(QMainWindow):
         - changelog (optional)
 
         @return List of dictionaries, each containing one project's metadata.
-        """        
-        projects = []
-        if not conf.DEFAULT_PROJECT_DIR.exists():
-            return projects
-
-        for category in conf.DEFAULT_PROJECT_DIR.iterdir():
-            if not category.is_dir():
-                continue
-            for project in category.iterdir():
-                info_path = project / "info.json"
-                if info_path.exists():
-                    try:
-                        with open(info_path, "r", encoding="utf-8") as f:
-                            data = json.load(f)
-                            data["__path"] = str(project)
-                            data["category"] = category.name
-                            projects.append(data)
-                    except Exception as e:
-                        print(f"Errore caricamento {info_path}: {e}")
-        return projects
+        """
+        return ProjectIndex.refresh(conf.DEFAULT_PROJECT_DIR)
 
     def build_category_index(self):
         """
@@ -234,98 +253,96 @@ class UserProjectManagerWindow(QMainWindow):
 
     def load_category_cards(self, category_name):
         """
-        @brief Loads and displays all project cards for the selected category.
+        @brief Displays the project cards of the selected category.
 
-        Clears existing cards and populates the scroll area with widgets,
-        arranged in a 2-column grid.
+        Only the model of the card view is replaced; the grid wraps the cards
+        to the available width and paints just the visible ones.
 
-        @param category_name Displayed category name (with emoji).
-        """        
+        @param category_name Displayed category name (with emoji) or category key.
+        """
         category_key = self.emoji_to_category.get(category_name, category_name)
+        self.current_category = category_key
+        if self.search_bar.text():
+            self.search_bar.blockSignals(True)  # scegliere una categoria chiude la ricerca
+            self.search_bar.clear()
+            self.search_bar.blockSignals(False)
+        self.card_view.set_projects(self.category_to_cards.get(category_key, []))
+
+    def run_search(self, keep_position: bool = False):
+        """
+        @brief Shows the projects matching the text of the search bar, from every category.
 
-        # Pulisce tutte le card esistenti
-        while self.scroll_layout.count():
-            item = self.scroll_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        # Aggiunge le card in griglia: 2 colonne
-        row, col = 0, 0
-        for project in self.category_to_cards.get(category_key, []):
-            card = self.create_project_card(project)
-            self.scroll_layout.addWidget(card, row, col)
-            col += 1
-            if col >= 2:
-                col = 0
-                row += 1
-
-    def create_project_card(self, project_data: dict) -> QWidget:
+        With an empty search bar the current category is shown again.
         """
-        @brief Creates a QWidget representing a project card with metadata and buttons.
+        text = self.search_bar.text().strip()
+        if not text:
+            self.card_view.set_projects(self.category_to_cards.get(self.current_category, []), keep_position)
+            return
+        by_path = {proj.get("__path"): proj for proj in self.project_data}
+        # Solo la query FTS: l'indice viene aggiornato in background dal ProjectWatcher
+        hits = ProjectSearch.search(text, conf.DEFAULT_PROJECT_DIR, update=False)
+        results = [by_path[hit["path"]] for hit in hits if hit["path"] in by_path]
+        self.card_view.set_projects(results, keep_position)
 
-        Displays:
-        - Project name, version, author, update date
-        - Buttons for open, info, edit, delete
+    def on_projects_changed(self, changes: dict):
+        """
+        @brief Applies the add / change / remove events of the ProjectWatcher.
 
-        @param project_data Dictionary with project metadata.
-        @return QWidget with styled layout and connected actions.
-        """        
-        card = QWidget()
-        card.setFixedSize(350, 250)
-        card.setStyleSheet("""
-            background-color: #2e2e2e;
-            border: 1px solid #444;
-            border-radius: 14px;
-        """)
+        The metadata is taken from the already updated ProjectIndex (no disk access);
+        the visible cards are refreshed only if the current category is affected.
+
+        @param changes Dict with the "added", "changed" and "removed" project paths.
+        """
+        previous = self.category_to_cards.get(self.current_category, [])
+        self.project_data = ProjectIndex.projects(conf.DEFAULT_PROJECT_DIR)
+        self.category_to_cards = self.build_category_index()
+
+        if self.search_bar.text().strip():
+            self.run_search(keep_position=True)
+            return
+
+        paths = {p for key in ("added", "changed", "removed") for p in changes.get(key, [])}
+        shown = {proj.get("__path") for proj in previous}
+        shown.update(proj.get("__path") for proj in self.category_to_cards.get(self.current_category, []))
+        if paths & shown:
+            self.card_view.set_projects(self.category_to_cards.get(self.current_category, []), keep_position=True)
 
-        layout = QHBoxLayout()
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(10)
-
-        # --- Colonna info ---
-        info_layout = QVBoxLayout()
-        for label in ["name", "version", "author", "update"]:
-            title = QLabel(f"{label.capitalize()}:")
-            title.setStyleSheet("color: #aaa; font-size: 9pt; font-weight: bold;")
-            title.setFixedWidth(150)
-            value = QLabel(project_data.get(label, "-"))
-            value.setStyleSheet("color: #fff; font-size: 10pt;")
-            value.setFixedWidth(150)
-            value.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            value.setWordWrap(True)
-            info_layout.addWidget(title)
-            info_layout.addWidget(value)
-            info_layout.addSpacing(6)
-
-        info_layout.addStretch()
-        layout.addLayout(info_layout)
-
-        # --- Colonna pulsanti ---
-        button_layout = QVBoxLayout()
-        button_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        button_layout.setSpacing(10)
-
-        btn_open = QPushButton("📂 " + Translator.tr("project_open"))
-        btn_info = QPushButton("ℹ️ " + Translator.tr("project_info"))
-        btn_edit = QPushButton("✏️ " + Translator.tr("project_edit"))
-        btn_delete = QPushButton("🗑️ " + Translator.tr("project_delete"))
-
-
-        for btn in [btn_open, btn_info, btn_edit, btn_delete]:
-            btn.setStyleSheet(Pantone.BUTTON_STYLE_GREEN)
-            btn.setFixedWidth(150)
-            button_layout.addWidget(btn)
-
-        btn_open.clicked.connect(lambda: self.apri_progetto(project_data))
-        btn_info.clicked.connect(lambda: self.mostra_descrizione(project_data))
-        btn_edit.clicked.connect(lambda: self.modifica_progetto(project_data))
-        btn_delete.clicked.connect(lambda: self.elimina_progetto(project_data))
-
-        layout.addLayout(button_layout)
-        card.setLayout(layout)
-        return card
+    def on_search_index_updated(self, count: int):
+        """
+        @brief Runs the current search again once the background index update added new data.
+
+        @param count Number of projects indexed again.
+        """
+        if count > 0 and self.search_bar.text().strip():
+            self.run_search(keep_position=True)
 
+    def closeEvent(self, event):
+        """
+        @brief Stops receiving watcher events when the window is closed.
+        """
+        try:
+            self.watcher.projects_changed.disconnect(self.on_projects_changed)
+            self.watcher.search_index_updated.disconnect(self.on_search_index_updated)
+        except TypeError:
+            pass  # già disconnesso
+        super().closeEvent(event)
+
+    def on_card_action(self, action: str, project_data: dict):
+        """
+        @brief Dispatches a click on a card button (open, info, edit, delete).
+
+        @param action Action name of the clicked button.
+        @param project_data Metadata of the project of the card.
+        """
+        handlers = {
+            "open": self.apri_progetto,
+            "info": self.mostra_descrizione,
+            "edit": self.modifica_progetto,
+            "delete": self.elimina_progetto
+        }
+        handler = handlers.get(action)
+        if handler:
+            handler(project_data)
 
     def apri_progetto(self, fields):
         """
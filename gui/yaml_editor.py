@@ -16,7 +16,7 @@ and highlights the current line for better readability.
 """
 
 from PyQt6.QtWidgets import QPlainTextEdit, QWidget, QTextEdit
-from PyQt6.QtGui import QPainter, QTextCharFormat, QColor
+from PyQt6.QtGui import QPainter, QTextCharFormat, QColor, QTextCursor
 from PyQt6.QtCore import Qt, QRect, QSize
 
 class LineNumberArea(QWidget):
@@ -63,6 +63,8 @@ class YamlCodeEditor(QPlainTextEdit):
     - Displays line numbers
     - Highlights the current line
     - Disables word wrapping
+    - Applies line edits in place, keeping the undo history
+    - Loads large texts with deferred highlighting (see YamlHighlighter)
     """
     def __init__(self):
         """
@@ -186,3 +188,67 @@ class YamlCodeEditor(QPlainTextEdit):
 
         self.setExtraSelections(extraSelections)
 
+    def set_highlighter(self, highlighter):
+        """
+        @brief Registers the YamlHighlighter of the document, enabling deferred highlighting.
+        """
+        self.highlighter = highlighter
+        highlighter.set_editor(self)
+
+    def setPlainText(self, text):
+        """
+        @brief Replaces the whole text; large texts are highlighted viewport-first.
+        """
+        highlighter = getattr(self, "highlighter", None)
+        if highlighter is None:
+            super().setPlainText(text)
+            return
+        if highlighter.is_large(text):
+            highlighter.begin_deferred()
+        else:
+            highlighter.cancel_deferred()
+        super().setPlainText(text)
+        highlighter.start_deferred()
+
+    def apply_line_edits(self, edits):
+        """
+        @brief Applies line edits produced by YAMLHandler.patch_* as a single undo step.
+
+        Only the affected lines are replaced, so the undo history is kept and the
+        highlighter reprocesses just the changed blocks.
+
+        @param edits List of (start_line, end_line, new_lines) tuples, sorted by position.
+        """
+        if not edits:
+            return
+        document = self.document()
+        block_count = document.blockCount()
+        doc_end = document.characterCount() - 1
+
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        # Dal basso verso l'alto, così i numeri di riga restano validi
+        for start, end, new_lines in reversed(edits):
+            text = "\n".join(new_lines)
+            if end < block_count:
+                end_pos = document.findBlockByNumber(end).position()
+                if new_lines:
+                    text += "\n"
+            else:
+                end_pos = doc_end
+            if start >= block_count:
+                start_pos = doc_end
+                text = "\n" + text
+            elif not new_lines and end >= block_count and start > 0:
+                # Rimozione fino alla fine: elimina anche il ritorno a capo precedente
+                prev = document.findBlockByNumber(start - 1)
+                start_pos = prev.position() + prev.length() - 1
+            else:
+                start_pos = document.findBlockByNumber(start).position()
+
+            cursor.setPosition(start_pos)
+            cursor.setPosition(end_pos, QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(text)
+            doc_end = document.characterCount() - 1
+            block_count = document.blockCount()
+        cursor.endEditBlock()
@@ -19,6 +19,7 @@ Key responsibilities:
 - Initializes the splash screen (if enabled)
 - Ensures proper logging of uncaught exceptions
 - Launches the main application window (`MainWindow`)
+- With `--profile-startup`, writes import times and phase timings to `startup_profile.txt`
 
 @version \ref PROJECT_NUMBER
 @date July 2025
@@ -26,17 +27,25 @@ Key responsibilities:
 """
 
 import sys, os, traceback
+sys.path.insert(0, os.path.dirname(__file__))
+# Il profiler va attivato prima di ogni altro import dell'applicazione
+from core.startup_profiler import StartupProfiler
+StartupProfiler.enable_from_argv()
+StartupProfiler.begin("imports")
 from PyQt6.QtWidgets import QApplication, QDialog
 from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt
-sys.path.insert(0, os.path.dirname(__file__))
-from gui.main_window import MainWindow
+from PyQt6.QtCore import Qt, QTimer
+from core.lazy_import import LazyImport
 from core.translator import Translator
-from gui.language_selection_dialog import LanguageSelectionDialog
 from gui.splash_screen import SplashScreen
 from config.GUIconfig import conf, GlobalPaths
 from core.settings_db import init_db, get_setting, set_setting
 from core.log_handler import GeneralLogHandler
+StartupProfiler.end("imports")
+
+# Caricati solo quando servono: la finestra principale dopo la splash, il dialogo lingua al primo avvio
+MainWindow = LazyImport("gui.main_window", "MainWindow")
+LanguageSelectionDialog = LazyImport("gui.language_selection_dialog", "LanguageSelectionDialog")
 
 def global_exception_hook(exc_type, exc_value, exc_traceback):
     logger = GeneralLogHandler()
@@ -73,13 +82,28 @@ def show_main_window():
         logger.error("QApplication.instance() restituisce None!")
     else:
         try:
-            app.main_window = MainWindow()
-            app.main_window.show()
+            with StartupProfiler.phase("main_window"):
+                app.main_window = MainWindow()
+                app.main_window.show()
             logger.info("Main window creata e mostrata!")
+            if StartupProfiler.enabled:
+                # Dopo il primo giro dell'event loop la finestra è stata disegnata
+                QTimer.singleShot(0, write_startup_profile)
         except Exception as e:
             logger.error(f"Eccezione durante la creazione della MainWindow: {e}")
             logger.error(traceback.format_exc())
 
+def write_startup_profile():
+    """
+    @brief Closes the startup profile once the main window has been painted and writes the report.
+    """
+    StartupProfiler.mark("main_window_shown")
+    try:
+        path = StartupProfiler.write_report()
+        logger.info(f"Profilo di avvio salvato in: {path}")
+    except OSError as e:
+        logger.error(f"Impossibile salvare il profilo di avvio: {e}")
+
 def main():
     """
     @brief Main application entry point.
@@ -97,10 +121,12 @@ def main():
     @throws Any unhandled exceptions will be logged and re-raised.
     """    
     try:
-        app = QApplication(sys.argv)
+        with StartupProfiler.phase("qapplication"):
+            app = QApplication(sys.argv)
 
         # Inizializza il database
-        init_db()
+        with StartupProfiler.phase("init_db"):
+            init_db()
 
         # Carica la lingua solo se già selezionata
         lang = Translator.get_current_language()
@@ -137,9 +163,10 @@ def main():
         # Mostra splash SOLO dopo selezione lingua
         if should_show_splash():
             logger.info("Caricamento splash screen")
-            pixmap = QPixmap(GlobalPaths.SPLASH_IMAGE)
-            splash = SplashScreen(pixmap)
-            splash.show()
+            with StartupProfiler.phase("splash_screen"):
+                pixmap = QPixmap(GlobalPaths.SPLASH_IMAGE)
+                splash = SplashScreen(pixmap)
+                splash.show()
             splash.start_initialization(on_complete_callback=show_main_window)
         else:
             show_main_window()
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+@file test_github_handler.py
+@brief Tests of GitHubHandler.fetch_project_metadata_list against a local HTTP stand-in.
+
+A ThreadingHTTPServer serves the repository listing and the `info.json` of
+each project; contents_url()/raw_url() are redirected to it and the on-disk
+HTTP cache is moved to a temporary folder.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import os, sys, json, time, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+pytest.importorskip("PyQt6.QtCore")
+pytest.importorskip("requests")
+
+from core.github_handler import GitHubHandler
+from core.http_cache import HttpCache
+
+
+class StandIn:
+    """
+    @brief Fake GitHub: listing at /contents, metadata at /raw/<project>/info.json.
+    """
+    def __init__(self, projects, delays=None, failing=(), listing=None):
+        self.projects = projects            # nomi, nell'ordine dell'elenco
+        self.delays = delays or {}          # progetto → secondi di attesa prima della risposta
+        self.failing = set(failing)         # progetti che rispondono 500
+        self.listing = listing              # corpo alternativo per l'elenco
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stand_in.handle(self)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def handle(self, request):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if request.path == "/contents":
+                body = self.listing if self.listing is not None else [
+                    {"name": name, "type": "dir"} for name in self.projects
+                ] + [{"name": "README.md", "type": "file"}]
+                self.reply(request, 200, body)
+                return
+            parts = request.path.strip("/").split("/")
+            name = parts[1] if len(parts) == 3 and parts[0] == "raw" else None
+            if name not in self.projects:
+                self.reply(request, 404, {"message": "Not Found"})
+                return
+            time.sleep(self.delays.get(name, 0.0))
+            if name in self.failing:
+                self.reply(request, 500, {"message": "boom"})
+                return
+            self.reply(request, 200, {"name": name, "version": "1.0"})
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # il client ha già rinunciato (timeout)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    @staticmethod
+    def reply(request, status, body):
+        data = json.dumps(body).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def github(monkeypatch, tmp_path):
+    """
+    @brief Returns a factory starting a StandIn and pointing GitHubHandler at it.
+    """
+    servers = []
+
+    def start(*args, **kwargs):
+        stand_in = StandIn(*args, **kwargs)
+        servers.append(stand_in)
+        monkeypatch.setattr(GitHubHandler, "contents_url", staticmethod(lambda: f"{stand_in.url}/contents"))
+        monkeypatch.setattr(GitHubHandler, "raw_url",
+                            staticmethod(lambda project, filename: f"{stand_in.url}/raw/{project}/{filename}"))
+        return stand_in
+
+    monkeypatch.setattr(GitHubHandler, "_cache", HttpCache(tmp_path / "http_cache"))
+    monkeypatch.setattr(GitHubHandler, "_session", None)
+    monkeypatch.setattr(GitHubHandler, "is_offline", staticmethod(lambda: False))
+    monkeypatch.setattr(GitHubHandler, "TIMEOUT", (2, 2))
+    yield start
+    for stand_in in servers:
+        stand_in.close()
+    GitHubHandler._session = None
+
+
+def names(projects):
+    return [p["name"] for p in projects]
+
+
+def test_fetches_in_parallel_and_keeps_listing_order(github):
+    projects = [f"project_{i}" for i in range(6)]
+    # Il primo progetto risponde per ultimo: l'ordine deve restare quello dell'elenco
+    delays = {name: 0.3 for name in projects}
+    delays["project_0"] = 0.6
+    stand_in = github(projects, delays=delays)
+
+    arrived = []
+    start = time.perf_counter()
+    result = GitHubHandler.fetch_project_metadata_list(on_result=lambda info: arrived.append(info["name"]))
+    elapsed = time.perf_counter() - start
+
+    assert names(result) == projects
+    assert sorted(arrived) == projects
+    assert arrived[-1] == "project_0"
+    assert stand_in.max_active > 1
+    assert elapsed < sum(delays.values()) / 2
+
+
+def test_failing_project_does_not_drop_the_others(github):
+    github(["alpha", "beta", "gamma"], failing={"beta"})
+
+    result = GitHubHandler.fetch_project_metadata_list()
+
+    assert names(result) == ["alpha", "gamma"]
+
+
+def test_project_timeout_is_skipped(github, monkeypatch):
+    github(["fast", "slow", "other"], delays={"slow": 2.0})
+    monkeypatch.setattr(GitHubHandler, "TIMEOUT", (2, 0.5))
+
+    start = time.perf_counter()
+    result = GitHubHandler.fetch_project_metadata_list()
+
+    assert names(result) == ["fast", "other"]
+    assert time.perf_counter() - start < 2.0
+
+
+def test_listing_that_is_not_a_list_returns_nothing(github):
+    github(["alpha"], listing={"message": "API rate limit exceeded"})
+
+    assert GitHubHandler.fetch_project_metadata_list() == []
+
+
+def test_cancel_drops_pending_projects(github):
+    projects = [f"project_{i}" for i in range(20)]
+    github(projects, delays={name: 0.2 for name in projects})
+    cancel = threading.Event()
+
+    def on_result(info):
+        cancel.set()  # annulla dopo il primo progetto arrivato
+
+    result = GitHubHandler.fetch_project_metadata_list(on_result=on_result, cancel_event=cancel)
+
+    assert 1 <= len(result) < len(projects)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+@file test_snapshot_store.py
+@brief Tests of SnapshotStore: create, restore, prune and garbage collection.
+
+Every test works on a temporary project folder and a temporary store root.
+
+@version \ref PROJECT_NUMBER
+@date July 2025
+@license GNU Affero General Public License v3.0 (AGPLv3)
+"""
+
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+pytest.importorskip("PyQt6.QtCore")
+
+from core.snapshot_store import SnapshotStore
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def objects(store):
+    return sorted(p.name for p in store.objects_dir.glob("*/*"))
+
+
+@pytest.fixture
+def project(tmp_path):
+    folder = tmp_path / "project"
+    write(str(folder / "device.yaml"), "esphome:\n  name: device\n")
+    write(str(folder / "include" / "sensor.h"), "// v1\n")
+    write(str(folder / ".esphome" / "build" / "firmware.bin"), "binary")
+    return str(folder)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(root=tmp_path / "snapshots", ignore=[".esphome"])
+
+
+def test_create_skips_ignored_folders_and_deduplicates(store, project):
+    first = store.create(project, label="first")
+    second = store.create(project, label="second")
+
+    assert first["files"] == 2 and first["new_objects"] == 2
+    # Nessun file modificato: nessun oggetto nuovo
+    assert second["files"] == 2 and second["new_objects"] == 0
+    assert [s["label"] for s in store.list_snapshots(project)] == ["second", "first"]
+    assert len(objects(store)) == 2
+
+
+def test_restore_brings_back_changed_missing_and_extra_files(store, project):
+    snapshot_id = store.create(project)["id"]
+    write(os.path.join(project, "device.yaml"), "esphome:\n  name: changed_name\n")
+    os.remove(os.path.join(project, "include", "sensor.h"))
+    write(os.path.join(project, "extra.yaml"), "new: file\n")
+    write(os.path.join(project, "notes.txt"), "keep me\n")
+
+    plan = store.plan_restore(project, snapshot_id)
+    assert plan == {"restore": ["device.yaml", "include/sensor.h"], "remove": ["extra.yaml", "notes.txt"]}
+
+    result = store.restore(project, snapshot_id, allowed_removals=["extra.yaml"])
+
+    assert result["restored"] == 2 and result["removed"] == 1
+    assert read(os.path.join(project, "device.yaml")) == "esphome:\n  name: device\n"
+    assert read(os.path.join(project, "include", "sensor.h")) == "// v1\n"
+    assert not os.path.exists(os.path.join(project, "extra.yaml"))
+    assert read(os.path.join(project, "notes.txt")) == "keep me\n"  # rimozione non confermata
+    assert os.path.exists(os.path.join(project, ".esphome", "build", "firmware.bin"))
+
+    # Il backup permette di annullare il ripristino
+    store.restore(project, result["backup"])
+    assert read(os.path.join(project, "device.yaml")) == "esphome:\n  name: changed_name\n"
+    assert os.path.exists(os.path.join(project, "extra.yaml"))
+
+
+def test_prune_keeps_newest_and_collects_unreferenced_objects(store, project, monkeypatch):
+    monkeypatch.setattr(SnapshotStore, "MAX_SNAPSHOTS", 3)
+    yaml_path = os.path.join(project, "device.yaml")
+    for i in range(5):
+        write(yaml_path, f"esphome:\n  name: device_{i}\n")
+        store.create(project, label=str(i))
+
+    assert [s["label"] for s in store.list_snapshots(project)] == ["4", "3", "2"]
+    # sensor.h + le tre versioni di device.yaml ancora referenziate
+    assert len(objects(store)) == 4
+
+
+def test_restore_of_the_oldest_snapshot_at_the_limit(store, project, monkeypatch):
+    monkeypatch.setattr(SnapshotStore, "MAX_SNAPSHOTS", 3)
+    yaml_path = os.path.join(project, "device.yaml")
+    for i in range(3):
+        write(yaml_path, f"esphome:\n  name: device_{i}\n")
+        store.create(project, label=str(i))
+    oldest = store.list_snapshots(project)[-1]["id"]
+
+    result = store.restore(project, oldest)
+
+    assert read(yaml_path) == "esphome:\n  name: device_0\n"
+    ids = [s["id"] for s in store.list_snapshots(project)]
+    assert len(ids) == 3 and oldest in ids and result["backup"] in ids
+    store.restore(project, oldest)  # gli oggetti dello snapshot ripristinato sono ancora presenti
+
+
+def test_garbage_collection_keeps_objects_shared_with_other_projects(store, project, tmp_path, monkeypatch):
+    monkeypatch.setattr(SnapshotStore, "MAX_SNAPSHOTS", 1)
+    other = str(tmp_path / "other")
+    write(os.path.join(other, "device.yaml"), read(os.path.join(project, "device.yaml")))
+    store.create(other)
+
+    store.create(project)
+    write(os.path.join(project, "device.yaml"), "esphome:\n  name: renamed\n")
+    store.create(project)
+
+    # Il vecchio device.yaml non serve più a "project" ma è ancora usato da "other"
+    assert store.restore(other, store.list_snapshots(other)[0]["id"], backup=False)["restored"] == 0
+    assert len(objects(store)) == 3
+
+
+def test_garbage_collection_stops_on_unreadable_manifest(store, project):
+    store.create(project)
+    write(os.path.join(project, "device.yaml"), "esphome:\n  name: renamed\n")
+    store.create(project)
+    broken = store.manifests_dir / "broken-0000000000" / "20000101-000000-000000.json"
+    write(str(broken), "{not json")
+    for snapshot in store.list_snapshots(project)[1:]:
+        store.delete(project, snapshot["id"])
+
+    assert store.collect_garbage() == 0
+    assert len(objects(store)) == 3